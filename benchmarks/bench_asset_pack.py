@@ -0,0 +1,88 @@
+import sys
+import os
+import subprocess
+import statistics
+
+# Add the repository root to the system path to allow imports from the src package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.bake_assets import ASSETS_DIR
+from src.asset_pack import PACK_PATH
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+MODES = ('source', 'baked', 'pack')
+TRIALS = 5
+
+def evict(paths) -> None:
+    """
+    Asks the kernel to drop the given files from the page cache, so the next read comes from
+    the disk. This is advisory; pages that are mapped elsewhere may stay resident.
+    """
+    for path in paths:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+def asset_files() -> list:
+    """
+    Returns every file the game could read assets from: assets/ (including baked output)
+    and the pack.
+    """
+    paths = [os.path.join(folder, name) for folder, _, files in os.walk(ASSETS_DIR) for name in files]
+    if os.path.exists(PACK_PATH):
+        paths.append(PACK_PATH)
+    return paths
+
+def child(mode: str) -> None:
+    """
+    Runs in a fresh process: creates a headless app and times the prewarm phase with assets
+    coming from the given source.
+    """
+    from ursina import Ursina
+    from src.asset_registry import AssetRegistry
+
+    app = Ursina(window_type='none')
+    registry = AssetRegistry()
+    if mode == 'source':
+        registry.manifest = {}
+    elif mode == 'pack' and not registry.mount_pack():
+        raise SystemExit(f"no asset pack at {PACK_PATH}; run python src/asset_pack.py")
+    print(registry.prewarm())
+
+def time_startup(mode: str, cold: bool) -> float:
+    """
+    Returns the prewarm time of one fresh process, in milliseconds.
+    """
+    if cold:
+        evict(asset_files())
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', mode],
+        cwd=SRC_DIR, capture_output=True, text=True, check=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1]) * 1000
+
+def run(trials: int = TRIALS) -> list:
+    """
+    Times startup asset loading from loose source files, baked files and the pack, each with
+    a cold and a warm page cache.
+
+    Returns:
+        list: One (mode, cache, median_ms, min_ms) tuple per combination.
+    """
+    results = []
+    for mode in MODES:
+        for cold in (True, False):
+            times = [time_startup(mode, cold) for _ in range(trials)]
+            results.append((mode, 'cold' if cold else 'warm', statistics.median(times), min(times)))
+    return results
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3 and sys.argv[1] == '--child':
+        child(sys.argv[2])
+    else:
+        print(f"{'assets':>8} {'cache':>6} {'median ms':>10} {'min ms':>8}")
+        for mode, cache, median_ms, min_ms in run():
+            print(f"{mode:>8} {cache:>6} {median_ms:>10.1f} {min_ms:>8.1f}")
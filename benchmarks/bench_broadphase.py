@@ -0,0 +1,98 @@
+from ursina import *
+import sys
+import os
+import random
+import time as wall_time
+
+# Add the repository root to the system path to allow imports from the src package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.bullet import Bullet
+from src.enemy import EnemyBullet
+from src.enums.collision_layer import CollisionLayer
+from src.spatial_hash import collision_grid
+
+ENEMY_COUNTS = (10, 100, 1000)
+BULLET_COUNT = 50
+ARENA_HALF_SIZE = 50
+ENEMY_RADIUS = 1.0
+
+def scan_frame(enemies) -> int:
+    """
+    One frame of the original check_bullet_collision: every enemy walks every entity in
+    the scene and filters before calling intersects(). Returns the number of hits.
+    """
+    hits = 0
+    for enemy in enemies:
+        for entity in scene.entities:
+            if entity == enemy or not isinstance(entity, Entity):
+                continue
+            if not hasattr(entity, 'damage'):
+                continue
+            if isinstance(entity, EnemyBullet):
+                continue
+            if enemy.intersects(entity).hit:
+                hits += 1
+                break
+    return hits
+
+def grid_frame(enemies) -> int:
+    """
+    One frame of the spatial-hash check_bullet_collision: every enemy only tests the
+    player bullets in the cells around it. Returns the number of hits.
+    """
+    hits = 0
+    for enemy in enemies:
+        for entity in collision_grid.query(enemy.position, ENEMY_RADIUS, CollisionLayer.PLAYER_BULLET):
+            if enemy.intersects(entity).hit:
+                hits += 1
+                break
+    return hits
+
+def random_position() -> Vec3:
+    return Vec3(random.uniform(-ARENA_HALF_SIZE, ARENA_HALF_SIZE), 2, random.uniform(-ARENA_HALF_SIZE, ARENA_HALF_SIZE))
+
+def time_frames(frame, enemies, repeats: int) -> float:
+    """
+    Runs a collision frame `repeats` times and returns the mean time in milliseconds.
+    """
+    start = wall_time.perf_counter()
+    for _ in range(repeats):
+        frame(enemies)
+    return (wall_time.perf_counter() - start) / repeats * 1000
+
+def run(seed: int = 0) -> list:
+    """
+    Compares the full-scene scan against the spatial hash at each enemy count.
+
+    Returns:
+        list: One (enemy_count, scan_ms, grid_ms, scan_hits, grid_hits) tuple per count.
+    """
+    random.seed(seed)
+    results = []
+
+    for enemy_count in ENEMY_COUNTS:
+        collision_grid.clear()
+        enemies = []
+        for _ in range(enemy_count):
+            enemy = Entity(model='cube', collider='box', position=random_position())
+            collision_grid.insert(enemy, enemy.position, CollisionLayer.ENEMY)
+            enemies.append(enemy)
+        bullets = [Bullet(position=random_position()) for _ in range(BULLET_COUNT)]
+
+        repeats = max(1, 1000 // enemy_count)
+        scan_hits, grid_hits = scan_frame(enemies), grid_frame(enemies)
+        scan_ms = time_frames(scan_frame, enemies, repeats)
+        grid_ms = time_frames(grid_frame, enemies, repeats)
+        results.append((enemy_count, scan_ms, grid_ms, scan_hits, grid_hits))
+
+        for entity in enemies + bullets:
+            destroy(entity)
+
+    return results
+
+if __name__ == '__main__':
+    app = Ursina(window_type='none')
+    print(f"{'enemies':>8} {'scan ms':>10} {'grid ms':>10} {'speedup':>8} {'hits':>9}")
+    for enemy_count, scan_ms, grid_ms, scan_hits, grid_hits in run():
+        print(f"{enemy_count:>8} {scan_ms:>10.3f} {grid_ms:>10.3f} {scan_ms / grid_ms:>7.1f}x {scan_hits:>4}/{grid_hits:<4}")
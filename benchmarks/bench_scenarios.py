@@ -0,0 +1,277 @@
+import sys
+import os
+import argparse
+import json
+import platform
+import time as wall_time
+import numpy as np
+
+# Add the repository root to the system path to allow imports from the src package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.headless import HeadlessGame, InputScript
+
+BENCH_DIR = os.path.abspath(os.path.dirname(__file__))
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+RESULTS_PATH = os.path.join(BENCH_DIR, 'results', 'latest.json')
+
+FRAMES = 240  # Measured frames per scenario, after warm-up
+WARMUP_FRAMES = 30
+TOLERANCE = 0.25  # Allowed slowdown over the baseline before a scenario fails
+PLAYER_HEALTH = 10 ** 9  # Keeps the player alive for the whole scenario
+SHOOT_RANGE = 12  # Inside Enemy.shoot_distance
+
+def percentiles(times: list) -> dict:
+    """
+    Returns the mean and p50/p95/p99 of a list of durations, in milliseconds.
+    """
+    ms = np.asarray(times) * 1000
+    p50, p95, p99 = np.percentile(ms, (50, 95, 99))
+    return {'mean_ms': float(ms.mean()), 'p50_ms': float(p50), 'p95_ms': float(p95), 'p99_ms': float(p99)}
+
+def entity_counts(game: HeadlessGame) -> dict:
+    """
+    Returns how many entities, enemies, queued spawns and live projectiles the scene holds, and
+    how many scene-graph nodes and draw calls it would render with.
+    """
+    from ursina import scene
+    from src.projectile_system import ProjectileSystem
+    from src.frame_profiler import scene_counts
+
+    return {
+        'entities': len(scene.entities),
+        'enemies': len(game.game_manager.enemies),
+        'spawn_queue': game.game_manager.spawn_queue.depth,
+        'projectiles': ProjectileSystem.instance().count,
+        **scene_counts(),
+    }
+
+def start_wave(game: HeadlessGame, wave: int, flush: bool = True) -> None:
+    """
+    Starts a fresh game and replaces the first wave with the given one, queued by
+    GameManager.spawn_wave. Unless `flush` is False the whole wave is built at once, so the
+    measured frames all see the full wave.
+    """
+    from ursina import destroy
+
+    game.start()
+    manager = game.game_manager
+    manager.spawn_queue.clear()
+    for enemy in manager.enemies:
+        destroy(enemy)
+    manager.enemies.clear()
+    manager.current_wave = wave
+    manager.spawn_wave()
+    if flush:
+        manager.spawn_queue.flush()
+
+def measure_frames(game: HeadlessGame, frames: int, script: InputScript = None) -> dict:
+    """
+    Steps the game, timing every frame and the fixed updates of each class of entity.
+
+    Returns:
+        dict: Frame time percentiles, per-system milliseconds per frame, enemy AI ticks per
+            step by tier and entity counts.
+    """
+    from src.simulation_loop import SimulationLoop
+    from src.enemy_swarm import EnemySwarm
+
+    loop = SimulationLoop.instance()
+    scheduler = EnemySwarm.instance().scheduler
+    for _ in range(WARMUP_FRAMES):
+        game.step(script)
+
+    loop.time_systems()
+    scheduler.reset_counts()
+    times = []
+    for _ in range(frames):
+        start = wall_time.perf_counter()
+        game.step(script)
+        times.append(wall_time.perf_counter() - start)
+    systems = {name: seconds * 1000 / frames for name, seconds in sorted(loop.timings.items())}
+    loop.time_systems(False)
+
+    return {**percentiles(times), 'systems_ms': systems, 'ai': scheduler.counts(), 'counts': entity_counts(game)}
+
+def wave_scenario(wave: int):
+    def scenario(game: HeadlessGame) -> dict:
+        start_wave(game, wave)
+        return measure_frames(game, FRAMES)
+    scenario.__doc__ = f"Wave {wave} from GameManager.spawn_wave, no input."
+    return scenario
+
+def wave_spawn(game: HeadlessGame, wave: int = 200) -> dict:
+    """
+    Wave 200 as it spawns: every frame from the start of the wave until the spawn queue has
+    built the last enemy.
+    """
+    start_wave(game, wave, flush=False)
+    queue = game.game_manager.spawn_queue
+    times = []
+    while queue.pending:
+        start = wall_time.perf_counter()
+        game.step()
+        times.append(wall_time.perf_counter() - start)
+    return {**percentiles(times), 'max_ms': max(times) * 1000, 'spawn_frames': len(times),
+            'spawn': queue.stats(), 'systems_ms': {}, 'counts': entity_counts(game)}
+
+def sustained_fire(game: HeadlessGame) -> dict:
+    """
+    Wave 10 with the trigger held the whole time, so Gun.shoot fires at its cooldown.
+    """
+    start_wave(game, 10)
+    script = InputScript().press(0, 'left mouse')
+    result = measure_frames(game, FRAMES, script)
+    game.step(InputScript().release(game.frame, 'left mouse'))
+    return result
+
+def enemies_in_range(game: HeadlessGame) -> dict:
+    """
+    Fifty enemies in a ring inside shooting range, all firing at the player.
+    """
+    from ursina import Vec3
+    from math import cos, sin, tau
+    from src.enemy import Enemy
+
+    start_wave(game, 0)
+    manager = game.game_manager
+    for i in range(50):
+        angle = tau * i / 50
+        position = Vec3(cos(angle) * SHOOT_RANGE, 2, sin(angle) * SHOOT_RANGE)
+        manager.enemies.append(Enemy(player=manager.player, position=position, on_death=manager.enemy_died))
+    return measure_frames(game, FRAMES)
+
+def restart_cycles(game: HeadlessGame, cycles: int = 50) -> dict:
+    """
+    Fifty restarts, each followed by a few frames of play. Reports the time per restart.
+    """
+    times = []
+    for _ in range(cycles):
+        start = wall_time.perf_counter()
+        game.start()
+        times.append(wall_time.perf_counter() - start)
+        for _ in range(5):
+            game.step()
+    return {**percentiles(times), 'systems_ms': {}, 'counts': entity_counts(game)}
+
+def snapshot_round_trip(game: HeadlessGame, wave: int = 200, rounds: int = 20) -> dict:
+    """
+    Wave 200 saved and restored twenty times. Reports the time to restore the game from a packed
+    snapshot; the snapshot's size and the time to capture and pack it are under `snapshot`.
+    """
+    from src.snapshot import pack_snapshot, unpack_snapshot
+
+    start_wave(game, wave)
+    for _ in range(WARMUP_FRAMES):
+        game.step()
+    manager = game.game_manager
+    saves, loads = [], []
+    for _ in range(rounds):
+        start = wall_time.perf_counter()
+        data = pack_snapshot(manager.snapshot())
+        saves.append(wall_time.perf_counter() - start)
+        start = wall_time.perf_counter()
+        manager.restore(unpack_snapshot(data))
+        loads.append(wall_time.perf_counter() - start)
+    snapshot = {'bytes': len(data), 'save_ms': float(np.median(saves) * 1000), 'save_max_ms': max(saves) * 1000}
+    return {**percentiles(loads), 'snapshot': snapshot, 'systems_ms': {}, 'counts': entity_counts(game)}
+
+SCENARIOS = {
+    'wave_1': wave_scenario(1),
+    'wave_10': wave_scenario(10),
+    'wave_50': wave_scenario(50),
+    'wave_200': wave_scenario(200),
+    'wave_200_spawn': wave_spawn,
+    'sustained_fire': sustained_fire,
+    'enemies_in_range': enemies_in_range,
+    'restart_cycles': restart_cycles,
+    'snapshot_wave_200': snapshot_round_trip,
+}
+
+def run(names=None) -> dict:
+    """
+    Runs the named scenarios (all by default) in one headless game.
+
+    Returns:
+        dict: Scenario name -> results.
+    """
+    game = HeadlessGame(seed=0)
+    game.state_machine.max_health = PLAYER_HEALTH
+
+    results = {}
+    for name in names or SCENARIOS:
+        results[name] = SCENARIOS[name](game)
+        counts = results[name]['counts']
+        print(f"{name:<18} p50 {results[name]['p50_ms']:7.2f} ms  p95 {results[name]['p95_ms']:7.2f} ms  "
+              f"p99 {results[name]['p99_ms']:7.2f} ms  {counts['entities']:>5} entities  {counts['nodes']:>5} nodes  "
+              f"{counts['draw_calls']:>4} draw calls")
+    return results
+
+def compare(results: dict, baseline: dict, tolerance: float = TOLERANCE) -> list:
+    """
+    Returns a message for every scenario whose p95 is more than `tolerance` slower than the baseline.
+    Scenarios missing from the baseline are not compared.
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get('scenarios', {}).get(name)
+        if not reference:
+            continue
+        limit = reference['p95_ms'] * (1 + tolerance)
+        if result['p95_ms'] > limit:
+            regressions.append(
+                f"{name}: p95 {result['p95_ms']:.2f} ms exceeds baseline {reference['p95_ms']:.2f} ms "
+                f"by more than {tolerance:.0%}"
+            )
+    return regressions
+
+def write_json(path: str, results: dict) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({
+            'machine': platform.platform(),
+            'python': platform.python_version(),
+            'frames': FRAMES,
+            'scenarios': results,
+        }, f, indent=2, sort_keys=True)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Run scripted gameplay scenarios headless and report frame times.')
+    parser.add_argument('scenarios', nargs='*', help=f"scenarios to run (default: all): {', '.join(SCENARIOS)}")
+    parser.add_argument('--output', default=RESULTS_PATH, help='where to write the JSON results')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='baseline to compare against')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE, help='allowed p95 slowdown, e.g. 0.25 for 25%%')
+    parser.add_argument('--update-baseline', action='store_true', help='store these results as the new baseline')
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    results = run(args.scenarios)
+    write_json(args.output, results)
+
+    if args.update_baseline:
+        write_json(args.baseline, results)
+        print(f"baseline updated: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    missing = [name for name in results if name not in baseline.get('scenarios', {})]
+    if missing:
+        print(f"not in the baseline, so not compared: {', '.join(missing)}; run with --update-baseline")
+    if regressions:
+        print('\nPERFORMANCE REGRESSION')
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+    print('all scenarios within baseline')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,106 @@
+import sys
+import os
+from math import inf
+import numpy as np
+
+# Add the src directory to the system path to allow imports from the src package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.enums.ai_tier import AITier
+
+# (tier, farthest distance from the player, simulation steps between ticks), nearest first
+AI_TIERS = (
+    (AITier.NEAR, 30.0, 1),
+    (AITier.MID, 60.0, 2),
+    (AITier.FAR, inf, 4),
+)
+AI_BUDGET = 64  # Most enemies ticked in one simulation step
+AI_MAX_WAIT = 8  # Most missed steps one tick makes up; beyond this an enemy loses the time
+
+class AIScheduler:
+    """
+    Decides which enemies run their AI in each simulation step. Enemies are put in a tier by
+    their distance to the player, and each tier ticks every so many steps: near enemies every
+    step, farther ones less often. Each enemy has a phase that staggers it against the others in
+    its tier, so a wave's far enemies are spread evenly over the steps instead of all ticking in
+    the same one.
+
+    At most `budget` enemies tick per step. Due enemies of the nearest tier go first, longest
+    waiting first, so they keep ticking every step unless they alone are over the budget. The
+    rest of the budget goes to the farther tiers, most overdue first (by the steps each has waited
+    over its tier's interval, nearest tier first among those equally overdue), so a crowd of far
+    enemies is slowed evenly instead of some never ticking. An enemy that misses its turn stays
+    due, and whoever runs its AI passes it the time since it last ticked, up to `max_wait` steps,
+    so skipped steps are made up rather than lost.
+    """
+
+    def __init__(self, tiers=AI_TIERS, budget: int = AI_BUDGET, max_wait: int = AI_MAX_WAIT) -> None:
+        """
+        Args:
+            tiers (tuple): (AITier, farthest distance, steps between ticks) per tier, nearest first.
+            budget (int): The most enemies ticked per step. Defaults to 64.
+            max_wait (int): The most steps one tick makes up. Defaults to 8.
+        """
+        self.tiers = [tier for tier, _, _ in tiers]
+        self.limits = np.array([limit for _, limit, _ in tiers], dtype=np.float32)
+        self.intervals = np.array([interval for _, _, interval in tiers], dtype=np.int32)
+        self.budget = budget
+        self.max_wait = max_wait
+        self.step: int = 0
+        self.ticks = np.zeros(len(tiers), dtype=np.int64)  # Enemies ticked per tier in the last step
+        self.deferred: int = 0  # Enemies that were due in the last step but over the budget
+        self.totals = np.zeros(len(tiers), dtype=np.int64)  # Enemies ticked per tier since the last reset
+        self.steps: int = 0  # Steps since the last reset
+
+    def tiers_of(self, distances: np.ndarray) -> np.ndarray:
+        """
+        Returns the index of each distance's tier.
+        """
+        return np.searchsorted(self.limits, distances, side='left')
+
+    def select(self, distances: np.ndarray, phases: np.ndarray, waits: np.ndarray) -> np.ndarray:
+        """
+        Picks the enemies that tick this step.
+
+        Args:
+            distances (np.ndarray): Each enemy's distance to the player.
+            phases (np.ndarray): Each enemy's phase, fixed when it was added.
+            waits (np.ndarray): Steps since each enemy last ticked, counting this one.
+
+        Returns:
+            np.ndarray: The indices of the enemies to tick, nearest tier first.
+        """
+        tiers = self.tiers_of(distances)
+        intervals = self.intervals[tiers]
+        due = np.flatnonzero(((self.step + phases) % intervals == 0) | (waits >= intervals))
+        near = due[tiers[due] == 0]
+        near = near[np.argsort(-waits[near], kind='stable')[:self.budget]]
+        farther = due[tiers[due] > 0]
+        overdue = waits[farther] / intervals[farther]
+        farther = farther[np.lexsort((tiers[farther], -overdue))[:self.budget - len(near)]]
+        selected = np.concatenate((near, farther))
+
+        self.ticks = np.bincount(tiers[selected], minlength=len(self.tiers))
+        self.deferred = len(due) - len(selected)
+        self.totals += self.ticks
+        self.steps += 1
+        self.step += 1
+        return selected
+
+    def reset_counts(self) -> None:
+        """
+        Clears the running totals.
+        """
+        self.totals[:] = 0
+        self.steps = 0
+
+    def counts(self) -> dict:
+        """
+        Returns the enemies ticked per tier and the enemies deferred in the last step, and the
+        mean ticked per tier per step since the last reset.
+        """
+        counts = {f'{tier.name.lower()}_ticks': int(ticks) for tier, ticks in zip(self.tiers, self.ticks)}
+        counts['deferred'] = self.deferred
+        for tier, total in zip(self.tiers, self.totals):
+            counts[f'{tier.name.lower()}_mean'] = float(total) / self.steps if self.steps else 0.0
+        return counts
@@ -0,0 +1,377 @@
+from ursina import *
+import sys
+import os
+from math import floor
+import numpy as np
+from panda3d.core import (
+    Geom, GeomEnums, GeomNode, GeomTriangles, GeomVertexArrayFormat, GeomVertexData, GeomVertexFormat,
+    InternalName,
+)
+
+# Add the src directory to the system path to allow imports from the src package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.asset_streamer import AssetStreamer
+from src.enums.asset_priority import AssetPriority
+from src.enums.arena_piece import ArenaPiece
+from src.frame_profiler import profiled
+from src.static_world import static_world
+from src.flow_field import NavGrid, flow_field
+
+ARENA_SEED = 0
+CHUNK_SIZE = 64  # Edge length of a chunk in world units
+ARENA_RADIUS = 6  # Chunks from the centre chunk to the edge: 13 x 13 chunks, 832 units across
+VIEW_DISTANCE = 1  # Chunks around the player that are drawn
+CHUNKS_PER_FRAME = 1  # Chunks built per frame while streaming
+GROUND_TEXTURE = '../assets/images/ground.png'
+TEXTURE_TILE = 20  # World units per repeat of the ground texture, as on the old 100-unit plane
+
+PIECES_PER_CHUNK = (10, 16)
+PLACEMENT_ATTEMPTS = 8  # Tries to find free space for a piece before it is skipped
+SPAWN_CLEARING = 20  # Radius around the spawn point kept free of pieces
+PIECE_GAP = 2  # Minimum space between pieces, so there is always a way around them
+EDGE_MARGIN = 2  # Space between pieces and the chunk edge, where perimeter walls go
+PERIMETER_HEIGHT = 6
+PERIMETER_THICKNESS = 1
+
+PIECE_WEIGHTS = {ArenaPiece.COVER: 5, ArenaPiece.WALL: 3, ArenaPiece.PLATFORM: 2}
+PIECE_COLORS = {
+    ArenaPiece.COVER: (0.85, 0.7, 0.5),
+    ArenaPiece.WALL: (0.6, 0.62, 0.7),
+    ArenaPiece.PLATFORM: (0.55, 0.75, 0.6),
+}
+
+# Faces drawn for every piece, as (axis, direction, shade). Pieces stand on the ground, so they have
+# no bottom; each side is darkened by a fixed amount to tell the faces apart without lighting
+FACES = ((1, 1, 1.0), (0, 1, 0.8), (0, -1, 0.8), (2, 1, 0.65), (2, -1, 0.65))
+TEXCOORD_AXES = {0: (2, 1), 1: (0, 2), 2: (0, 1)}  # Face axis -> world axes the texture is laid along
+
+# Position, color and texture coordinates, interleaved as Panda3D lays them out
+VERTEX_DTYPE = np.dtype([('position', np.float32, 3), ('color', np.uint8, 4), ('texcoord', np.float32, 2)])
+
+def vertex_format() -> GeomVertexFormat:
+    array = GeomVertexArrayFormat()
+    array.addColumn(InternalName.getVertex(), 3, GeomEnums.NT_float32, GeomEnums.C_point)
+    array.addColumn(InternalName.getColor(), 4, GeomEnums.NT_uint8, GeomEnums.C_color)
+    array.addColumn(InternalName.getTexcoord(), 2, GeomEnums.NT_float32, GeomEnums.C_texcoord)
+    return GeomVertexFormat.registerFormat(array)
+
+def piece_size(kind: ArenaPiece, rng: random.Random) -> tuple:
+    """
+    Returns a random (width, height, depth) for a piece of the given kind.
+    """
+    if kind == ArenaPiece.COVER:
+        return rng.uniform(1.5, 3), rng.uniform(1, 2), rng.uniform(1.5, 3)
+    if kind == ArenaPiece.WALL:
+        length, thickness, height = rng.uniform(6, 16), 0.8, rng.uniform(3, 4)
+        return (length, height, thickness) if rng.random() < 0.5 else (thickness, height, length)
+    return rng.uniform(5, 10), rng.uniform(0.8, 1.5), rng.uniform(5, 10)
+
+def generate_chunk(seed: int, coords: tuple, chunk_size: float = CHUNK_SIZE, radius: int = ARENA_RADIUS) -> tuple:
+    """
+    Lays out the static pieces of one chunk. The layout depends only on the seed and the chunk's
+    coordinates, so a chunk comes back the same however often it is streamed out and in. Every
+    piece is a box standing on the ground, fully inside its chunk; chunks on the edge of the
+    arena also get a perimeter wall along their outer sides.
+
+    Args:
+        seed (int): The arena seed.
+        coords (tuple): The chunk's (x, z) coordinates; chunk (0, 0) is centred on the spawn point.
+        chunk_size (float): The edge length of a chunk.
+        radius (int): Chunks from the centre chunk to the edge of the arena.
+
+    Returns:
+        tuple: (boxes, kinds): an (n, 6) float32 array of (min x, min y, min z, max x, max y, max z)
+            and an (n,) uint8 array of ArenaPiece values.
+    """
+    rng = random.Random(f"{seed}:{coords[0]}:{coords[1]}")
+    low_x, low_z = (coords[0] - 0.5) * chunk_size, (coords[1] - 0.5) * chunk_size
+    high_x, high_z = low_x + chunk_size, low_z + chunk_size
+    kinds_by_weight, weights = list(PIECE_WEIGHTS), list(PIECE_WEIGHTS.values())
+    boxes, kinds = [], []
+
+    def free(box: tuple) -> bool:
+        dx = max(box[0], -box[3], 0)  # Horizontal distance from the spawn point to the box
+        dz = max(box[2], -box[5], 0)
+        if dx * dx + dz * dz < SPAWN_CLEARING ** 2:
+            return False
+        return not any(
+            box[0] < other[3] + PIECE_GAP and other[0] < box[3] + PIECE_GAP and
+            box[2] < other[5] + PIECE_GAP and other[2] < box[5] + PIECE_GAP
+            for other in boxes
+        )
+
+    for _ in range(rng.randint(*PIECES_PER_CHUNK)):
+        for _ in range(PLACEMENT_ATTEMPTS):
+            kind = rng.choices(kinds_by_weight, weights)[0]
+            width, height, depth = piece_size(kind, rng)
+            x = rng.uniform(low_x + EDGE_MARGIN + width / 2, high_x - EDGE_MARGIN - width / 2)
+            z = rng.uniform(low_z + EDGE_MARGIN + depth / 2, high_z - EDGE_MARGIN - depth / 2)
+            box = (x - width / 2, 0, z - depth / 2, x + width / 2, height, z + depth / 2)
+            if free(box):
+                boxes.append(box)
+                kinds.append(kind)
+                break
+
+    t, h = PERIMETER_THICKNESS, PERIMETER_HEIGHT
+    if coords[0] == -radius:
+        boxes.append((low_x, 0, low_z, low_x + t, h, high_z))
+    if coords[0] == radius:
+        boxes.append((high_x - t, 0, low_z, high_x, h, high_z))
+    if coords[1] == -radius:
+        boxes.append((low_x, 0, low_z, high_x, h, low_z + t))
+    if coords[1] == radius:
+        boxes.append((low_x, 0, high_z - t, high_x, h, high_z))
+    kinds.extend([ArenaPiece.WALL] * (len(boxes) - len(kinds)))
+
+    return np.array(boxes, dtype=np.float32).reshape(-1, 6), np.array(kinds, dtype=np.uint8)
+
+def quads(corners: np.ndarray, rgb: np.ndarray, axis: int, shade: float) -> np.ndarray:
+    """
+    Returns the vertices of a batch of quads facing along one axis.
+
+    Args:
+        corners (np.ndarray): (n, 4, 3) corner positions, clockwise seen from the front.
+        rgb (np.ndarray): (n, 3) colors, 0 to 1.
+        axis (int): The axis the quads face along.
+        shade (float): How much the color is darkened.
+    """
+    vertices = np.zeros(corners.shape[:2], dtype=VERTEX_DTYPE)
+    vertices['position'] = corners
+    vertices['color'][..., :3] = (np.clip(rgb * shade, 0, 1) * 255 + 0.5).astype(np.uint8)[:, None, :]
+    vertices['color'][..., 3] = 255
+    u, v = TEXCOORD_AXES[axis]
+    vertices['texcoord'] = corners[..., [u, v]] / TEXTURE_TILE  # World-space, so the texture lines up across pieces
+    return vertices.reshape(-1)
+
+def box_corners(boxes: np.ndarray, axis: int, direction: int) -> np.ndarray:
+    """
+    Returns the (n, 4, 3) corners of one face of each box, clockwise seen from outside, which is
+    front-facing in Ursina's left-handed coordinate system.
+    """
+    mins, maxs = boxes[:, :3], boxes[:, 3:]
+    u, v = (axis + 1) % 3, (axis + 2) % 3
+    if direction > 0:
+        u, v = v, u
+    corners = np.empty((len(boxes), 4, 3), dtype=np.float32)
+    corners[:, :, axis] = (maxs if direction > 0 else mins)[:, axis, None]
+    for i, (at_u, at_v) in enumerate(((0, 0), (1, 0), (1, 1), (0, 1))):
+        corners[:, i, u] = (maxs if at_u else mins)[:, u]
+        corners[:, i, v] = (maxs if at_v else mins)[:, v]
+    return corners
+
+def build_chunk_geometry(boxes: np.ndarray, kinds: np.ndarray, bounds: tuple) -> GeomNode:
+    """
+    Merges a chunk's ground and every piece on it into a single Geom, drawn with one draw call.
+    Vertices are in world space; faces are told apart by baked shading rather than lighting.
+
+    Args:
+        boxes (np.ndarray): (n, 6) piece boxes, as returned by generate_chunk.
+        kinds (np.ndarray): (n,) ArenaPiece values.
+        bounds (tuple): The chunk's (min x, min z, max x, max z) on the ground.
+
+    Returns:
+        GeomNode: The chunk's geometry.
+    """
+    low_x, low_z, high_x, high_z = bounds
+    ground = np.array([[low_x, 0, low_z, high_x, 0, high_z]], dtype=np.float32)
+    parts = [quads(box_corners(ground, 1, 1), np.ones((1, 3)), 1, 1.0)]
+    rgb = np.array([PIECE_COLORS[ArenaPiece(kind)] for kind in kinds]).reshape(-1, 3)
+    for axis, direction, shade in FACES:
+        if len(boxes):
+            parts.append(quads(box_corners(boxes, axis, direction), rgb, axis, shade))
+    vertices = np.concatenate(parts)
+
+    starts = np.arange(0, len(vertices), 4, dtype=np.uint32)[:, None]
+    indices = (starts + np.array([0, 1, 2, 0, 2, 3], dtype=np.uint32)).reshape(-1)
+
+    vertex_data = GeomVertexData('arena_chunk', vertex_format(), GeomEnums.UH_static)
+    vertex_data.setNumRows(len(vertices))
+    memoryview(vertex_data.modifyArray(0)).cast('B')[:] = vertices.tobytes()
+    triangles = GeomTriangles(GeomEnums.UH_static)
+    triangles.setIndexType(GeomEnums.NT_uint32)
+    index_array = triangles.modifyVertices()
+    index_array.setNumRows(len(indices))
+    memoryview(index_array).cast('B')[:] = indices.tobytes()
+
+    geom = Geom(vertex_data)
+    geom.addPrimitive(triangles)
+    node = GeomNode('arena_chunk')
+    node.addGeom(geom)
+    return node
+
+class ArenaChunk(Entity):
+    """
+    One square of the arena, drawn as a single merged mesh of its ground and pieces. Its
+    collision lives in the StaticWorld, registered by the Arena.
+    """
+
+    def __init__(self, coords: tuple, boxes: np.ndarray, kinds: np.ndarray, chunk_size: float, texture, **kwargs) -> None:
+        """
+        Args:
+            coords (tuple): The chunk's (x, z) coordinates.
+            boxes (np.ndarray): (n, 6) piece boxes in world space.
+            kinds (np.ndarray): (n,) ArenaPiece values.
+            chunk_size (float): The edge length of the chunk.
+            texture (Texture): The texture laid over the ground and pieces.
+            **kwargs: Additional arguments passed to the Entity constructor.
+        """
+        super().__init__(**kwargs)
+        self.coords = coords
+        self.boxes = boxes
+        self.kinds = kinds
+        low_x, low_z = (coords[0] - 0.5) * chunk_size, (coords[1] - 0.5) * chunk_size
+        self.footprint = (low_x, low_z, low_x + chunk_size, low_z + chunk_size)
+
+        self.mesh = self.attachNewNode(build_chunk_geometry(boxes, kinds, self.footprint))
+        self.mesh.setTexture(texture._texture, 1)
+        self.mesh.setLightOff(1)  # Shading is baked into the vertex colors
+
+class Arena(Entity):
+    """
+    A seeded procedural arena of cover, walls and platforms, far larger than what is drawn at
+    once. The arena is split into square chunks that are generated, merged and streamed in
+    around the camera: chunks within VIEW_DISTANCE are drawn, the ring just beyond is built
+    ahead of time but kept hidden, and anything further out is dropped. However big the arena,
+    at most (2 * VIEW_DISTANCE + 1) ** 2 meshes are drawn. Every built chunk's boxes are
+    registered with the StaticWorld, which the player collides with. The whole layout is also
+    rasterized once into the NavGrid the enemies' shared FlowField paths through.
+    """
+    _instance = None  # Holds the shared Arena
+
+    @classmethod
+    def instance(cls) -> 'Arena':
+        """
+        Returns the shared Arena, creating it on first use. Must be called after the Ursina app
+        has been created.
+        """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, seed: int = ARENA_SEED, chunk_size: float = CHUNK_SIZE, radius: int = ARENA_RADIUS,
+                 view_distance: int = VIEW_DISTANCE, **kwargs) -> None:
+        """
+        Args:
+            seed (int): Seed for the layout. The same seed always gives the same arena.
+            chunk_size (float): The edge length of a chunk in world units.
+            radius (int): Chunks from the centre chunk to the edge of the arena.
+            view_distance (int): Chunks around the camera that are drawn.
+            **kwargs: Additional arguments passed to the Entity constructor.
+        """
+        super().__init__(eternal=True, **kwargs)
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.radius = radius
+        self.view_distance = view_distance
+        self.chunks: dict = {}  # (x, z) -> ArenaChunk
+        self.ground_texture = None
+        AssetStreamer.instance().texture(GROUND_TEXTURE, self.set_ground_texture, AssetPriority.CRITICAL)
+        self.center = None  # The chunk the camera was last in
+        self.pending: list = []  # Chunks still to build, nearest first
+        static_world.reset(chunk_size)
+        flow_field.reset(self.nav_grid())
+
+    @property
+    def extent(self) -> float:
+        """
+        Distance from the spawn point to the arena's edge.
+        """
+        return (self.radius + 0.5) * self.chunk_size
+
+    def chunk_of(self, x: float, z: float) -> tuple:
+        """
+        Returns the coordinates of the chunk containing a point on the ground.
+        """
+        return floor(x / self.chunk_size + 0.5), floor(z / self.chunk_size + 0.5)
+
+    def set_ground_texture(self, texture) -> None:
+        """
+        Lays a texture over every chunk, built or still to come. Called with a placeholder until
+        the ground texture has streamed in, then with the texture itself.
+        """
+        self.ground_texture = texture
+        for chunk in self.chunks.values():
+            chunk.mesh.setTexture(texture._texture, 1)
+
+    def nav_grid(self) -> NavGrid:
+        """
+        Lays out every chunk of the arena, built or not, and returns the cells enemies can fly
+        through. Enemies roam the whole arena, not just the chunks streamed in around the camera.
+        """
+        grid = NavGrid(-self.extent, -self.extent, 2 * self.extent)
+        for x in range(-self.radius, self.radius + 1):
+            for z in range(-self.radius, self.radius + 1):
+                boxes, _ = generate_chunk(self.seed, (x, z), self.chunk_size, self.radius)
+                for box in boxes.tolist():
+                    grid.block_box(box)
+        return grid
+
+    def update(self) -> None:
+        self.stream(camera.world_position, CHUNKS_PER_FRAME)
+
+    @profiled('Arena.stream')
+    def stream(self, position, budget: int = None) -> int:
+        """
+        Brings the chunks around a position in and drops the ones left behind. New chunks are built
+        nearest first, at most `budget` per call; the chunk containing the position is always
+        built at once, so the ground is never missing underfoot.
+
+        Args:
+            position (Vec3): The position to stream around, usually the camera's.
+            budget (int): The most chunks to build in this call. Defaults to no limit.
+
+        Returns:
+            int: The number of chunks built.
+        """
+        center = self.chunk_of(position[0], position[2])
+        if center != self.center:
+            self.center = center
+            keep = self.view_distance + 1  # Built ahead of time, but not drawn
+            for coords in list(self.chunks):
+                distance = self.distance(coords, center)
+                if distance > keep:
+                    self.unload(coords)
+                else:
+                    self.chunks[coords].enabled = distance <= self.view_distance
+            wanted = [
+                (x, z)
+                for x in range(max(center[0] - keep, -self.radius), min(center[0] + keep, self.radius) + 1)
+                for z in range(max(center[1] - keep, -self.radius), min(center[1] + keep, self.radius) + 1)
+                if (x, z) not in self.chunks
+            ]
+            self.pending = sorted(wanted, key=lambda coords: self.distance(coords, center))
+
+        built = 0
+        while self.pending and (budget is None or built < budget or self.pending[0] == center):
+            self.load(self.pending.pop(0))
+            built += 1
+        return built
+
+    @staticmethod
+    def distance(a: tuple, b: tuple) -> int:
+        return max(abs(a[0] - b[0]), abs(a[1] - b[1]))
+
+    def load(self, coords: tuple) -> ArenaChunk:
+        """
+        Generates and builds one chunk and registers its collision.
+
+        Args:
+            coords (tuple): The chunk's (x, z) coordinates.
+        """
+        boxes, kinds = generate_chunk(self.seed, coords, self.chunk_size, self.radius)
+        chunk = ArenaChunk(coords, boxes, kinds, self.chunk_size, self.ground_texture, parent=self)
+        chunk.enabled = self.distance(coords, self.center) <= self.view_distance
+        self.chunks[coords] = chunk
+        static_world.add_chunk(coords, boxes, chunk.footprint)
+        return chunk
+
+    def unload(self, coords: tuple) -> None:
+        """
+        Destroys one chunk and removes its collision.
+
+        Args:
+            coords (tuple): The chunk's (x, z) coordinates.
+        """
+        destroy(self.chunks.pop(coords))
+        static_world.remove_chunk(coords)
@@ -0,0 +1,190 @@
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+from panda3d.core import StringStream
+
+# Add the src directory to the system path to allow imports from the src package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.bake_assets import (ASSETS_DIR, BAKE_MODELS, BAKE_TEXTURES, file_hash, prepare_model, prepare_texture,
+                             source_unchanged)
+
+PACK_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'build', 'assets.pak'))
+PACK_MAGIC = b'SGPK'
+PACK_VERSION = 2  # 2: source stats in the index, models at their source scale
+
+# magic, version, index offset, index size
+HEADER = struct.Struct('<4sIQQ')
+ALIGNMENT = 16
+
+class AssetPack:
+    """
+    Read-only view of a packed asset archive. The file is memory-mapped once and each asset is
+    resolved through the archive's index to a slice of the mapping, so loading an asset does not
+    open or read a separate file. Panda3D's BAM and TXO readers take their own copy of the slice.
+
+    Layout: a fixed header, the asset blobs (16-byte aligned), then a JSON index mapping each
+    asset key to its offset, size, kind, content hash and the size, mtime and content hash of its
+    source file.
+    """
+
+    def __init__(self, path: str = PACK_PATH) -> None:
+        """
+        Maps the archive and reads its index.
+
+        Args:
+            path (str): The archive to mount.
+
+        Raises:
+            ValueError: If the file is not an asset pack of a supported version.
+        """
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, index_offset, index_size = HEADER.unpack_from(self._map, 0)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            self.close()
+            raise ValueError(f"Not a version {PACK_VERSION} asset pack: {path}")
+        self.index: dict = json.loads(bytes(self._map[index_offset:index_offset + index_size]))
+        self.source_hashes: dict = {}  # source path -> content hash, for sources whose mtime changed
+
+    def __contains__(self, key) -> bool:
+        return key in self.index
+
+    def entry(self, key: str):
+        """
+        Returns the index entry for an asset key, or None if it is not packed.
+
+        Args:
+            key (str): The asset path relative to assets/, e.g. 'models/untitled.fbx'.
+        """
+        return self.index.get(key)
+
+    def is_current(self, key: str) -> bool:
+        """
+        Returns whether a packed asset still matches its source file: True if the source has the
+        content it had when the pack was built (see source_unchanged()), or is not there to
+        compare (a shipped build may carry only the pack); False if it has changed, or the entry
+        predates this check.
+
+        Args:
+            key (str): The asset path relative to assets/.
+        """
+        entry = self.index[key]
+        try:
+            return source_unchanged(os.path.join(ASSETS_DIR, key), entry.get('source_size'),
+                                    entry.get('source_mtime'), entry.get('source_hash'), self.source_hashes)
+        except OSError:
+            return True
+
+    def read(self, key: str) -> memoryview:
+        """
+        Returns a view of an asset's bytes in the mapping, valid until the pack is closed.
+
+        Args:
+            key (str): The asset path relative to assets/.
+        """
+        entry = self.index[key]
+        return memoryview(self._map)[entry['offset']:entry['offset'] + entry['size']]
+
+    def stream(self, key: str) -> StringStream:
+        """
+        Returns a Panda3D input stream over an asset's bytes, for the BAM and TXO readers.
+
+        Args:
+            key (str): The asset path relative to assets/.
+        """
+        return StringStream(self.read(key))  # The stream holds its own copy of the bytes
+
+    def close(self) -> None:
+        """
+        Unmaps and closes the archive.
+        """
+        self._map.close()
+        self._file.close()
+
+def collect_entries(compress: bool = False) -> list:
+    """
+    Returns (key, kind, data, extra) for every file under assets/. Models and textures that the
+    bake step knows about are stored prepared (BAM at the source's scale, mipmapped TXO);
+    everything else is stored as-is. Each entry's extra holds the size, mtime and content hash
+    of its source, so a source changed after packing can be told apart.
+
+    Args:
+        compress (bool): DXT-compress prepared textures.
+    """
+    entries = []
+    for folder, dirs, files in os.walk(ASSETS_DIR):
+        dirs[:] = sorted(d for d in dirs if d != 'baked')
+        for name in sorted(files):
+            source = os.path.join(folder, name)
+            key = os.path.relpath(source, ASSETS_DIR).replace(os.sep, '/')
+            stat = os.stat(source)
+            extra = {'source_size': stat.st_size, 'source_mtime': stat.st_mtime, 'source_hash': file_hash(source)}
+
+            if key in BAKE_MODELS:
+                data = prepare_model(source).encode_to_bam_stream()
+                entries.append((key, 'bam', data, extra))
+            elif key in BAKE_TEXTURES:
+                texture, _ = prepare_texture(source, compress)
+                stream = StringStream()
+                texture.write_txo(stream)
+                entries.append((key, 'txo', stream.get_data(), extra))
+            else:
+                with open(source, 'rb') as f:
+                    entries.append((key, 'raw', f.read(), extra))
+    return entries
+
+def write_pack(path: str = PACK_PATH, compress: bool = False) -> dict:
+    """
+    Bundles assets/ into a single indexed archive.
+
+    Args:
+        path (str): The archive to write.
+        compress (bool): DXT-compress prepared textures.
+
+    Returns:
+        dict: The archive's index.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    index = {}
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(b'\0' * HEADER.size)
+        for key, kind, data, extra in collect_entries(compress):
+            f.write(b'\0' * (-f.tell() % ALIGNMENT))
+            index[key] = {
+                'offset': f.tell(),
+                'size': len(data),
+                'kind': kind,
+                'hash': hashlib.sha256(data).hexdigest(),
+                **extra,
+            }
+            f.write(data)
+
+        index_data = json.dumps(index, sort_keys=True).encode('utf-8')
+        index_offset = f.tell()
+        f.write(index_data)
+        f.seek(0)
+        f.write(HEADER.pack(PACK_MAGIC, PACK_VERSION, index_offset, len(index_data)))
+    os.replace(temp_path, path)
+    return index
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Bundle assets/ into a single memory-mappable archive.')
+    parser.add_argument('--output', default=PACK_PATH, help='archive to write')
+    parser.add_argument('--compress', action='store_true', help='DXT-compress packed textures')
+    args = parser.parse_args(argv)
+
+    index = write_pack(args.output, compress=args.compress)
+    size = os.path.getsize(args.output)
+    print(f"packed {len(index)} asset(s) into {args.output} ({size / 1024 / 1024:.1f} MiB)")
+
+if __name__ == '__main__':
+    main()
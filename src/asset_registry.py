@@ -0,0 +1,318 @@
+from ursina import *
+import sys
+import os
+import time as wall_time
+from pathlib import Path
+from panda3d.core import Filename
+from panda3d.core import Texture as PandaTexture
+
+# Add the src directory to the system path to allow imports from the src package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.bake_assets import ASSETS_DIR, BAKE_DIR, BAKE_MODELS, load_manifest, source_unchanged
+from src.asset_pack import PACK_PATH, AssetPack
+from src.event_log import event_log
+
+SRC_DIR = os.path.abspath(os.path.dirname(__file__))
+
+# Assets loaded during the prewarm phase, before the first frame is drawn
+PREWARM_MODELS = (
+    '../assets/models/untitled.fbx',
+    '../assets/models/pistol.obj',
+)
+PREWARM_TEXTURES = (
+    '../assets/images/drone_d.png',
+    '../assets/images/pistol/color.png',
+    '../assets/images/ground.png',
+    '../assets/images/Sky.png',
+    '../assets/images/HealthBar.png',
+    '../assets/images/Kills.png',
+)
+
+class AssetRegistry:
+    """
+    Singleton class that loads each model and texture once and hands out shared handles.
+    Models are returned as copies of a prepared prototype that share its geometry; textures
+    are shared directly. Hit/miss counts and load times are kept per asset. Assets that have been
+    baked with bake_assets.py are loaded from their BAM/TXO output instead of the source file, and
+    when an asset pack is mounted, assets in it are resolved through its index before either.
+    """
+    _instance = None  # Holds the singleton instance of AssetRegistry
+
+    def __new__(cls) -> 'AssetRegistry':
+        """
+        Ensures that only one instance of AssetRegistry exists (singleton pattern).
+
+        Returns:
+            AssetRegistry: The singleton instance of AssetRegistry.
+        """
+        if cls._instance is None:
+            cls._instance = super(AssetRegistry, cls).__new__(cls)
+            cls._instance.init_registry()
+        return cls._instance
+
+    def init_registry(self) -> None:
+        """
+        Initializes empty caches and statistics.
+        """
+        self.models: dict = {}  # path -> prototype NodePath
+        self.textures: dict = {}  # path -> Texture
+        self.stats: dict = {}  # path -> {'hits', 'misses', 'load_time'}
+        self.manifest: dict = load_manifest()['assets']
+        self.source_hashes: dict = {}  # source path -> content hash, for sources whose mtime changed
+        self.pack = None  # Mounted AssetPack, if any
+
+    def prewarm(self, models=PREWARM_MODELS, textures=PREWARM_TEXTURES) -> float:
+        """
+        Loads the given assets ahead of time so later requests never touch the disk.
+        Must be called after the Ursina app has been created.
+
+        Args:
+            models (iterable): Model paths to load.
+            textures (iterable): Texture paths to load.
+
+        Returns:
+            float: The total time spent loading, in seconds.
+        """
+        start = wall_time.perf_counter()
+        for path in models:
+            self.load_model(path)
+        for path in textures:
+            self.load_texture(path)
+        return wall_time.perf_counter() - start
+
+    def mount_pack(self, path: str = PACK_PATH) -> bool:
+        """
+        Memory-maps an asset pack so later loads are served from it. Assets already cached
+        are not reloaded, and assets whose source has changed since the pack was built are
+        loaded from their bake or source instead.
+
+        Args:
+            path (str): The pack to mount.
+
+        Returns:
+            bool: Whether a pack was mounted; False if the file does not exist or is not a pack
+                of this version, in which case assets load from their bakes or sources.
+        """
+        if not os.path.exists(path):
+            return False
+        try:
+            pack = AssetPack(path)
+        except ValueError as error:
+            event_log.warning('asset_pack_skipped', path=path, reason=str(error))
+            return False
+        if self.pack:
+            self.pack.close()
+        self.pack = pack
+        return True
+
+    def model(self, path: str):
+        """
+        Returns a new handle to a model, loading it first if it is not cached. Each handle is a
+        separate node that can be parented to its own entity but shares the prototype's geometry.
+
+        Args:
+            path (str): The model path, as passed to Ursina's load_model().
+        """
+        prototype = self.models.get(path)
+        if prototype is None:
+            prototype = self.load_model(path)
+            if prototype is None:
+                return None
+        else:
+            self.stats[path]['hits'] += 1
+        return prototype.copyTo(NodePath())
+
+    def texture(self, path: str):
+        """
+        Returns the shared texture for a path, loading it first if it is not cached.
+
+        Args:
+            path (str): The texture path, as passed to Ursina's load_texture().
+        """
+        texture = self.textures.get(path)
+        if texture is None:
+            return self.load_texture(path)
+        self.stats[path]['hits'] += 1
+        return texture
+
+    def load_model(self, path: str):
+        """
+        Loads and caches a model prototype, recording the miss and its load time. Loading a
+        model that is already cached returns the cached prototype.
+
+        Args:
+            path (str): The model path, as passed to Ursina's load_model().
+        """
+        if path in self.models:
+            return self.models[path]
+
+        start = wall_time.perf_counter()
+        packed = self.packed_kind(path) == 'bam'
+        baked = None if packed else self.baked_path(path)  # A packed model never touches its files
+        if packed:
+            prototype = NodePath.decode_from_bam_stream(bytes(self.pack.read(self.asset_key(path))))
+        elif baked:
+            prototype = application.base.loader.loadModel(Filename.fromOsSpecific(baked))
+        else:
+            prototype = load_model(path)
+        self.record_miss(path, wall_time.perf_counter() - start)
+        if prototype is not None:
+            self.models[path] = prototype
+        return prototype
+
+    def load_texture(self, path: str):
+        """
+        Loads and caches a texture, recording the miss and its load time. Loading a texture
+        that is already cached returns the cached texture.
+
+        Args:
+            path (str): The texture path, as passed to Ursina's load_texture().
+        """
+        if path in self.textures:
+            return self.textures[path]
+
+        start = wall_time.perf_counter()
+        panda_texture = self.read_texture(path)
+        if panda_texture is not None:
+            return self.adopt_texture(path, panda_texture, wall_time.perf_counter() - start)
+        texture = load_texture(path)
+        self.record_miss(path, wall_time.perf_counter() - start)
+        if texture is not None:
+            self.textures[path] = texture
+        return texture
+
+    def texture_source(self, path: str):
+        """
+        Returns where a texture is read from: (pack file, key in the pack) if it is packed,
+        (baked or source file, None) otherwise, or None for a texture only Ursina's loader can find.
+
+        Args:
+            path (str): The texture path, relative to the src folder.
+        """
+        if self.packed_kind(path) == 'txo':
+            return self.pack.path, self.asset_key(path)
+        source = self.baked_path(path) or os.path.join(SRC_DIR, path)
+        return (source, None) if os.path.isfile(source) else None
+
+    def read_texture(self, path: str):
+        """
+        Reads a texture from the pack, its bake or its source file into a new Panda3D texture
+        without touching the caches or Ursina. Returns None for a texture only Ursina's loader
+        can find or that cannot be read.
+
+        Args:
+            path (str): The texture path, relative to the src folder.
+        """
+        source = self.texture_source(path)
+        if source is None:
+            return None
+        panda_texture = PandaTexture()
+        if source[1] is not None:
+            ok = panda_texture.read_txo(self.pack.stream(source[1]))
+        else:
+            ok = panda_texture.read(Filename.fromOsSpecific(source[0]))
+        return panda_texture if ok else None
+
+    def adopt_texture(self, path: str, panda_texture, load_time: float):
+        """
+        Wraps a texture read outside Ursina for it, caches it and records the miss.
+
+        Args:
+            path (str): The texture path.
+            panda_texture (panda3d.core.Texture): The texture read.
+            load_time (float): Seconds spent reading it.
+        """
+        texture = Texture(panda_texture, filtering='mipmap')
+        # Ursina only sets these when it loads the texture from a file itself
+        texture.path = Path(path)
+        texture._cached_image = None
+        self.record_miss(path, load_time)
+        self.textures[path] = texture
+        return texture
+
+    def asset_key(self, path: str):
+        """
+        Returns an asset's path relative to the assets folder, as used by the bake manifest,
+        or None if the path is outside it.
+
+        Args:
+            path (str): The asset path, relative to the src folder.
+        """
+        key = os.path.relpath(os.path.normpath(os.path.join(SRC_DIR, path)), ASSETS_DIR)
+        if key.startswith('..'):
+            return None
+        return key.replace(os.sep, '/')
+
+    def baked_path(self, path: str):
+        """
+        Returns the baked file for an asset, or None if it has not been baked or its source
+        has changed since it was (see source_unchanged(): a source is only read to hash it when
+        its size matches and its mtime does not, so one only touched keeps its bake).
+
+        Args:
+            path (str): The asset path, relative to the src folder.
+        """
+        key = self.asset_key(path)
+        entry = self.manifest.get(key)
+        if not entry:
+            return None
+
+        baked = os.path.join(BAKE_DIR, entry['output'])
+        try:
+            unchanged = source_unchanged(os.path.join(ASSETS_DIR, key), entry['source_size'], entry['source_mtime'],
+                                         entry['hash'], self.source_hashes)
+        except OSError:
+            return None
+        if not unchanged or not os.path.exists(baked):
+            return None
+        return baked
+
+    def packed_kind(self, path: str):
+        """
+        Returns how an asset is stored in the mounted pack ('bam', 'txo' or 'raw'), or None if no
+        pack is mounted, the asset is not in it or its source has changed since it was packed.
+
+        Args:
+            path (str): The asset path, relative to the src folder.
+        """
+        if not self.pack:
+            return None
+        key = self.asset_key(path)
+        entry = self.pack.entry(key)
+        if not entry or not self.pack.is_current(key):
+            return None
+        return entry['kind']
+
+    def unit_scale(self, path: str) -> float:
+        """
+        Returns the factor to multiply into an entity's scale to bring a model to game units.
+        Models are baked and packed at the size of their source, so it is the same whether the
+        model came from the source file, a bake or the pack, and so are the entity's scale,
+        forward vector and collider.
+
+        Args:
+            path (str): The model path, relative to the src folder.
+        """
+        return BAKE_MODELS.get(self.asset_key(path), 1.0)
+
+    def record_miss(self, path: str, load_time: float) -> None:
+        """
+        Records a cache miss and the time it took to load the asset.
+
+        Args:
+            path (str): The asset path.
+            load_time (float): Seconds spent loading.
+        """
+        entry = self.stats.setdefault(path, {'hits': 0, 'misses': 0, 'load_time': 0.0})
+        entry['misses'] += 1
+        entry['load_time'] += load_time
+
+    def report(self) -> str:
+        """
+        Returns a table of hits, misses and load time per asset.
+        """
+        lines = [f"{'asset':<40} {'hits':>6} {'misses':>6} {'load ms':>9}"]
+        for path, entry in sorted(self.stats.items()):
+            lines.append(f"{path:<40} {entry['hits']:>6} {entry['misses']:>6} {entry['load_time'] * 1000:>9.2f}")
+        return '\n'.join(lines)
@@ -0,0 +1,250 @@
+from ursina import *
+import sys
+import os
+import heapq
+import multiprocessing
+import time as wall_time
+from concurrent.futures import ProcessPoolExecutor
+from panda3d.core import PNMImage
+from panda3d.core import Texture as PandaTexture
+
+# Add the src directory to the system path to allow imports from the src package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.enums.asset_priority import AssetPriority
+from src.asset_registry import AssetRegistry
+from src.texture_decoder import build_texture, decode_texture
+from src.frame_profiler import profiled
+from src.event_log import event_log
+
+STREAM_BUDGET_MS = 4.0  # Wall-clock milliseconds per frame spent adopting streamed assets
+PLACEHOLDER_SHADE = 0.5  # Grey level of the placeholder texture
+PLACEHOLDER_MODEL = 'cube'
+
+def placeholder_texture() -> Texture:
+    """
+    Returns a one-pixel grey texture shown until a streamed texture is ready.
+    """
+    image = PNMImage(1, 1, 3)
+    image.fill(PLACEHOLDER_SHADE)
+    panda_texture = PandaTexture('placeholder')
+    panda_texture.load(image)
+    texture = Texture(panda_texture)
+    texture._cached_image = None  # Ursina only sets this when it loads the texture from a file itself
+    return texture
+
+class AssetStreamer(Entity):
+    """
+    Loads assets in the background so the main thread never waits on the disk. A request for
+    an asset that is not cached yet hands out a placeholder (a grey texture or a cube) at once
+    and queues the asset; queued assets are loaded most urgent first, and each is adopted into
+    the AssetRegistry and swapped in for everything that asked for it as soon as it is ready.
+    Requests for cached assets are served at once.
+
+    Textures are decoded in a worker process, one at a time so a texture needed now never waits
+    behind a skybox: Panda3D's readers hold the GIL, so a loading thread would stall the frame
+    for as long as a read takes. Copying the decoded images into a texture is all that is left
+    for the main thread. Models are small and are loaded on the main thread in their turn. Both
+    are adopted within a per-frame time budget, at least one asset a frame.
+    """
+    _instance = None
+
+    def __init__(self, budget_ms: float = STREAM_BUDGET_MS, **kwargs) -> None:
+        """
+        Args:
+            budget_ms (float): Wall-clock milliseconds per frame to spend adopting assets. Defaults to 4.
+            **kwargs: Additional arguments passed to the Entity constructor.
+        """
+        super().__init__(eternal=True, **kwargs)
+        self.budget_ms = budget_ms
+        self.registry = AssetRegistry()
+        self.placeholder = placeholder_texture()
+        self.placeholder_model = load_model(PLACEHOLDER_MODEL)
+        self.queue: list = []  # Heap of (priority, order, kind, path)
+        self.order: int = 0
+        self.queued: dict = {}  # (kind, path) -> priority, until the asset is delivered
+        self.requested: dict = {}  # (kind, path) -> wall time of the first request
+        self.waiting: dict = {}  # (kind, path) -> [callbacks]
+        self.decoding = None  # (path, future) of the texture being decoded
+        self.executor = None  # Started by the first texture decoded
+
+    @classmethod
+    def instance(cls) -> 'AssetStreamer':
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @property
+    def pending(self) -> int:
+        """
+        The number of requested assets that have not been delivered yet.
+        """
+        return len(self.queued)
+
+    def texture(self, path: str, apply, priority: AssetPriority = AssetPriority.NORMAL, placeholder: bool = True) -> None:
+        """
+        Calls `apply` with a texture: the cached one right away if it has been loaded, otherwise
+        the placeholder now and the real texture once it is ready.
+
+        Args:
+            path (str): The texture path, relative to the src folder.
+            apply (callable): Called with each Ursina Texture, e.g. an entity's texture_setter.
+            priority (AssetPriority): How soon the texture is needed.
+            placeholder (bool): Whether to apply the placeholder while the texture loads, or
+                leave whatever is there.
+        """
+        if path in self.registry.textures:
+            apply(self.registry.texture(path))
+            return
+        if placeholder:
+            apply(self.placeholder)
+        self.enqueue('texture', path, apply, priority)
+
+    def model(self, path: str, apply, priority: AssetPriority = AssetPriority.NORMAL, placeholder: bool = True) -> None:
+        """
+        Calls `apply` with a handle to a model: a copy of the cached one right away if it has
+        been loaded, otherwise a placeholder cube now and the real model once it is ready.
+
+        Args:
+            path (str): The model path, relative to the src folder.
+            apply (callable): Called with each NodePath, e.g. an entity's model_setter.
+            priority (AssetPriority): How soon the model is needed.
+            placeholder (bool): Whether to apply the placeholder while the model loads.
+        """
+        if path in self.registry.models:
+            apply(self.registry.model(path))
+            return
+        if placeholder:
+            apply(self.placeholder_model.copyTo(NodePath()))
+        self.enqueue('model', path, apply, priority)
+
+    def prefetch(self, models=(), textures=(), priority: AssetPriority = AssetPriority.BACKGROUND) -> None:
+        """
+        Queues assets that are not needed yet, so they are cached by the time they are.
+
+        Args:
+            models (iterable): Model paths.
+            textures (iterable): Texture paths.
+            priority (AssetPriority): How soon they are needed. Defaults to BACKGROUND.
+        """
+        for path in models:
+            if path not in self.registry.models:
+                self.enqueue('model', path, None, priority)
+        for path in textures:
+            if path not in self.registry.textures:
+                self.enqueue('texture', path, None, priority)
+
+    def enqueue(self, kind: str, path: str, apply, priority: AssetPriority) -> None:
+        """
+        Queues an asset. Requesting a queued asset again at a higher priority moves it up the
+        queue; the entry it leaves behind is skipped.
+        """
+        key = (kind, path)
+        if apply is not None:
+            self.waiting.setdefault(key, []).append(apply)
+        self.requested.setdefault(key, wall_time.perf_counter())
+        if key in self.queued and self.queued[key] <= priority:
+            return
+        self.queued[key] = priority
+        heapq.heappush(self.queue, (priority, self.order, kind, path))
+        self.order += 1
+
+    def submit(self, path: str) -> bool:
+        """
+        Starts decoding a texture in the worker process. Returns False, having queued nothing,
+        if only Ursina's loader can find it.
+        """
+        source = self.registry.texture_source(path)
+        if source is None:
+            return False
+        if self.executor is None:
+            # Spawned rather than forked: the game process has a graphics context and threads
+            self.executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+        self.decoding = (path, self.executor.submit(decode_texture, *source))
+        return True
+
+    @profiled('AssetStreamer.update')
+    def update(self) -> None:
+        """
+        Adopts the texture the worker has finished, then works down the queue: models are
+        loaded and textures sent to the worker in order of priority, until the frame's budget
+        is spent or the next texture has to wait for the worker.
+        """
+        deadline = wall_time.perf_counter() + self.budget_ms / 1000
+        adopted = 0
+        if self.decoding and self.decoding[1].done():
+            path, future = self.decoding
+            self.decoding = None
+            start = wall_time.perf_counter()
+            try:
+                panda_texture = build_texture(future.result(), name=os.path.basename(path))
+            except Exception as error:  # Read on the main thread instead, failing there if it must
+                event_log.warning('asset_stream_failed', path=path, error=repr(error))
+                self.registry.load_texture(path)
+            else:
+                # The load time recorded is what the main thread spent, not the wait for the worker
+                self.registry.adopt_texture(path, panda_texture, wall_time.perf_counter() - start)
+            self.deliver('texture', path)
+            adopted += 1
+
+        while self.queue:
+            priority, _, kind, path = self.queue[0]
+            if self.queued.get((kind, path)) != priority:
+                heapq.heappop(self.queue)  # Left behind when the asset moved up the queue
+                continue
+            if kind == 'texture' and self.decoding:
+                break
+            if adopted and wall_time.perf_counter() >= deadline:
+                break
+            heapq.heappop(self.queue)
+            self.queued[(kind, path)] = -1  # Loading; later requests need not queue it again
+            if kind == 'model':
+                self.registry.load_model(path)
+            elif not self.submit(path):
+                self.registry.load_texture(path)
+            else:
+                continue
+            self.deliver(kind, path)
+            adopted += 1
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Loads everything queued before returning. For loading screens and tests; the game
+        itself lets update() deliver assets as they are ready.
+
+        Args:
+            timeout (float): The most seconds to wait, or None to wait as long as it takes.
+
+        Returns:
+            bool: Whether every queued asset was delivered.
+        """
+        end = None if timeout is None else wall_time.perf_counter() + timeout
+        while self.queued:
+            if self.decoding:
+                remaining = None if end is None else max(end - wall_time.perf_counter(), 0)
+                try:
+                    self.decoding[1].exception(timeout=remaining)
+                except TimeoutError:
+                    return False
+            self.update()
+            if end is not None and wall_time.perf_counter() >= end:
+                break
+        return not self.queued
+
+    def deliver(self, kind: str, path: str) -> None:
+        """
+        Calls the callbacks waiting for an asset, skipping those of entities destroyed since.
+        """
+        key = (kind, path)
+        del self.queued[key]
+        callbacks = self.waiting.pop(key, [])
+        waited = wall_time.perf_counter() - self.requested.pop(key)
+        loaded = path in (self.registry.models if kind == 'model' else self.registry.textures)
+        event_log.info('asset_streamed', path=path, kind=kind, loaded=loaded, wait_ms=round(waited * 1000, 2))
+        if not loaded:
+            return
+        for apply in callbacks:
+            owner = getattr(apply, '__self__', None)
+            if isinstance(owner, NodePath) and owner.isEmpty():
+                continue
+            apply(self.registry.model(path) if kind == 'model' else self.registry.texture(path))
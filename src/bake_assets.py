@@ -0,0 +1,251 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+
+from panda3d.core import Filename, Loader, NodePath, Texture
+
+ASSETS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'assets'))
+BAKE_DIR = os.path.join(ASSETS_DIR, 'baked')
+MANIFEST_PATH = os.path.join(BAKE_DIR, 'manifest.json')
+MANIFEST_VERSION = 2  # 2: models are baked at their source scale
+
+# Models to convert to BAM, with the scale normalization the game applies to their units. The
+# bake keeps the source units; the normalization is applied on the entity (see unit_scale())
+BAKE_MODELS = {
+    'models/untitled.fbx': 0.001,
+    'models/pistol.obj': 1.0,
+}
+
+# Textures to pre-generate mipmaps for and store as TXO
+BAKE_TEXTURES = (
+    'images/drone_d.png',
+    'images/pistol/color.png',
+    'images/ground.png',
+    'images/Sky.png',
+    'images/HealthBar.png',
+    'images/Kills.png',
+)
+
+def file_hash(path: str) -> str:
+    """
+    Returns the SHA-256 hex digest of a file's contents.
+
+    Args:
+        path (str): The file to hash.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def source_unchanged(source: str, size: int, mtime: float, digest: str, hashes: dict = None) -> bool:
+    """
+    Returns whether a source file still has the content it had when it was baked or packed.
+    Another size means it changed and the same size and mtime mean it did not, without reading
+    it; otherwise its content hash decides.
+
+    Args:
+        source (str): The source file.
+        size (int): Its size when it was baked or packed.
+        mtime (float): Its mtime then.
+        digest (str): Its SHA-256 hex digest then.
+        hashes (dict): Digests already taken, by path, so each source is hashed at most once.
+
+    Raises:
+        OSError: If the source cannot be read.
+    """
+    stat = os.stat(source)
+    if stat.st_size != size:
+        return False
+    if stat.st_mtime == mtime:
+        return True
+    if hashes is None:
+        return file_hash(source) == digest
+    if source not in hashes:
+        hashes[source] = file_hash(source)
+    return hashes[source] == digest
+
+def load_manifest() -> dict:
+    """
+    Returns the bake manifest, or an empty one if nothing has been baked or the format changed.
+    """
+    try:
+        with open(MANIFEST_PATH) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {'version': MANIFEST_VERSION, 'assets': {}}
+
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {'version': MANIFEST_VERSION, 'assets': {}}
+    return manifest
+
+def save_manifest(manifest: dict) -> None:
+    """
+    Writes the bake manifest.
+
+    Args:
+        manifest (dict): The manifest to write.
+    """
+    os.makedirs(BAKE_DIR, exist_ok=True)
+    with open(MANIFEST_PATH, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+def output_path(key: str, extension: str) -> str:
+    """
+    Returns where the baked form of an asset is written, mirroring its place under assets/.
+
+    Args:
+        key (str): The asset path relative to assets/, e.g. 'models/untitled.fbx'.
+        extension (str): The baked file extension, e.g. '.bam'.
+    """
+    return os.path.join(BAKE_DIR, os.path.splitext(key)[0] + extension)
+
+def prepare_model(source: str) -> NodePath:
+    """
+    Loads a model and flattens its node transforms into the vertices, keeping its source units.
+
+    Args:
+        source (str): The source model file.
+    """
+    node = Loader.get_global_ptr().load_sync(Filename.from_os_specific(source))
+    if node is None:
+        raise RuntimeError(f"Could not load model: {source}")
+
+    root = NodePath('baked')
+    model = NodePath(node)
+    model.reparent_to(root)
+    root.flatten_light()  # Push the transforms into the vertex data
+    return model
+
+def prepare_texture(source: str, compress: bool) -> tuple:
+    """
+    Reads a texture and generates its full mipmap chain, optionally DXT-compressing it.
+
+    Args:
+        source (str): The source image file.
+        compress (bool): Whether to DXT-compress the RAM images.
+
+    Returns:
+        tuple: The Texture and whether it was compressed.
+    """
+    texture = Texture()
+    if not texture.read(Filename.from_os_specific(source)):
+        raise RuntimeError(f"Could not read texture: {source}")
+
+    texture.generate_ram_mipmap_images()
+    compressed = False
+    if compress:
+        mode = Texture.CM_dxt5 if texture.get_num_components() == 4 else Texture.CM_dxt1
+        compressed = texture.compress_ram_image(mode, Texture.QL_default, None)
+        if not compressed:
+            print(f"warning: compression not available, storing {source} uncompressed")
+    return texture, compressed
+
+def bake_model(source: str, output: str) -> None:
+    """
+    Converts a model to BAM with its node transforms flattened into the vertices.
+
+    Args:
+        source (str): The source model file.
+        output (str): The BAM file to write.
+    """
+    model = prepare_model(source)
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    if not model.write_bam_file(Filename.from_os_specific(output)):
+        raise RuntimeError(f"Could not write BAM: {output}")
+
+def bake_texture(source: str, output: str, compress: bool) -> bool:
+    """
+    Reads a texture, generates its full mipmap chain and writes it as TXO.
+
+    Args:
+        source (str): The source image file.
+        output (str): The TXO file to write.
+        compress (bool): Whether to DXT-compress the RAM images.
+
+    Returns:
+        bool: Whether the texture was stored compressed.
+    """
+    texture, compressed = prepare_texture(source, compress)
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    if not texture.write(Filename.from_os_specific(output)):
+        raise RuntimeError(f"Could not write TXO: {output}")
+    return compressed
+
+def is_current(entry: dict, digest: str, options: dict) -> bool:
+    """
+    Returns whether a manifest entry still describes the source and its baked output.
+
+    Args:
+        entry (dict): The manifest entry, or None.
+        digest (str): The source's current content hash.
+        options (dict): The bake options the entry must have been made with.
+    """
+    if not entry or entry['hash'] != digest:
+        return False
+    if any(entry.get(name) != value for name, value in options.items()):
+        return False
+    return os.path.exists(os.path.join(BAKE_DIR, entry['output']))
+
+def bake(force: bool = False, compress: bool = False) -> list:
+    """
+    Bakes every model and texture whose source or options changed since the last bake.
+
+    Args:
+        force (bool): Rebake everything, ignoring the manifest.
+        compress (bool): DXT-compress textures.
+
+    Returns:
+        list: The keys of the assets that were baked.
+    """
+    manifest = load_manifest()
+    assets = manifest['assets']
+    jobs = [(key, 'model', {}) for key in BAKE_MODELS]
+    jobs += [(key, 'texture', {'compress': compress}) for key in BAKE_TEXTURES]
+
+    baked = []
+    for key, kind, options in jobs:
+        source = os.path.join(ASSETS_DIR, key)
+        digest = file_hash(source)
+        if not force and is_current(assets.get(key), digest, options):
+            continue
+
+        start = time.perf_counter()
+        if kind == 'model':
+            output = output_path(key, '.bam')
+            bake_model(source, output)
+            extra = {}
+        else:
+            output = output_path(key, '.txo')
+            extra = {'compressed': bake_texture(source, output, compress)}
+
+        stat = os.stat(source)
+        assets[key] = {
+            'type': kind,
+            'hash': digest,
+            'output': os.path.relpath(output, BAKE_DIR).replace(os.sep, '/'),
+            'source_size': stat.st_size,
+            'source_mtime': stat.st_mtime,
+            **options,
+            **extra,
+        }
+        baked.append(key)
+        print(f"baked {key} -> {assets[key]['output']} in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    save_manifest(manifest)
+    return baked
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Bake game assets to BAM models and mipmapped TXO textures.')
+    parser.add_argument('--force', action='store_true', help='rebake every asset, even if unchanged')
+    parser.add_argument('--compress', action='store_true', help='DXT-compress baked textures')
+    args = parser.parse_args(argv)
+
+    baked = bake(force=args.force, compress=args.compress)
+    print(f"{len(baked)} asset(s) baked, {len(BAKE_MODELS) + len(BAKE_TEXTURES) - len(baked)} up to date")
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,20 @@
 from ursina import *
+import sys
+import os
+
+# Add the src directory to the system path to allow imports from the src package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.spatial_hash import collision_grid
+from src.enums.collision_layer import CollisionLayer
+from src.enums.overflow_policy import OverflowPolicy
+from src.projectile_pool import ProjectilePool
+from src.projectile_system import ProjectileSystem
 
 class Bullet(Entity):
     """
-    The Bullet class represents a projectile in the game. It handles the bullet's movement, 
-    its speed, and its eventual destruction when it gets too far from the camera.
+    The Bullet class represents a projectile in the game. Its movement and its eventual
+    despawn when it gets too far from the camera are driven by the ProjectileSystem.
     """
 
     def __init__(self, position=Vec3(0, 0, 0), direction=Vec3(0, 0, 1), speed=60, rotation=Vec3(0, 0, 90), **kwargs):
@@ -17,29 +28,79 @@ class Bullet(Entity):
             rotation (Vec3): The rotation of the bullet. Defaults to (0, 0, 90).
             **kwargs: Additional arguments passed to the Entity constructor.
         """
+        # When projectiles are drawn as one batched mesh, the entity is only a handle: no model,
+        # and no collider, since hits are swept by the ProjectileSystem
+        batched = ProjectileSystem.instance().batched
         super().__init__(
-            model='sphere',  # Or your bullet model
+            model=None if batched else 'sphere',  # Or your bullet model
             color=color.red,
             scale=0.1,
             position=position,
-            collider='box',  # Or 'sphere' depending on your bullet shape
+            collider=None if batched else 'box',  # Or 'sphere' depending on your bullet shape
             **kwargs
         )
 
-        self.direction = direction.normalized()  # Normalize the direction vector
-        self.speed = speed  # Set the speed of the bullet
         self.emission_color = color.red  # Set the emission color of the bullet
         self.damage = 10
         self.playerBullet = True
+        self.layer = CollisionLayer.PLAYER_BULLET
+        self.pool = None  # Set by the ProjectilePool that owns this bullet, if any
+        self.slot = None  # Index in the ProjectileSystem buffers while in flight
+        self.max_range = 200  # Distance from the camera at which the bullet despawns
+        self.lifetime = 5.0  # Seconds before the bullet despawns regardless of range
+
+        self.reset(position=position, direction=direction, speed=speed)
 
-    def update(self) -> None:
+    def reset(self, position=Vec3(0, 0, 0), direction=Vec3(0, 0, 1), speed=60) -> None:
         """
-        Called every frame to update the bullet's position. Destroys the bullet if it 
-        gets too far from the camera.
+        Puts the bullet back in flight from a new position. Used both on construction and
+        when the bullet is reused from a pool.
+
+        Args:
+            position (Vec3): The starting position of the bullet.
+            direction (Vec3): The direction in which the bullet will travel.
+            speed (float): The speed at which the bullet travels.
         """
-        # Move the bullet in its direction based on its speed
-        self.position += self.direction * self.speed * time.dt
+        self.position = position
+        self.direction = direction.normalized()  # Normalize the direction vector
+        self.speed = speed  # Set the speed of the bullet
+
+        # Register with the broadphase so enemies only test bullets in nearby cells
+        collision_grid.insert(self, self.position, self.layer)
+
+        # Hand movement and range culling over to the batched projectile system
+        ProjectileSystem.instance().spawn(
+            self, self.position, self.direction, self.speed, self.damage, self.layer,
+            ttl=self.lifetime, max_range=self.max_range, anchor=camera, size=self.scale_x, color=self.color
+        )
 
-        # Destroy the bullet if it moves too far from the camera
-        if distance(self.position, camera.position) > 200:
+    def despawn(self) -> None:
+        """
+        Removes the bullet from play, returning it to its pool if it has one.
+        """
+        if self.pool:
+            self.pool.release(self)
+        else:
             destroy(self)
+
+    def on_release(self) -> None:
+        """
+        Called by the ProjectilePool when the bullet is parked. Removes it from the broadphase
+        grid and the projectile system.
+        """
+        collision_grid.remove(self)
+        ProjectileSystem.instance().remove(self)
+
+    def on_destroy(self) -> None:
+        """
+        Called by Ursina when the bullet is destroyed. Removes it from the broadphase grid,
+        the projectile system and its pool.
+        """
+        collision_grid.remove(self)
+        ProjectileSystem.instance().remove(self)
+        if self.pool:
+            self.pool.discard(self)
+
+
+# Player bullets are recycled through this pool; prewarm() once the app exists
+bullet_pool = ProjectilePool(Bullet, capacity=64, overflow=OverflowPolicy.GROW)
@@ -0,0 +1,203 @@
+from ursina import *
+import sys
+import os
+import numpy as np
+from panda3d.core import GeomEnums, OmniBoundingVolume, Shader as PandaShader, Texture as PandaTexture
+
+# Add the src directory to the system path to allow imports from the src package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.asset_registry import AssetRegistry
+from src.asset_streamer import AssetStreamer
+from src.enums.asset_priority import AssetPriority
+from src.frame_profiler import profiled
+from src.simulation_loop import SimulationLoop
+
+DRONE_MODEL = '../assets/models/untitled.fbx'
+DRONE_TEXTURE = '../assets/images/drone_d.png'
+ROWS_PER_INSTANCE = 4  # Each drone's transform is a 4x4 matrix stored as four RGBA32F texels
+
+# Draws every drone from one copy of the geometry. Each instance reads its transform from a
+# buffer texture indexed by gl_InstanceID. The rows of a Panda3D matrix are the columns of the
+# same matrix in GLSL's column-vector convention, so the texels build the GLSL matrix directly.
+# Shading matches what the per-entity models draw: texture times color scale, unlit.
+VERTEX_SHADER = '''#version 140
+
+uniform mat4 p3d_ModelViewProjectionMatrix;
+uniform samplerBuffer instance_transforms;
+in vec4 p3d_Vertex;
+in vec2 p3d_MultiTexCoord0;
+out vec2 texcoords;
+
+void main() {
+    int row = gl_InstanceID * 4;
+    mat4 transform = mat4(
+        texelFetch(instance_transforms, row),
+        texelFetch(instance_transforms, row + 1),
+        texelFetch(instance_transforms, row + 2),
+        texelFetch(instance_transforms, row + 3)
+    );
+    gl_Position = p3d_ModelViewProjectionMatrix * (transform * p3d_Vertex);
+    texcoords = p3d_MultiTexCoord0;
+}
+'''
+
+FRAGMENT_SHADER = '''#version 140
+
+uniform sampler2D p3d_Texture0;
+uniform vec4 p3d_ColorScale;
+in vec2 texcoords;
+out vec4 fragColor;
+
+void main() {
+    fragColor = texture(p3d_Texture0, texcoords) * p3d_ColorScale;
+}
+'''
+
+def instancing_supported() -> bool:
+    """
+    Returns whether drones can be drawn instanced: always in headless runs, where nothing is
+    drawn, otherwise only if the renderer has GLSL, instancing and buffer textures (Panda3D's
+    software renderer, tinydisplay, has none of them; Mesa's llvmpipe has all three).
+    """
+    if application.window_type == 'none':
+        return True
+    gsg = base.win.gsg if base.win else None
+    return bool(gsg and gsg.supports_glsl and gsg.supports_geometry_instancing and gsg.supports_buffer_texture)
+
+class DroneRenderer(Entity):
+    """
+    Draws every enemy drone with one draw call. The drone model is loaded once into a single
+    node that is drawn once per instance; each enemy entity keeps its transform and collider
+    but no model of its own, so neither draw calls nor scene-graph nodes per drone grow with
+    the wave. Once per frame, after the SimulationLoop has placed the enemies between steps,
+    their transforms are copied into the buffer texture the instances are positioned from.
+
+    Where instancing is not supported, `instanced` is False and enemies keep their own model.
+    """
+    _instance = None  # Holds the shared DroneRenderer
+
+    @classmethod
+    def instance(cls) -> 'DroneRenderer':
+        """
+        Returns the shared DroneRenderer, creating it on first use. Must be called after the
+        Ursina app has been created.
+        """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, model_path: str = DRONE_MODEL, texture_path: str = DRONE_TEXTURE, capacity: int = 64,
+                 instanced: bool = None, **kwargs) -> None:
+        """
+        Loads the drone geometry and, when instancing, sets up the shared instanced node.
+
+        Args:
+            model_path (str): The drone model.
+            texture_path (str): The drone texture.
+            capacity (int): The initial number of instances. The buffer doubles when full. Defaults to 64.
+            instanced (bool): Whether to draw instanced. Defaults to whether the renderer supports it.
+            **kwargs: Additional arguments passed to the Entity constructor.
+        """
+        super().__init__(eternal=True, **kwargs)
+        SimulationLoop.instance().register(self)
+        self.model_path = model_path
+        self.texture_path = texture_path
+        self.instanced: bool = instancing_supported() if instanced is None else instanced
+        self.drawing: bool = application.window_type != 'none'  # Headless runs never upload transforms
+        self.entities: list = []  # instance -> drone entity
+        self.capacity: int = 0
+
+        # Collider box and bounding radius of the model at scale 1, shared by every drone
+        geometry = AssetRegistry().model(model_path)
+        low, high = geometry.getTightBounds()
+        self.bounds_center = Vec3(*((low + high) / 2))
+        self.bounds_size = Vec3(*(high - low))
+        self.radius = Vec3(*(max(abs(l), abs(h)) for l, h in zip(low, high))).length()
+
+        self.geometry = None
+        if self.instanced:
+            geometry.flattenStrong()  # One node, transforms baked into the vertices
+            geometry.reparentTo(self)
+            geometry.setShader(PandaShader.make(PandaShader.SL_GLSL, VERTEX_SHADER, FRAGMENT_SHADER))
+            geometry.node().setBounds(OmniBoundingVolume())  # Instances are placed by the shader
+            geometry.node().setFinal(True)
+            geometry.setInstanceCount(0)
+            self.geometry = geometry
+            AssetStreamer.instance().texture(texture_path, self.set_texture, AssetPriority.CRITICAL)
+            self.buffer = PandaTexture('drone_transforms')
+            self.allocate(capacity)
+        else:
+            geometry.removeNode()
+
+    def set_texture(self, texture) -> None:
+        """
+        Textures the shared drone geometry; called again when the drone texture streams in.
+        """
+        self.geometry.setTexture(texture._texture, 1)
+
+    def allocate(self, capacity: int) -> None:
+        """
+        Resizes the transform array and buffer texture to the given number of instances.
+
+        Args:
+            capacity (int): The new number of instances. Must be at least the live count.
+        """
+        transforms = np.zeros((capacity, ROWS_PER_INSTANCE, 4), dtype=np.float32)
+        if self.capacity:
+            transforms[:len(self.entities)] = self.transforms[:len(self.entities)]
+        self.transforms = transforms
+        self.capacity = capacity
+        self.buffer.setupBufferTexture(capacity * ROWS_PER_INSTANCE, PandaTexture.T_float, PandaTexture.F_rgba32,
+                                       GeomEnums.UH_dynamic)
+        self.geometry.setShaderInput('instance_transforms', self.buffer)
+
+    def add(self, enemy) -> None:
+        """
+        Starts drawing an enemy as an instance. Adding an enemy that is already drawn does nothing.
+
+        Args:
+            enemy (Enemy): An enemy without a model of its own.
+        """
+        if not self.instanced or getattr(enemy, 'instance_id', None) is not None:
+            return
+        if len(self.entities) == self.capacity:
+            self.allocate(self.capacity * 2)
+        enemy.instance_id = len(self.entities)
+        self.entities.append(enemy)
+        self.geometry.setInstanceCount(len(self.entities))
+
+    def remove(self, enemy) -> None:
+        """
+        Stops drawing an enemy. The last instance is moved into its place. Removing an enemy
+        that is not drawn does nothing.
+
+        Args:
+            enemy (Enemy): The enemy to remove.
+        """
+        i = getattr(enemy, 'instance_id', None)
+        if i is None:
+            return
+        moved = self.entities.pop()
+        if moved is not enemy:
+            self.entities[i] = moved
+            moved.instance_id = i
+        enemy.instance_id = None
+        self.geometry.setInstanceCount(len(self.entities))
+
+    @profiled('DroneRenderer.interpolate')
+    def interpolate(self, alpha: float) -> None:
+        """
+        Copies every drone's transform, as drawn this frame, into the instance buffer. Called by
+        the SimulationLoop once per frame after tracked entities have been interpolated.
+
+        Args:
+            alpha (float): How far between the last two simulation steps is drawn; the entities
+                are already placed, so it is not used here.
+        """
+        if not self.instanced or not self.drawing or not self.entities:
+            return
+        transforms = self.transforms
+        for i, enemy in enumerate(self.entities):
+            transforms[i] = enemy.getMat()  # Relative to the scene, like the instanced node
+        self.buffer.setRamImage(transforms.tobytes())
@@ -1,46 +1,81 @@
 from ursina import *
 import sys
 import os
-from math import atan2, degrees
 
 # Add the src directory to the system path to allow imports from the src package
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.state import StateMachine
-from src.enums.game_state import GameState
+from src.enums.collision_layer import CollisionLayer
+from src.spatial_hash import collision_grid
+from src.enums.overflow_policy import OverflowPolicy
+from src.projectile_pool import ProjectilePool
+from src.projectile_system import ProjectileSystem
+from src.enemy_swarm import EnemySwarm
+from src.simulation_loop import SimulationLoop
+from src.asset_registry import AssetRegistry
+from src.asset_streamer import AssetStreamer
+from src.enums.asset_priority import AssetPriority
+from src.frame_profiler import profiled
+from src.drone_renderer import DroneRenderer
+from src.event_log import event_log
+from src.rng import rng
+
+def roll_stats() -> dict:
+    """
+    Rolls the random stats that make each enemy different, from the run's 'enemy' stream.
+
+    Returns:
+        dict: size (scale before the model's unit scale), speed, hover_height and friction.
+    """
+    stream = rng.stream('enemy')
+    return {
+        'size': stream.randint(3, 12),
+        'speed': stream.randint(4, 12),  # Movement speed towards the player
+        'hover_height': stream.randint(2, 5),  # The height at which the enemy hovers
+        'friction': stream.randint(1, 3) / 10,  # Low friction for hovering effect
+    }
 
 class Enemy(Entity):
     """
     The Enemy class represents an enemy entity that follows the player, faces them along the Y-axis,
     hovers towards them with low friction, and shoots bullets that can damage the player.
-    It also handles taking damage from bullets and being destroyed when health reaches zero.
+    Steering is batched across all enemies by the EnemySwarm, which ticks each enemy as often as its
+    distance to the player calls for. The enemy itself handles shooting, taking damage from bullets
+    and being destroyed when health reaches zero.
     """
 
-    def __init__(self, player, on_death=None, **kwargs):
+    def __init__(self, player, on_death=None, stats: dict = None, **kwargs):
         """
         Initializes the Enemy entity with a model, texture, health, and behavior to follow and attack the player.
 
         Args:
             player (Entity): The player instance to follow and attack.
-            game_manager (GameManager): The game manager instance to notify when the enemy dies.
+            on_death (callable): Called with the enemy once its death animation has finished.
+            stats (dict): Stats as roll_stats() returns them, e.g. from a snapshot. Defaults to new random ones.
             **kwargs: Additional arguments passed to the Entity constructor.
         """
+        # Drones are drawn instanced from one shared model where supported; otherwise each has its own
+        drones = DroneRenderer.instance()
+        stats = stats or roll_stats()
         super().__init__(
-            model=load_model('../assets/models/untitled.fbx'),  # Replace with your enemy model path
-            texture=load_texture('../assets/images/drone_d.png'),  # Replace with your enemy texture path
-            collider='box',
-            scale=random.randint(3,12)/1000,
+            model=None if drones.instanced else AssetRegistry().model(drones.model_path),
+            scale=stats['size'] * AssetRegistry().unit_scale(drones.model_path),
             **kwargs
         )
+        if not drones.instanced:
+            AssetStreamer.instance().texture(drones.texture_path, self.texture_setter, AssetPriority.CRITICAL)
+        self.collider = BoxCollider(self, center=drones.bounds_center, size=drones.bounds_size)
         self.player = player
         self.state_machine = StateMachine()
-        self.speed = random.randint(4, 12)  # Movement speed towards the player
-        self.hover_height = random.randint(2,5)  # The height at which the enemy hovers
-        self.friction = random.randint(1,3)/10  # Low friction for hovering effect
+        self.size = stats['size']
+        self.speed = stats['speed']
+        self.hover_height = stats['hover_height']
+        self.friction = stats['friction']
         self.velocity = Vec3(0, 0, 0)
         self.shoot_distance = 15.0  # Distance at which the enemy starts shooting
         self.shoot_cooldown = 1  # Time between shots in seconds
-        self.last_shot_time = 0.0
+        self.last_shot_time = -self.shoot_cooldown  # Simulation time of the last shot
         self.on_death = on_death
 
         # Health properties
@@ -50,14 +85,28 @@ class Enemy(Entity):
         # Death animation flag
         self.is_dying = False
 
-    def update(self):
-        """
-        Updates the enemy's behavior every frame: follow the player, face the player along Y-axis,
-        check for collisions with bullets, and shoot at the player if in range.
+        # Broadphase registration and a bounding sphere for swept bullet tests
+        self.layer = CollisionLayer.ENEMY
+        self.collision_radius = drones.radius * max(self.scale)
+        collision_grid.insert(self, self.position, self.layer)
+
+        # Movement is integrated for the whole wave at once, in fixed steps; draw the enemy between them
+        self.slot = None
+        self.instance_id = None
+        drones.add(self)
+        EnemySwarm.instance().add(self)
+        SimulationLoop.instance().track(self)
+
+    @profiled('Enemy.tick')
+    def tick(self, dt: float):
         """
-        if self.state_machine.game_state != GameState.PLAYING:
-            return
+        Called by the EnemySwarm in the steps the AIScheduler picks for this enemy: shoot at the
+        player if in range. Following and facing the player is done by the EnemySwarm, and bullet
+        hits are checked by it whenever a bullet passes near.
 
+        Args:
+            dt (float): Seconds since the enemy last ticked.
+        """
         # If the enemy is dying, skip the rest of the update
         if self.is_dying:
             return
@@ -67,37 +116,14 @@ class Enemy(Entity):
             destroy(self)
             return
 
-        # Calculate the direction towards the player, ignoring Y-axis
-        direction = self.player.position - self.position
-        direction.y = 0  # Ignore vertical difference
-        distance_to_player = direction.length()
-        if distance_to_player > 0:
-            direction = direction.normalized()
-        else:
-            direction = Vec3(0, 0, 0)
-
-        # Calculate the yaw angle to face the player
-        angle = degrees(atan2(direction.x, direction.z))
-        self.rotation_y = angle
-
-        # Move towards the player with hovering effect
-        self.velocity += direction * self.speed * time.dt
-        self.velocity -= self.velocity * self.friction * time.dt  # Apply friction
-        self.position += self.velocity * time.dt
-
-        # Maintain hovering height
-        self.y = self.hover_height
-
         # Shooting logic
+        distance_to_player = EnemySwarm.instance().distance_to_player(self)
         if distance_to_player <= self.shoot_distance:
-            current_time = time.time()
+            current_time = SimulationLoop.instance().time
             if current_time - self.last_shot_time >= self.shoot_cooldown:
                 self.shoot_at_player()
                 self.last_shot_time = current_time
 
-        # Collision detection with bullets
-        self.check_bullet_collision()
-
     def shoot_at_player(self):
         """
         Shoots a bullet towards the player that can damage them.
@@ -107,9 +133,9 @@ class Enemy(Entity):
 
         # Shoot the bullet towards the player
         bullet_direction = (self.player.position - self.position).normalized()
-        EnemyBullet(position=bullet_start_position, direction=bullet_direction, player=self.player)
+        enemy_bullet_pool.acquire(position=bullet_start_position, direction=bullet_direction, player=self.player)
 
-        print("Enemy shot fired!")
+        event_log.debug('enemy_shot')
 
     def take_damage(self, amount):
         """
@@ -119,7 +145,7 @@ class Enemy(Entity):
             amount (int): The amount of damage to apply to the enemy.
         """
         self.health -= amount
-        print(f"Enemy health: {self.health}/{self.max_health}")
+        event_log.debug('enemy_damaged', amount=amount, health=self.health)
         if self.health <= 0:
             self.die()
 
@@ -127,7 +153,7 @@ class Enemy(Entity):
         if self.is_dying:
             return  # Already dying, do not initiate again
 
-        print("Enemy died!")
+        event_log.info('enemy_died')
         self.is_dying = True
 
 
@@ -135,6 +161,9 @@ class Enemy(Entity):
 
         # Disable enemy's collider and movement
         self.collider = None
+        collision_grid.remove(self)
+        EnemySwarm.instance().remove(self)
+        SimulationLoop.instance().untrack(self)
         self.velocity = Vec3(0, 0, 0)
 
         # Remove reference to the player
@@ -152,36 +181,44 @@ class Enemy(Entity):
         Destroys the enemy entity and calls the on_death callback.
         """
         if self.on_death:
-            print("fired omn death")
             self.on_death(self)
         destroy(self)
 
+    def on_destroy(self):
+        """
+        Called by Ursina when the enemy is destroyed. Removes it from the broadphase grid, the swarm,
+        the interpolated entities and the drawn instances.
+        """
+        collision_grid.remove(self)
+        EnemySwarm.instance().remove(self)
+        SimulationLoop.instance().untrack(self)
+        DroneRenderer.instance().remove(self)
+
+    @profiled('Enemy.check_bullet_collision')
     def check_bullet_collision(self):
         """
         Checks for collision with player bullets and applies damage if hit.
         """
-        # Iterate over all entities in the scene
-        for entity in scene.entities:
-            # Skip self and non-Entity instances
-            if entity == self or not isinstance(entity, Entity):
-                continue
-            # Skip if the entity doesn't have a 'damage' attribute (assuming bullets have 'damage')
-            if not hasattr(entity, 'damage'):
-                continue
-            # Skip if the entity is an EnemyBullet
-            if isinstance(entity, EnemyBullet):
-                continue
-            # Check for collision with the bullet
-            if self.intersects(entity).hit:
-                # Apply damage and destroy the bullet
-                self.take_damage(entity.damage)
-                destroy(entity)
-                print("Enemy hit by player bullet!")
-                break  # Break after handling one bullet collision per frame
+        # Only player bullets in the cells around the drone are candidates; widen the query by
+        # the furthest a bullet moved this frame so bullets that passed through are included
+        projectiles = ProjectileSystem.instance()
+        query_radius = self.collision_radius + projectiles.max_step
+        candidates = collision_grid.query(self.position, query_radius, CollisionLayer.PLAYER_BULLET)
+        if not candidates:
+            return
+
+        # Sweep each candidate's movement this frame against the bounding sphere
+        entity = projectiles.first_hit(candidates, self.position, self.collision_radius)
+        if entity:
+            # Apply damage and return the bullet to its pool; one bullet per frame
+            self.take_damage(entity.damage)
+            entity.despawn()
+            event_log.debug('enemy_hit')
 
 class EnemyBullet(Entity):
     """
     The EnemyBullet class represents a bullet fired by the enemy that can damage the player.
+    Its movement, range culling and hit test against the player are driven by the ProjectileSystem.
     """
 
     def __init__(self, position=Vec3(0, 0, 0), direction=Vec3(0, 0, 1), speed=20.0, player=None, **kwargs):
@@ -195,40 +232,81 @@ class EnemyBullet(Entity):
             player (Entity): The player instance to target.
             **kwargs: Additional arguments passed to the Entity constructor.
         """
+        # Drawn by the ProjectileSystem's batched mesh when it has one; see Bullet
+        batched = ProjectileSystem.instance().batched
         super().__init__(
-            model='sphere',
+            model=None if batched else 'sphere',
             color=color.red,
             scale=0.2,
             position=position,
-            collider='sphere',
+            collider=None if batched else 'sphere',
             **kwargs
         )
+        self.damage = 10  # Damage dealt to the player
+        self.layer = CollisionLayer.ENEMY_BULLET
+        self.pool = None  # Set by the ProjectilePool that owns this bullet, if any
+        self.slot = None  # Index in the ProjectileSystem buffers while in flight
+        self.max_range = 100  # Distance from the player at which the bullet despawns
+        self.lifetime = 5.0  # Seconds before the bullet despawns regardless of range
+
+        self.reset(position=position, direction=direction, speed=speed, player=player)
+
+    def reset(self, position=Vec3(0, 0, 0), direction=Vec3(0, 0, 1), speed=20.0, player=None):
+        """
+        Puts the bullet back in flight from a new position. Used both on construction and
+        when the bullet is reused from a pool.
+
+        Args:
+            position (Vec3): The starting position of the bullet.
+            direction (Vec3): The direction in which the bullet will travel.
+            speed (float): The speed at which the bullet travels.
+            player (Entity): The player instance to target.
+        """
+        self.position = position
         self.direction = direction.normalized()
         self.speed = speed
-        self.damage = 10  # Damage dealt to the player
         self.player = player  # Reference to the player
 
-    def update(self):
+        if self.player and self.player.enabled:
+            # The player is both the range anchor and the hit target
+            collision_grid.insert(self, self.position, self.layer)
+            ProjectileSystem.instance().spawn(
+                self, self.position, self.direction, self.speed, self.damage, self.layer,
+                ttl=self.lifetime, max_range=self.max_range, anchor=self.player, size=self.scale_x, color=self.color
+            )
+        elif self.pool:
+            # Player is dead or doesn't exist; nothing to fly towards. A bullet still being built
+            # by its pool has no pool yet and stays out of play until the pool parks it
+            self.despawn()
+
+    def despawn(self):
         """
-        Updates the bullet's position every frame and checks for collision with the player.
+        Removes the bullet from play, returning it to its pool if it has one.
         """
-        
-        if not self.player or not self.player.enabled:
-            # Player is dead or doesn't exist; skip enemy actions
+        if self.pool:
+            self.pool.release(self)
+        else:
             destroy(self)
-            return
-        
-        self.position += self.direction * self.speed * time.dt
 
-        # Destroy the bullet if it moves too far from the player
-        if distance(self.position, self.player.position) > 100:
-            destroy(self)
-            return
+    def on_release(self):
+        """
+        Called by the ProjectilePool when the bullet is parked. Drops its player reference
+        and removes it from the broadphase grid and the projectile system.
+        """
+        self.player = None
+        collision_grid.remove(self)
+        ProjectileSystem.instance().remove(self)
 
-        # Check for collision with the player
-        if self.intersects(self.player).hit:
-            # Damage the player
-            print(self.player.health)
-            self.player.take_damage(self.damage)
-            destroy(self)
-            print("Player hit by enemy bullet!")
+    def on_destroy(self):
+        """
+        Called by Ursina when the bullet is destroyed. Removes it from the broadphase grid,
+        the projectile system and its pool.
+        """
+        collision_grid.remove(self)
+        ProjectileSystem.instance().remove(self)
+        if self.pool:
+            self.pool.discard(self)
+
+
+# Enemy bullets are recycled through this pool; prewarm() once the app exists
+enemy_bullet_pool = ProjectilePool(EnemyBullet, capacity=128, overflow=OverflowPolicy.GROW)
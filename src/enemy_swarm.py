@@ -0,0 +1,258 @@
+from ursina import *
+import sys
+import os
+import numpy as np
+
+# Add the src directory to the system path to allow imports from the src package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.state import StateMachine
+from src.enums.game_state import GameState
+from src.enums.state_event import StateEvent
+from src.enums.collision_layer import CollisionLayer
+from src.spatial_hash import collision_grid
+from src.projectile_system import ProjectileSystem
+from src.ai_scheduler import AIScheduler
+from src.flow_field import FlowField, flow_field
+from src.simulation_loop import SimulationLoop
+from src.frame_profiler import profiled
+
+class EnemySwarm(Entity):
+    """
+    Steers every living enemy in one batched step per simulation step. Position, velocity, speed, friction
+    and hover height are kept in NumPy arrays indexed by slot; the results are written back to
+    the enemy entities, which only keep their per-enemy shooting and hit logic.
+
+    Only the enemies the AIScheduler picks are steered, written back and ticked in a step, with
+    the time since they last ticked, so the per-step cost is bounded by its budget rather than
+    the size of the wave. Enemies are hit-tested in the steps a player bullet passes near them,
+    whether or not they ticked.
+
+    Enemies head straight for the player unless a wall is in the way, in which case they follow
+    the shared FlowField around it: one lookup per ticked enemy, however many there are.
+    """
+    _instance = None  # Holds the shared EnemySwarm
+
+    @classmethod
+    def instance(cls) -> 'EnemySwarm':
+        """
+        Returns the shared EnemySwarm, creating it on first use. Must be called after the
+        Ursina app has been created.
+        """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, capacity: int = 64, scheduler: AIScheduler = None, flow: FlowField = None, **kwargs) -> None:
+        """
+        Initializes empty swarm arrays.
+
+        Args:
+            capacity (int): The initial number of slots. The arrays double when full. Defaults to 64.
+            scheduler (AIScheduler): Decides which enemies tick each step. Defaults to the standard tiers and budget.
+            flow (FlowField): The way around the level's walls. Defaults to the shared flow field.
+            **kwargs: Additional arguments passed to the Entity constructor.
+        """
+        super().__init__(eternal=True, **kwargs)
+        SimulationLoop.instance().register(self)
+        self.state_machine = StateMachine()
+        self.playing: bool = self.state_machine.game_state == GameState.PLAYING
+        self.state_machine.subscribe(StateEvent.GAME_STATE, self.on_game_state)
+        self.count: int = 0
+        self.capacity: int = 0
+        self.entities: list = []  # slot -> enemy entity
+        self.scheduler = scheduler or AIScheduler()
+        self.flow = flow if flow is not None else flow_field
+        self.added: int = 0  # Enemies added so far, for staggering their phases
+        self.max_radius: float = 0.0  # Largest collision radius of an enemy added
+        self.allocate(capacity)
+
+    def allocate(self, capacity: int) -> None:
+        """
+        Resizes the arrays to the given number of slots, keeping living enemies.
+
+        Args:
+            capacity (int): The new number of slots. Must be at least the living count.
+        """
+        def resized(old, shape, dtype=np.float32):
+            new = np.zeros(shape, dtype=dtype)
+            if old is not None:
+                new[:self.count] = old[:self.count]
+            return new
+
+        self.positions = resized(getattr(self, 'positions', None), (capacity, 3))
+        self.velocities = resized(getattr(self, 'velocities', None), (capacity, 3))
+        self.speeds = resized(getattr(self, 'speeds', None), capacity)
+        self.frictions = resized(getattr(self, 'frictions', None), capacity)
+        self.hover_heights = resized(getattr(self, 'hover_heights', None), capacity)
+        self.distances = resized(getattr(self, 'distances', None), capacity)  # Horizontal distance to the player
+        self.waits = resized(getattr(self, 'waits', None), capacity, np.int32)  # Steps since the enemy last ticked
+        self.phases = resized(getattr(self, 'phases', None), capacity, np.int32)
+        self.capacity = capacity
+
+    def add(self, enemy) -> None:
+        """
+        Starts steering an enemy, taking its current position, velocity and movement stats.
+
+        Args:
+            enemy (Enemy): The enemy to add.
+        """
+        if getattr(enemy, 'slot', None) is not None:
+            return
+        if self.count == self.capacity:
+            self.allocate(self.capacity * 2)
+
+        i = self.count
+        self.positions[i] = tuple(enemy.position)
+        self.velocities[i] = tuple(enemy.velocity)
+        self.speeds[i] = enemy.speed
+        self.frictions[i] = enemy.friction
+        self.hover_heights[i] = enemy.hover_height
+        self.distances[i] = np.inf
+        self.waits[i] = 0
+        self.phases[i] = self.added
+        self.added += 1
+        self.max_radius = max(self.max_radius, getattr(enemy, 'collision_radius', 0.0))
+
+        self.entities.append(enemy)
+        enemy.slot = i
+        self.count += 1
+
+    def remove(self, enemy) -> None:
+        """
+        Stops steering an enemy, copying its final velocity back to the entity. The last living
+        slot is moved into its place. Removing an enemy that is not in the swarm does nothing.
+
+        Args:
+            enemy (Enemy): The enemy to remove.
+        """
+        i = getattr(enemy, 'slot', None)
+        if i is None:
+            return
+
+        enemy.velocity = Vec3(*self.velocities[i].tolist())
+
+        last = self.count - 1
+        if i != last:
+            for array in (self.positions, self.velocities, self.speeds, self.frictions,
+                          self.hover_heights, self.distances, self.waits, self.phases):
+                array[i] = array[last]
+            moved = self.entities[last]
+            self.entities[i] = moved
+            moved.slot = i
+
+        self.entities.pop()
+        self.count -= 1
+        enemy.slot = None
+
+    def distance_to_player(self, enemy) -> float:
+        """
+        Returns the enemy's horizontal distance to the player as of the last step.
+
+        Args:
+            enemy (Enemy): An enemy in the swarm.
+        """
+        return float(self.distances[enemy.slot])
+
+    def velocity_of(self, enemy) -> Vec3:
+        """
+        Returns an enemy's velocity as of the last step. The enemy's own velocity is only brought
+        up to date when it leaves the swarm.
+
+        Args:
+            enemy (Enemy): An enemy in the swarm.
+        """
+        return Vec3(*self.velocities[enemy.slot].tolist())
+
+    def set_velocity(self, enemy, velocity) -> None:
+        """
+        Sets an enemy's velocity, e.g. when it is restored from a snapshot.
+
+        Args:
+            enemy (Enemy): An enemy in the swarm.
+            velocity (Vec3): The new velocity.
+        """
+        self.velocities[enemy.slot] = tuple(velocity)
+
+    def restart(self) -> None:
+        """
+        Starts the AI schedule and the phase staggering over and drops the flow field, so a new
+        run's enemies are stepped the same way whatever ran before it.
+        """
+        self.scheduler.step = 0
+        self.added = 0
+        self.flow.clear()
+
+    def on_game_state(self, game_state: GameState) -> None:
+        self.playing = game_state == GameState.PLAYING
+
+    @profiled('EnemySwarm.fixed_update')
+    def fixed_update(self, dt: float) -> None:
+        """
+        Steers, turns and moves the enemies due to tick towards the player in one batched step,
+        ticks their own AI, then hit-tests the enemies player bullets passed near.
+
+        Args:
+            dt (float): The length of the step in seconds.
+        """
+        n = self.count
+        if n == 0 or not self.playing:
+            return
+
+        player = self.entities[0].player
+        if not player or not player.enabled:
+            for enemy in self.entities[:]:
+                enemy.tick(dt)  # Each enemy cleans itself up when the player is gone
+            return
+
+        # Direction towards the player, ignoring the vertical difference; every enemy's distance
+        # is kept current, as it decides the tiers
+        directions = np.asarray(tuple(player.position), dtype=np.float32) - self.positions[:n]
+        directions[:, 1] = 0
+        distances = np.sqrt(np.einsum('ij,ij->i', directions, directions))
+        self.distances[:n] = distances
+
+        waits = self.waits[:n]
+        waits += 1
+        ticked = self.scheduler.select(distances, self.phases[:n], waits)
+        # Each enemy covers the time since it last ticked, capped so a long wait cannot overshoot
+        steps = (np.minimum(waits[ticked], self.scheduler.max_wait) * dt).astype(np.float32)
+        waits[ticked] = 0
+
+        directions = directions[ticked]
+        lengths = distances[ticked][:, None]
+        np.divide(directions, lengths, out=directions, where=lengths > 0)
+
+        # Around the walls between an enemy and the player, the flow field gives the way
+        self.flow.follow(player.position)
+        flows, steered = self.flow.sample(self.positions[ticked])
+        directions[steered, 0] = flows[steered, 0]
+        directions[steered, 2] = flows[steered, 1]
+
+        # Yaw to face the way the enemy is heading
+        yaws = np.degrees(np.arctan2(directions[:, 0], directions[:, 2]))
+
+        # Move towards the player with hovering effect
+        velocities = self.velocities[ticked]
+        velocities += directions * (self.speeds[ticked] * steps)[:, None]
+        velocities -= velocities * (self.frictions[ticked] * steps)[:, None]  # Apply friction
+        positions = self.positions[ticked] + velocities * steps[:, None]
+
+        # Maintain hovering height
+        positions[:, 1] = self.hover_heights[ticked]
+        self.velocities[ticked] = velocities
+        self.positions[ticked] = positions
+
+        # Write the results back, re-bucketing enemies that moved into a new grid cell
+        heading_sign = Entity.rotation_directions[0]
+        entities = [self.entities[i] for i in ticked.tolist()]
+        for enemy, position, yaw in zip(entities, positions.tolist(), yaws.tolist()):
+            enemy.setPos(*position)
+            enemy.setH(yaw * heading_sign)
+            collision_grid.update(enemy, position)
+        for enemy, step in zip(entities, steps.tolist()):
+            enemy.tick(step)
+
+        for enemy in ProjectileSystem.instance().near(CollisionLayer.PLAYER_BULLET, CollisionLayer.ENEMY, self.max_radius):
+            if not enemy.is_dying:
+                enemy.check_bullet_collision()
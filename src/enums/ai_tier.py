@@ -0,0 +1,6 @@
+from enum import IntEnum
+
+class AITier(IntEnum):
+    NEAR = 0
+    MID = 1
+    FAR = 2
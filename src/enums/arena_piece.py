@@ -0,0 +1,6 @@
+from enum import IntEnum
+
+class ArenaPiece(IntEnum):
+    COVER = 0
+    WALL = 1
+    PLATFORM = 2
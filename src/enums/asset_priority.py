@@ -0,0 +1,6 @@
+from enum import IntEnum
+
+class AssetPriority(IntEnum):
+    CRITICAL = 0  # Needed for the frame being drawn: the HUD, the gun, the ground and the drones
+    NORMAL = 1
+    BACKGROUND = 2  # Large and cosmetic, e.g. the skybox
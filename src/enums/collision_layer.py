@@ -0,0 +1,8 @@
+from enum import IntFlag
+
+class CollisionLayer(IntFlag):
+    NONE = 0
+    PLAYER = 1
+    ENEMY = 2
+    PLAYER_BULLET = 4
+    ENEMY_BULLET = 8
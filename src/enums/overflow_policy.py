@@ -0,0 +1,6 @@
+from enum import Enum
+
+class OverflowPolicy(Enum):
+    GROW = 'grow'
+    DROP = 'drop'
+    RECYCLE_OLDEST = 'recycle_oldest'
@@ -0,0 +1,6 @@
+from enum import Enum
+
+class SpawnPattern(Enum):
+    LINE = 'line'
+    RING = 'ring'
+    SCATTER = 'scatter'
@@ -0,0 +1,6 @@
+from enum import Enum
+
+class StateEvent(Enum):
+    HEALTH = 'health'
+    KILLS = 'kills'
+    GAME_STATE = 'game_state'
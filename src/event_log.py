@@ -0,0 +1,200 @@
+import sys
+import os
+import json
+import queue
+import threading
+import atexit
+import time as wall_time
+
+# Add the src directory to the system path to allow imports from the src package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+LOG_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'logs', 'game.log'))
+MAX_BYTES = 1024 * 1024  # Size at which the log rotates
+BACKUP_COUNT = 3  # Rotated files kept: game.log.1 (newest) to game.log.3
+RATE_LIMIT = 20  # Records per event name per second; the rest are counted and dropped
+
+DEBUG, INFO, WARNING, ERROR = 10, 20, 30, 40
+LEVELS = {'debug': DEBUG, 'info': INFO, 'warning': WARNING, 'error': ERROR}
+LEVEL_NAMES = {value: name for name, value in LEVELS.items()}
+
+def _discard(event: str, **fields) -> None:
+    """
+    Stands in for the logging methods of disabled levels.
+    """
+
+class EventLog:
+    """
+    Levelled, structured game event log. Each record is an event name plus keyword fields,
+    written as one JSON object per line. The game thread only checks the level and the rate
+    limit and puts the raw record on a queue; a background thread formats the records and
+    writes them to a file that rotates at MAX_BYTES.
+
+    The methods of disabled levels are swapped for a function that does nothing, so a disabled
+    call does no formatting and takes no lock. Pass values as fields rather than formatting
+    them into the event name, so that cost is also skipped.
+    """
+    _instance = None  # Holds the shared EventLog
+
+    @classmethod
+    def instance(cls) -> 'EventLog':
+        """
+        Returns the shared EventLog, creating it on first use.
+        """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, path: str = LOG_PATH, level: int = INFO, max_bytes: int = MAX_BYTES,
+                 backup_count: int = BACKUP_COUNT, rate_limit: int = RATE_LIMIT) -> None:
+        """
+        Args:
+            path (str): The log file. Its directory is created on the first record.
+            level (int): The lowest level written. Defaults to INFO.
+            max_bytes (int): The size at which the file rotates.
+            backup_count (int): The number of rotated files to keep.
+            rate_limit (int): Records per event name per second before records are dropped.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.rate_limit = rate_limit
+        self.queue = queue.SimpleQueue()
+        self.writer = None  # Started by the first record
+        self.second = None  # The second the rate limit windows are counting
+        self.window = {}  # event -> [records this second, records dropped]
+        self.set_level(level)
+        atexit.register(self.close)
+
+    def set_level(self, level) -> None:
+        """
+        Sets the lowest level written.
+
+        Args:
+            level (int or str): A level, e.g. DEBUG or 'debug'.
+        """
+        self.level = LEVELS[level.lower()] if isinstance(level, str) else level
+        self.debug = self._debug if self.level <= DEBUG else _discard
+        self.info = self._info if self.level <= INFO else _discard
+        self.warning = self._warning if self.level <= WARNING else _discard
+        self.error = self._error if self.level <= ERROR else _discard
+
+    def _debug(self, event: str, **fields) -> None:
+        self.log(DEBUG, event, fields)
+
+    def _info(self, event: str, **fields) -> None:
+        self.log(INFO, event, fields)
+
+    def _warning(self, event: str, **fields) -> None:
+        self.log(WARNING, event, fields)
+
+    def _error(self, event: str, **fields) -> None:
+        self.log(ERROR, event, fields)
+
+    def log(self, level: int, event: str, fields: dict) -> None:
+        """
+        Queues a record unless its event has used up this second's rate limit. Once the second
+        is over, a 'rate_limited' record reports how many records of each event were dropped.
+
+        Args:
+            level (int): The record's level.
+            event (str): The event name, e.g. 'enemy_shot'.
+            fields (dict): The record's fields. Values that JSON cannot hold are written as str().
+        """
+        if level < self.level:
+            return
+        now = wall_time.time()
+        second = int(now)
+        if second != self.second:
+            self.flush_dropped(now)
+            self.second = second
+        window = self.window.get(event)
+        if window is None:
+            window = self.window[event] = [0, 0]
+        if window[0] >= self.rate_limit:
+            window[1] += 1
+            return
+        window[0] += 1
+
+        if self.writer is None:
+            self.start_writer()
+        self.queue.put((now, level, event, fields))
+
+    def flush_dropped(self, now: float) -> None:
+        """
+        Queues a 'rate_limited' record for each event that had records dropped in the current
+        second, and starts counting afresh.
+
+        Args:
+            now (float): The time to stamp the records with.
+        """
+        for event, (_, dropped) in self.window.items():
+            if dropped:
+                self.queue.put((now, WARNING, 'rate_limited', {'dropped_event': event, 'dropped': dropped}))
+        self.window.clear()
+
+    def start_writer(self) -> None:
+        self.writer = threading.Thread(target=self.drain, name='event-log', daemon=True)
+        self.writer.start()
+
+    def drain(self) -> None:
+        """
+        Writes queued records until close() is called. Runs on the writer thread.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        file = open(self.path, 'a', encoding='utf-8')
+        size = file.tell()
+        while True:
+            records = [self.queue.get()]
+            while True:  # Write whatever else has queued up in one go
+                try:
+                    records.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            closing = None in records
+            lines = ''.join(self.format(record) for record in records if record is not None)
+            if size and size + len(lines) > self.max_bytes:
+                file.close()
+                self.rotate()
+                file = open(self.path, 'a', encoding='utf-8')
+                size = 0
+            file.write(lines)
+            file.flush()
+            size += len(lines)  # Characters, not bytes; records are ASCII unless a field is not
+            if closing:
+                file.close()
+                return
+
+    @staticmethod
+    def format(record: tuple) -> str:
+        timestamp, level, event, fields = record
+        return json.dumps({'time': round(timestamp, 3), 'level': LEVEL_NAMES[level], 'event': event, **fields},
+                          default=str) + '\n'
+
+    def rotate(self) -> None:
+        """
+        Shifts game.log to game.log.1, game.log.1 to game.log.2 and so on, dropping the oldest.
+        """
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backup_count:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def close(self) -> None:
+        """
+        Reports records dropped in the current second, writes out every queued record and stops
+        the writer thread. Logging afterwards starts a new writer.
+        """
+        self.flush_dropped(wall_time.time())
+        if self.writer is None:
+            return
+        self.queue.put(None)
+        self.writer.join()
+        self.writer = None
+
+event_log = EventLog.instance()
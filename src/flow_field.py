@@ -0,0 +1,267 @@
+import sys
+import os
+from math import ceil, floor
+import numpy as np
+
+# Add the src directory to the system path to allow imports from the src package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.frame_profiler import profiled
+
+NAV_CELL = 4.0  # Edge length of a navigation cell in world units
+NAV_CLEARANCE = 2.0  # Boxes taller than this block a cell: the lowest height an enemy hovers at
+NAV_MARGIN = 0.5  # Space kept between a blocking box and the cells left open
+FLOW_BUDGET = 16  # Rings of the flow field swept per simulation step
+STRAIGHT_COST, DIAGONAL_COST = 2, 3  # Integer step costs, close to 1 : sqrt(2)
+UNREACHED = np.iinfo(np.int32).max
+
+# The eight moves between neighbouring cells, as (x step, z step, cost)
+MOVES = tuple((dx, dz, DIAGONAL_COST if dx and dz else STRAIGHT_COST)
+              for dx in (-1, 0, 1) for dz in (-1, 0, 1) if dx or dz)
+
+class NavGrid:
+    """
+    The cells of the level enemies can fly through, as a boolean grid over the ground. A cell is
+    closed when a box too tall to hover over stands on it. The grid is padded with a ring of
+    closed cells, so every open cell has eight neighbours in the flat arrays the FlowField uses.
+    """
+
+    def __init__(self, low_x: float, low_z: float, size: float, cell_size: float = NAV_CELL) -> None:
+        """
+        Args:
+            low_x (float): The grid's minimum x.
+            low_z (float): The grid's minimum z.
+            size (float): The grid's extent along x and z.
+            cell_size (float): The edge length of a cell. Defaults to 4.
+        """
+        self.low_x, self.low_z = low_x, low_z
+        self.cell_size = cell_size
+        self.cells = ceil(size / cell_size)  # Cells along each side, not counting the padding
+        self.open = np.zeros((self.cells + 2, self.cells + 2), dtype=bool)
+        self.open[1:-1, 1:-1] = True
+        self.width = self.cells + 2  # Row length of the flat arrays
+
+    def block_box(self, box, clearance: float = NAV_CLEARANCE, margin: float = NAV_MARGIN) -> None:
+        """
+        Closes the cells under a (min x, min y, min z, max x, max y, max z) box, unless it is low
+        enough to hover over.
+        """
+        if box[4] <= clearance:
+            return
+        size, limit = self.cell_size, self.cells
+        low_i = max(floor((box[0] - margin - self.low_x) / size), 0)
+        high_i = min(ceil((box[3] + margin - self.low_x) / size), limit)
+        low_j = max(floor((box[2] - margin - self.low_z) / size), 0)
+        high_j = min(ceil((box[5] + margin - self.low_z) / size), limit)
+        self.open[low_i + 1:high_i + 1, low_j + 1:high_j + 1] = False
+
+    def cell_of(self, x: float, z: float):
+        """
+        Returns the flat index of the cell containing a point on the ground, or None off the grid.
+        """
+        i, j = floor((x - self.low_x) / self.cell_size), floor((z - self.low_z) / self.cell_size)
+        if 0 <= i < self.cells and 0 <= j < self.cells:
+            return (i + 1) * self.width + j + 1
+        return None
+
+    def cells_of(self, positions: np.ndarray) -> tuple:
+        """
+        Returns the flat cell indices of (n, 3) positions and whether each is on the grid.
+        Positions off the grid get the index of a padding cell.
+        """
+        i = np.floor((positions[:, 0] - self.low_x) / self.cell_size).astype(np.int64)
+        j = np.floor((positions[:, 2] - self.low_z) / self.cell_size).astype(np.int64)
+        inside = (i >= 0) & (i < self.cells) & (j >= 0) & (j < self.cells)
+        return np.where(inside, (i + 1) * self.width + j + 1, 0), inside
+
+class FlowField:
+    """
+    One field of directions towards the player shared by every enemy, so the cost of pathfinding
+    does not depend on how many enemies follow it. The field holds, for each open cell of a
+    NavGrid, its path cost to the player's cell and the move towards the neighbour the path goes
+    through; an enemy looks up its own cell.
+
+    The field is swept outwards from the player's cell only when the player moves into another
+    cell, a few distance rings per step (a bucketed Dijkstra with integer step costs). Until a
+    sweep has finished, cells it has already settled are read from it and the rest from the last
+    finished field. Where the path cost equals the cost over open ground, nothing stands in the
+    way and enemies head straight for the player instead; the field only turns them around
+    walls.
+    """
+
+    def __init__(self, grid: NavGrid = None, budget: int = FLOW_BUDGET) -> None:
+        """
+        Args:
+            grid (NavGrid): The cells to path through, or None for a field that never steers.
+            budget (int): The rings swept per step. Defaults to 16.
+        """
+        self.budget = budget
+        self.reset(grid)
+
+    def reset(self, grid: NavGrid = None) -> None:
+        """
+        Switches to another grid, dropping both fields.
+
+        Args:
+            grid (NavGrid): The cells to path through, or None for a field that never steers.
+        """
+        self.grid = grid
+        self.target = None  # Cell the finished field leads to
+        self.sweep_target = None  # Cell the sweep under way leads to
+        self.sweeps: int = 0  # Sweeps started, for tests and the benchmarks
+        if grid is None:
+            return
+        self.open = grid.open.ravel()
+        self.costs = np.full(self.open.size, UNREACHED, dtype=np.int32)
+        self.moves = np.zeros(self.open.size, dtype=np.int8)
+        self.sweep_costs = np.full(self.open.size, UNREACHED, dtype=np.int32)
+        self.sweep_moves = np.zeros(self.open.size, dtype=np.int8)
+        self.buckets: dict = {}  # cost -> [flat cell arrays] still to settle
+        self.settled: int = -1  # Cells of the sweep costing this much or less are settled
+        self.stamps = np.zeros(self.open.size, dtype=np.int64)  # Scratch for dropping repeated cells
+        # Offsets of the straight moves, then of the diagonal ones, and which moves each cell
+        # may make: into open cells, without cutting across the corner of a closed one
+        width = grid.width
+        offsets = np.array([dx * width + dz for dx, dz, _ in MOVES], dtype=np.int64)
+        cells = np.arange(self.open.size)
+        allowed = np.zeros((self.open.size, len(MOVES)), dtype=bool)
+        inner = cells[self.open]
+        for move, (dx, dz, _) in enumerate(MOVES):
+            ok = self.open[inner + offsets[move]]
+            if dx and dz:
+                ok &= self.open[inner + dx * width] & self.open[inner + dz]
+            allowed[inner, move] = ok
+        self.passes = []  # (step cost, move indices, flat offsets, allowed moves per cell)
+        for step in (STRAIGHT_COST, DIAGONAL_COST):
+            moves = np.array([move for move, (_, _, cost) in enumerate(MOVES) if cost == step], dtype=np.int8)
+            self.passes.append((step, moves, offsets[moves], allowed[:, moves]))
+        # Unit (x, z) direction of each move back towards the cell it was reached from
+        self.directions = -np.array([(dx, dz) for dx, dz, _ in MOVES], dtype=np.float32)
+        self.directions /= np.linalg.norm(self.directions, axis=1)[:, None]
+
+    def clear(self) -> None:
+        """
+        Drops the finished field and any sweep under way, keeping the grid. Until the next sweep
+        has settled a cell, nothing there is steered.
+        """
+        self.target = self.sweep_target = None
+        if self.grid is not None:
+            self.buckets = {}
+            self.settled = -1
+
+    @property
+    def sweeping(self) -> bool:
+        return bool(self.buckets)
+
+    @profiled('FlowField.follow')
+    def follow(self, position) -> None:
+        """
+        Starts a sweep if the player has moved into another cell, then sweeps for one step's budget.
+        Called by the EnemySwarm each simulation step.
+
+        Args:
+            position (Vec3): The player's position.
+        """
+        if self.grid is None:
+            return
+        cell = self.grid.cell_of(position[0], position[2])
+        if cell is not None and cell != self.sweep_target and (self.sweeping or cell != self.target):
+            self.start(cell)
+        self.advance(self.budget)
+
+    def start(self, cell: int) -> None:
+        """
+        Starts sweeping a new field out from a cell, dropping any sweep under way.
+        """
+        self.sweep_target = cell
+        self.sweep_costs.fill(UNREACHED)
+        self.sweep_costs[cell] = 0
+        self.buckets = {0: [np.array([cell], dtype=np.int64)]}
+        self.settled = -1
+        self.sweeps += 1
+
+    def advance(self, budget: int = None) -> bool:
+        """
+        Settles the cells of up to `budget` more distance rings of the sweep under way. A finished
+        sweep becomes the field.
+
+        Args:
+            budget (int): The most rings to settle. Defaults to finishing the sweep.
+
+        Returns:
+            bool: Whether the sweep has finished.
+        """
+        costs, moves, buckets, stamps = self.sweep_costs, self.sweep_moves, self.buckets, self.stamps
+        while buckets and (budget is None or budget > 0):
+            # No move is cheaper than a straight one, so the cells of a ring that many costs
+            # wide cannot reach each other and are settled together
+            ring = min(buckets)
+            cells = np.concatenate(buckets.pop(ring))
+            cells = cells[costs[cells] // STRAIGHT_COST == ring]  # Skip cells reached more cheaply since
+            order = np.arange(cells.size)
+            stamps[cells] = order
+            cells = cells[stamps[cells] == order]  # Each cell once
+            cell_costs = costs[cells]
+            next_ring = (ring + 2) * STRAIGHT_COST  # Costs from here on are two rings out
+            for step, pass_moves, offsets, allowed in self.passes:
+                reached = (cells[:, None] + offsets).ravel()
+                reached_costs = np.repeat(cell_costs + step, offsets.size)
+                found = np.flatnonzero(allowed[cells].ravel() & (costs[reached] > reached_costs))
+                if not found.size:
+                    continue
+                reached, reached_costs = reached[found], reached_costs[found]
+                np.minimum.at(costs, reached, reached_costs)  # Of two ways into a cell, the cheaper
+                won = costs[reached] == reached_costs
+                reached, reached_costs = reached[won], reached_costs[won]
+                moves[reached] = pass_moves[found[won] % len(pass_moves)]
+                farther = reached_costs >= next_ring
+                buckets.setdefault(ring + 1, []).append(reached[~farther])
+                buckets.setdefault(ring + 2, []).append(reached[farther])
+            self.settled = ring * STRAIGHT_COST + STRAIGHT_COST - 1
+            if budget is not None:
+                budget -= 1
+
+        if buckets or self.sweep_target is None:
+            return not buckets
+        self.costs, self.sweep_costs = self.sweep_costs, self.costs
+        self.moves, self.sweep_moves = self.sweep_moves, self.moves
+        self.target, self.sweep_target = self.sweep_target, None
+        return True
+
+    def sample(self, positions: np.ndarray) -> tuple:
+        """
+        Looks up the way to the player from each of (n, 3) positions, one cell lookup each.
+
+        Args:
+            positions (np.ndarray): The positions to steer from.
+
+        Returns:
+            tuple: ((n, 2) unit (x, z) directions, (n,) whether each position should follow its
+                direction instead of heading straight for the player: False off the grid, in
+                closed or unreachable cells, and wherever nothing is in the way).
+        """
+        n = len(positions)
+        if self.grid is None or (self.target is None and self.sweep_target is None):
+            return np.zeros((n, 2), dtype=np.float32), np.zeros(n, dtype=bool)
+        cells, inside = self.grid.cells_of(positions)
+
+        costs = self.costs[cells] if self.target is not None else np.full(n, UNREACHED, dtype=np.int32)
+        moves = self.moves[cells]
+        targets = np.full(n, -1 if self.target is None else self.target, dtype=np.int64)
+        if self.sweep_target is not None:
+            swept = self.sweep_costs[cells]
+            fresh = swept <= self.settled
+            costs = np.where(fresh, swept, costs)
+            moves = np.where(fresh, self.sweep_moves[cells], moves)
+            targets[fresh] = self.sweep_target
+
+        # The cost of the straight route over open ground: diagonal moves first, then straight ones
+        width = self.grid.width
+        dx = np.abs(cells // width - targets // width)
+        dz = np.abs(cells % width - targets % width)
+        open_cost = STRAIGHT_COST * np.maximum(dx, dz) + (DIAGONAL_COST - STRAIGHT_COST) * np.minimum(dx, dz)
+        steered = inside & (costs != UNREACHED) & (costs > open_cost)
+        return self.directions[moves], steered
+
+# Shared flow field towards the player, given the level's NavGrid by the Arena
+flow_field = FlowField()
@@ -0,0 +1,239 @@
+from ursina import *
+import sys
+import os
+import functools
+import time as wall_time
+import numpy as np
+
+# Add the src directory to the system path to allow imports from the src package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+HISTORY_FRAMES = 240  # Frames kept per section for the rolling statistics
+BUCKET_EDGES_MS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 16)  # Upper edges of the histogram buckets; the last is open
+TOGGLE_KEY = 'f3'
+REFRESH_INTERVAL = 0.25  # Seconds between overlay redraws
+
+class FrameProfiler:
+    """
+    Collects how long each instrumented subsystem takes per frame. Timings are summed within a
+    frame, then pushed into a ring buffer of the last HISTORY_FRAMES frames per section, from which
+    rolling statistics and histograms are read. While disabled, instrumented methods only pay for
+    one attribute check.
+    """
+
+    def __init__(self, history: int = HISTORY_FRAMES) -> None:
+        """
+        Args:
+            history (int): The number of frames to keep per section. Defaults to 240.
+        """
+        self.enabled: bool = False
+        self.history_size = history
+        self.current: dict = {}  # section -> seconds so far this frame
+        self.history: dict = {}  # section -> ring buffer of per-frame milliseconds
+        self.frames: int = 0  # Frames recorded since the history was cleared
+
+    def set_enabled(self, enabled: bool) -> None:
+        """
+        Turns timing on or off. Turning it on starts from an empty history.
+        """
+        if enabled and not self.enabled:
+            self.current.clear()
+            self.history.clear()
+            self.frames = 0
+        self.enabled = enabled
+
+    def add(self, section: str, seconds: float) -> None:
+        """
+        Adds time spent in a section to the current frame.
+
+        Args:
+            section (str): The section name, e.g. 'Player.update'.
+            seconds (float): The time spent.
+        """
+        self.current[section] = self.current.get(section, 0.0) + seconds
+
+    def end_frame(self) -> None:
+        """
+        Closes the current frame: every known section gets this frame's total (zero if it did not
+        run) pushed into its history.
+        """
+        slot = self.frames % self.history_size
+        for section, seconds in self.current.items():
+            if section not in self.history:
+                self.history[section] = np.zeros(self.history_size, dtype=np.float32)
+        for section, history in self.history.items():
+            history[slot] = self.current.get(section, 0.0) * 1000
+        self.current.clear()
+        self.frames += 1
+
+    def samples(self, section: str) -> np.ndarray:
+        """
+        Returns the recorded per-frame milliseconds of a section, in ring-buffer order.
+        """
+        return self.history[section][:min(self.frames, self.history_size)]
+
+    def stats(self, section: str) -> dict:
+        """
+        Returns the mean, p95 and max milliseconds per frame of a section over the history.
+        """
+        samples = self.samples(section)
+        if not len(samples):
+            return {'mean_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0}
+        return {
+            'mean_ms': float(samples.mean()),
+            'p95_ms': float(np.percentile(samples, 95)),
+            'max_ms': float(samples.max()),
+        }
+
+    def histogram(self, section: str) -> np.ndarray:
+        """
+        Returns the fraction of recorded frames falling in each bucket of BUCKET_EDGES_MS, plus
+        one open bucket for slower frames.
+        """
+        samples = self.samples(section)
+        counts = np.bincount(np.searchsorted(BUCKET_EDGES_MS, samples), minlength=len(BUCKET_EDGES_MS) + 1)
+        return counts / max(len(samples), 1)
+
+frame_profiler = FrameProfiler()
+
+def scene_counts() -> dict:
+    """
+    Returns the number of nodes in the 3D scene graph and the number of draw calls it asks for:
+    one per Geom in every visible GeomNode, counted before frustum culling, with an instanced
+    node counting once however many instances it draws.
+    """
+    draw_calls = 0
+    for geom_node in scene.findAllMatches('**/+GeomNode'):
+        if not geom_node.isHidden():
+            draw_calls += geom_node.node().getNumGeoms()
+    return {'nodes': scene.countNumDescendants(), 'draw_calls': draw_calls}
+
+def profiled(section: str):
+    """
+    Decorates a method so its run time is added to a profiler section while profiling is on.
+
+    Args:
+        section (str): The section name shown in the overlay.
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            if not frame_profiler.enabled:
+                return method(*args, **kwargs)
+            start = wall_time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                frame_profiler.add(section, wall_time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+class ProfilerOverlay(Entity):
+    """
+    On-screen view of the FrameProfiler, toggled with F3. Each section gets a row with its mean,
+    p95 and max milliseconds per frame and a histogram of its recent frame times. Rendering and
+    whole-frame time are measured with tasks around Panda3D's render task, which only exist while
+    the overlay is on.
+    """
+
+    def __init__(self, profiler: FrameProfiler = frame_profiler, toggle_key: str = TOGGLE_KEY, **kwargs) -> None:
+        """
+        Args:
+            profiler (FrameProfiler): The profiler to show. Defaults to the shared one.
+            toggle_key (str): The key that turns profiling and the overlay on and off.
+            **kwargs: Additional arguments passed to the Entity constructor.
+        """
+        super().__init__(parent=camera.ui, eternal=True, **kwargs)
+        self.profiler = profiler
+        self.toggle_key = toggle_key
+        self.panel = Entity(parent=self, position=window.top_left + Vec2(0.02, -0.02), enabled=False)
+        self.header = Text(
+            parent=self.panel, font='VeraMono.ttf', scale=0.6, origin=(-0.5, 0.5),
+            text=f"{'section':<28}{'mean':>7}{'p95':>7}{'max':>7}  ms",
+        )
+        self.counts = Text(parent=self.panel, font='VeraMono.ttf', scale=0.6, origin=(-0.5, 0.5))
+        self.rows: dict = {}  # section -> (Text, [bar Entities])
+        self.last_refresh = 0.0
+        self.render_start = 0.0
+        self.frame_start = None
+
+    def input(self, key) -> None:
+        if key == self.toggle_key:
+            self.toggle()
+
+    def toggle(self) -> None:
+        """
+        Turns profiling and the overlay on or off.
+        """
+        if self.profiler.enabled:
+            self.hide_overlay()
+        else:
+            self.show_overlay()
+
+    def show_overlay(self) -> None:
+        self.profiler.set_enabled(True)
+        self.panel.enable()
+        self.frame_start = None
+        taskMgr.add(self.before_render, 'profiler-before-render', sort=49)
+        taskMgr.add(self.after_render, 'profiler-after-render', sort=51)
+
+    def hide_overlay(self) -> None:
+        self.profiler.set_enabled(False)
+        self.panel.disable()
+        taskMgr.remove('profiler-before-render')
+        taskMgr.remove('profiler-after-render')
+
+    def before_render(self, task):
+        self.render_start = wall_time.perf_counter()
+        return task.cont
+
+    def after_render(self, task):
+        """
+        Records rendering and the whole frame, closes the profiler frame and redraws the overlay
+        a few times a second.
+        """
+        now = wall_time.perf_counter()
+        self.profiler.add('render', now - self.render_start)
+        if self.frame_start is not None:
+            self.profiler.add('frame', now - self.frame_start)
+        self.frame_start = now
+        self.profiler.end_frame()
+
+        if now - self.last_refresh >= REFRESH_INTERVAL:
+            self.last_refresh = now
+            self.refresh()
+        return task.cont
+
+    def refresh(self) -> None:
+        """
+        Redraws every row from the profiler's rolling history, slowest sections first, followed by
+        the scene's node and draw call counts.
+        """
+        sections = sorted(self.profiler.history, key=lambda s: -self.profiler.stats(s)['mean_ms'])
+        for index, section in enumerate(sections):
+            label, bars = self.row(section)
+            y = -(index + 1) * 0.025
+            stats = self.profiler.stats(section)
+            label.y = y
+            label.text = f"{section:<28}{stats['mean_ms']:7.2f}{stats['p95_ms']:7.2f}{stats['max_ms']:7.2f}"
+            for bar, fraction in zip(bars, self.profiler.histogram(section).tolist()):
+                bar.y = y - 0.02
+                bar.scale_y = max(fraction, 0.02) * 0.02
+
+        counts = scene_counts()
+        self.counts.y = -(len(sections) + 1) * 0.025
+        self.counts.text = f"scene: {counts['nodes']} nodes, {counts['draw_calls']} draw calls"
+
+    def row(self, section: str) -> tuple:
+        """
+        Returns the label and histogram bars for a section, creating them on first use.
+        """
+        if section not in self.rows:
+            label = Text(parent=self.panel, font='VeraMono.ttf', scale=0.6, origin=(-0.5, 0.5))
+            bars = [
+                Entity(parent=self.panel, model='quad', origin=(-0.5, -0.5), color=color.lime,
+                       x=0.62 + i * 0.012, scale=(0.01, 0.001))
+                for i in range(len(BUCKET_EDGES_MS) + 1)
+            ]
+            self.rows[section] = (label, bars)
+        return self.rows[section]
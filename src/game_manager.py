@@ -5,94 +5,267 @@ import os
 # Add the src directory to the system path to allow imports from the src package
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import numpy as np
 from src.state import StateMachine
 from src.enums.game_state import GameState
-from enemy import Enemy
-from player import Player
-from ui import UIManager
+from src.enemy import Enemy
+from src.enemy_swarm import EnemySwarm
+from src.simulation_loop import SimulationLoop
+from src.player import Player
+from src.ui import UIManager
+from src.event_log import event_log
+from src.spawn_queue import SpawnQueue, spawn_positions, SPAWN_BUDGET_MS
+from src.enums.spawn_pattern import SpawnPattern
+from src.snapshot import ENEMY_DTYPE, snapshot_writer
+from src.rng import rng
 
 class GameManager(Entity):
     """
     The GameManager class handles the overall game logic, including spawning enemies,
-    tracking waves, handling player death, and restarting the game.
+    tracking waves, handling player death, and restarting the game. The same game logic
+    runs with a window and in headless simulations; only the mouse capture differs.
+    Enemies of a wave are queued and built over the following frames by a SpawnQueue.
+
+    A run can be captured as a snapshot and restored from one. With autosave on, a snapshot is
+    saved in the background each time a wave has finished spawning.
+
+    Each run from wave 1 reseeds the random streams, and with a recorder attached, its input is
+    recorded from the first frame so the run can be replayed exactly.
     """
 
-    def __init__(self, state_machine: StateMachine, ui_manager: UIManager, **kwargs):
+    def __init__(self, state_machine: StateMachine, ui_manager: UIManager, headless: bool = False,
+                 spawn_pattern: SpawnPattern = SpawnPattern.LINE, spawn_rate: float = None,
+                 spawn_budget_ms: float = SPAWN_BUDGET_MS, autosave: str = None, seed: int = None,
+                 recorder=None, **kwargs):
+        """
+        Args:
+            state_machine (StateMachine): The shared game state.
+            ui_manager (UIManager): The UI manager to hook the start and restart buttons to.
+            headless (bool): Whether the game runs without a window, in which case the mouse is never captured.
+            spawn_pattern (SpawnPattern): How each wave is laid out. Defaults to a line ahead of the spawn point.
+            spawn_rate (float): The most enemies spawned per second, or None for as many as the budget allows.
+            spawn_budget_ms (float): Milliseconds per frame spent building enemies.
+            autosave (str): The file to save a snapshot to whenever a wave has finished spawning, or None.
+            seed (int): The seed every run starts from, or None for a fresh one each run.
+            recorder (InputRecorder): Records the input of each run started, or None.
+            **kwargs: Additional arguments passed to the Entity constructor.
+        """
         super().__init__(**kwargs)
         self.state_machine = state_machine
         self.ui_manager = ui_manager
+        self.headless = headless
 
         # Game variables
         self.current_wave = 1
-        self.enemies_remaining = 0
         self.player = None
 
         # List to keep track of enemies
         self.enemies = []
+        self.spawn_pattern = spawn_pattern
+        self.spawn_queue = SpawnQueue(self.spawn_enemy, budget_ms=spawn_budget_ms, rate=spawn_rate,
+                                      on_drained=self.wave_spawned)
+        self.autosave = autosave
+        self.seed = seed
+        self.recorder = recorder
+
+        self.ui_manager.start_game_callback = self.start_game
+        self.ui_manager.restart_game_callback = self.restart_game
 
     def start_game(self):
         """
-        Starts the game by initializing the player and starting the first wave.
+        Starts the game by clearing any previous run, seeding the random streams, creating the
+        player and starting the first wave.
         """
-        # Create the player
-        self.player = Player(stateMachine=self.state_machine, uiManager=self.ui_manager, position=(0, 1.5, 0))
-        self.state_machine.player_health = self.state_machine.max_health  # Reset player health
+        seed = rng.seed(self.seed)
+        event_log.info('run_started', seed=seed)
+        self.state_machine.reset_game()
+        self.clear()
+        self.create_player((0, 1.5, 0))
 
         # Start the first wave
         self.current_wave = 1
         self.spawn_wave()
 
+        self.play()
+        if self.recorder:
+            self.recorder.start(self)
+
+    def create_player(self, position) -> Player:
+        """
+        Creates the player at a position.
+        """
+        self.player = Player(
+            stateMachine=self.state_machine,
+            uiManager=self.ui_manager,
+            position=position,
+            on_death=self.player_died
+        )
+        return self.player
+
+    def play(self) -> None:
+        """
+        Enters the PLAYING state and hides the mouse cursor during gameplay.
+        """
+        self.state_machine.game_state = GameState.PLAYING
+        if not self.headless:
+            mouse.visible = False
+            mouse.locked = True
+
     def spawn_wave(self):
         """
-        Spawns a new wave of enemies based on the current wave number.
+        Queues a new wave of enemies based on the current wave number. They appear over the next
+        frames, as the spawn queue's budget allows.
         """
-        print(f"Spawning wave {self.current_wave} with {self.current_wave} enemies.")
-        self.enemies_remaining = self.current_wave
-        self.enemies = []
+        event_log.info('wave_spawned', wave=self.current_wave, enemies=self.current_wave)
+        for position in spawn_positions(self.spawn_pattern, self.current_wave):
+            self.spawn_queue.push(position)
+
+    def spawn_enemy(self, position, stats: dict = None) -> Enemy:
+        """
+        Builds one queued enemy.
 
-        for i in range(self.current_wave):
-            # Position enemies around the player
-            position = Vec3(random.uniform(-10, 10), 2, random.uniform(-10, 10))
-            enemy = Enemy(player=self.player, game_manager=self, position=position)
-            self.enemies.append(enemy)
+        Args:
+            position (Vec3): Where the enemy appears.
+            stats (dict): The enemy's stats, or None to roll new ones.
+        """
+        enemy = Enemy(player=self.player, position=position, on_death=self.enemy_died, stats=stats)
+        self.enemies.append(enemy)
+        return enemy
 
-    def enemy_died(self):
+    def enemy_died(self, enemy):
         """
-        Called when an enemy dies. Checks if the wave is complete and spawns the next wave.
+        Called when an enemy has finished dying. Starts the next wave once the current one is cleared.
+
+        Args:
+            enemy (Enemy): The enemy that died.
         """
-        self.enemies_remaining -= 1
-        self.state_machine.kills += 1  # Increase kill count
+        if enemy in self.enemies:
+            self.enemies.remove(enemy)
 
-        if self.enemies_remaining <= 0:
-            # All enemies in the wave are dead; start the next wave
+        if not self.enemies and not self.spawn_queue.pending and self.state_machine.game_state == GameState.PLAYING:
+            # All enemies in the wave are dead and none are still to come; start the next wave
             self.current_wave += 1
             self.spawn_wave()
 
+    def wave_spawned(self) -> None:
+        """
+        Called when the last enemy of a wave has been built. Autosaves, if on.
+        """
+        if self.autosave and self.player and self.state_machine.game_state == GameState.PLAYING:
+            snapshot_writer.save(self.snapshot(), self.autosave)
+
+    def snapshot(self) -> dict:
+        """
+        Captures the run as it stands after the last simulation step: the wave, health and kills,
+        the player, every living enemy and the spawns still queued.
+
+        Returns:
+            dict: The snapshot, for snapshot_writer.save() or restore().
+        """
+        loop, swarm = SimulationLoop.instance(), EnemySwarm.instance()
+        living = [enemy for enemy in self.enemies if not enemy.is_dying]
+        enemies = np.zeros(len(living), dtype=ENEMY_DTYPE)
+        for record, enemy in zip(enemies, living):
+            record['position'] = loop.simulated_position(enemy)
+            record['velocity'] = tuple(swarm.velocity_of(enemy) if enemy.slot is not None else enemy.velocity)
+            record['heading'] = enemy.getH()
+            record['health'] = enemy.health
+            record['max_health'] = enemy.max_health
+            record['since_shot'] = loop.time - enemy.last_shot_time
+            for stat in ('size', 'speed', 'hover_height', 'friction'):
+                record[stat] = getattr(enemy, stat)
+
+        player = self.player
+        return {
+            'wave': self.current_wave,
+            'health': self.state_machine.player_health,
+            'max_health': self.state_machine.max_health,
+            'kills': self.state_machine.kills,
+            'player': {
+                'position': loop.simulated_position(player),
+                'rotation': tuple(player.rotation),
+                'look': (player.camera_pivot.rotation_x, player.camera_pivot.rotation_y),
+                'velocity': tuple(player.velocity),
+                'grounded': player.grounded,
+            },
+            'enemies': enemies,
+            'spawns': np.array([tuple(position) for position, _, _ in self.spawn_queue.pending], dtype=np.float32),
+        }
+
+    def restore(self, snapshot: dict) -> None:
+        """
+        Replaces the current run, if any, with the one a snapshot captured, and plays it.
+
+        Args:
+            snapshot (dict): What snapshot() or load_snapshot() returns.
+        """
+        if self.recorder:
+            self.recorder.stop()  # A restored run does not start from its seed, so cannot be replayed
+        self.state_machine.reset_game()
+        self.clear()
+
+        saved = snapshot['player']
+        player = self.create_player(Vec3(*saved['position']))
+        player.rotation = Vec3(*saved['rotation'])
+        player.camera_pivot.rotation_x, player.camera_pivot.rotation_y = saved['look']
+        player.velocity = Vec3(*saved['velocity'])
+        player.grounded = bool(saved['grounded'])
+        self.state_machine.max_health = int(snapshot['max_health'])
+        self.state_machine.player_health = int(snapshot['health'])
+        self.state_machine.kills = int(snapshot['kills'])
+        self.current_wave = int(snapshot['wave'])
+
+        loop, swarm = SimulationLoop.instance(), EnemySwarm.instance()
+        for record in snapshot['enemies']:
+            stats = {stat: record[stat].item() for stat in ('size', 'speed', 'hover_height', 'friction')}
+            enemy = self.spawn_enemy(Vec3(*record['position'].tolist()), stats)
+            enemy.setH(float(record['heading']))
+            enemy.health = int(record['health'])
+            enemy.max_health = int(record['max_health'])
+            enemy.last_shot_time = loop.time - float(record['since_shot'])
+            swarm.set_velocity(enemy, record['velocity'].tolist())
+        for position in snapshot['spawns'].tolist():
+            self.spawn_queue.push(Vec3(*position))
+        if not self.enemies and not self.spawn_queue.pending:
+            self.spawn_wave()  # Saved between waves; the wave starts over
+
+        event_log.info('snapshot_restored', wave=self.current_wave, enemies=len(self.enemies),
+                       spawns=self.spawn_queue.depth)
+        self.play()
+
     def player_died(self):
         """
-        Called when the player dies. Displays the end screen.
+        Called when the player dies. The UI shows the end screen from the GAME_OVER state.
         """
-        print("Player died!")
         self.state_machine.game_state = GameState.GAME_OVER
-        self.ui_manager.show_end_screen(self.state_machine.kills)
+
+        # Make the mouse cursor visible
+        if not self.headless:
+            mouse.visible = True
+            mouse.locked = False
+
+        # Destroy all enemies, and those still to spawn
+        self.spawn_queue.clear()
+        for enemy in self.enemies:
+            destroy(enemy)
+        self.enemies.clear()
 
     def restart_game(self):
         """
         Restarts the game from wave 1.
         """
-        # Destroy existing enemies and player
+        self.start_game()
+
+    def clear(self):
+        """
+        Destroys the player and enemies of the previous run, if any, and drops queued spawns.
+        """
+        self.spawn_queue.clear()
         for enemy in self.enemies:
             destroy(enemy)
-        self.enemies = []
+        self.enemies.clear()
+        EnemySwarm.instance().restart()
         if self.player:
+            camera.parent = scene  # The camera is parented to the player; keep it alive
             destroy(self.player)
             self.player = None
-
-        # Reset game variables
-        self.state_machine.kills = 0
-        self.current_wave = 1
-        self.state_machine.game_state = GameState.PLAYING
-        self.ui_manager.hide_end_screen()
-
-        # Start the game
-        self.start_game()
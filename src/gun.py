@@ -4,7 +4,12 @@ import os
 
 # Add the src directory to the system path to allow imports from the src package
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from src.bullet import Bullet
+from src.bullet import bullet_pool
+from src.asset_streamer import AssetStreamer
+from src.enums.asset_priority import AssetPriority
+from src.simulation_loop import SimulationLoop
+from src.frame_profiler import profiled
+from src.event_log import event_log
 
 class Gun(Entity):
     """
@@ -21,12 +26,12 @@ class Gun(Entity):
             **kwargs: Additional arguments passed to the Entity constructor.
         """
         super().__init__(**kwargs)  # Initialize with the parent provided by the Player class
-        self.model = load_model('../assets/models/pistol.obj')
+        SimulationLoop.instance().register(self)
+        # The pistol streams in over a placeholder if it is not loaded yet; a new model keeps the texture
+        AssetStreamer.instance().model('../assets/models/pistol.obj', self.model_setter, AssetPriority.CRITICAL)
         self._double_sided = False
         self.double_sided_setter(False)
-        self.color_texture = load_texture('../assets/images/pistol/color.png')
-
-        self.texture = self.color_texture
+        AssetStreamer.instance().texture('../assets/images/pistol/color.png', self.texture_setter, AssetPriority.CRITICAL)
 
         # Position and rotation offsets relative to the camera
         self.position_offset = Vec3(0.6, 0.3, 0.6)
@@ -46,13 +51,13 @@ class Gun(Entity):
 
         # Spring properties for smooth aiming and recoil effects
         self.spring_constant = 200.0
-        self.damping = 0.8  # Higher damping to slow down the spring effect
+        self.damping = 0.8  # Velocity kept per 1/60 s; higher damping slows down the spring effect
 
         self.vertical_look_sensitivity = 200  # Sensitivity for vertical movement
         self.barrel_offset = Vec3(0, 0.7, 1.4)  # Position of the gun's barrel
 
         self.cooldown_time = 0.2  # Cooldown time between shots
-        self.last_shot_time = 0  # Track the time of the last shot
+        self.last_shot_time = -self.cooldown_time  # Simulation time of the last shot
 
         # Recoil settings
         self.recoil_offset = Vec3(0, 0, -0.6)
@@ -62,35 +67,46 @@ class Gun(Entity):
 
         self.recoil_damping = 5  # Smoother return with lower value
 
+    @profiled('Gun.update')
     def update(self) -> None:
         """
-        Update the gun's position and rotation every frame, handling recoil and 
-        smooth transitions back to the default position after shooting.
+        Places the gun relative to the camera every frame, applying the current recoil and
+        spring rotation.
         """
         # Calculate the base position relative to the camera
         base_position = camera.position + camera.forward * self.position_offset.z
         horizontal_offset = camera.right * self.position_offset.x
         vertical_offset = camera.up * (self.position_offset.y + camera.rotation_x * self.vertical_look_sensitivity)
 
-        # Gradually return to the original position and rotation after recoil
-        self.current_recoil_position = lerp(self.current_recoil_position, Vec3(0, 0, 0), time.dt * self.recoil_damping)
-        self.current_recoil_rotation = lerp(self.current_recoil_rotation, Vec3(0, 0, 0), time.dt * self.recoil_damping)
-
         # Apply the recoil adjustments to the gun's position and rotation
         self.position = base_position + horizontal_offset + vertical_offset + self.current_recoil_position
         self.rotation_x = self.current_rotation_x + self.current_recoil_rotation.x
         self.rotation_y = self.current_rotation_y + self.current_recoil_rotation.y
 
+    @profiled('Gun.fixed_update')
+    def fixed_update(self, dt: float) -> None:
+        """
+        Called by the SimulationLoop every fixed step. Recovers from recoil and moves the gun
+        towards its target rotation with spring physics.
+
+        Args:
+            dt (float): The length of the step in seconds.
+        """
+        # Gradually return to the original position and rotation after recoil
+        self.current_recoil_position = lerp(self.current_recoil_position, Vec3(0, 0, 0), dt * self.recoil_damping)
+        self.current_recoil_rotation = lerp(self.current_recoil_rotation, Vec3(0, 0, 0), dt * self.recoil_damping)
+
         # Smoothly return the gun to its target rotation using spring physics
+        damping = self.damping ** (dt * 60)
         rotation_difference_y = self.target_rotation_y - self.current_rotation_y
-        self.rotation_velocity_y += rotation_difference_y * self.spring_constant * time.dt
-        self.rotation_velocity_y *= self.damping
-        self.current_rotation_y += self.rotation_velocity_y * time.dt
+        self.rotation_velocity_y += rotation_difference_y * self.spring_constant * dt
+        self.rotation_velocity_y *= damping
+        self.current_rotation_y += self.rotation_velocity_y * dt
 
         rotation_difference_x = self.target_rotation_x - self.current_rotation_x
-        self.rotation_velocity_x += rotation_difference_x * self.spring_constant * time.dt
-        self.rotation_velocity_x *= self.damping
-        self.current_rotation_x += self.rotation_velocity_x * time.dt
+        self.rotation_velocity_x += rotation_difference_x * self.spring_constant * dt
+        self.rotation_velocity_x *= damping
+        self.current_rotation_x += self.rotation_velocity_x * dt
 
     def set_target_rotation(self, target_rotation_y: float, target_rotation_x: float) -> None:
         """
@@ -108,11 +124,12 @@ class Gun(Entity):
         Handles the shooting mechanism, including recoil, bullet instantiation, 
         and cooldown management. Ensures that the gun cannot shoot faster than the cooldown.
         """
-        if time.time() - self.last_shot_time < self.cooldown_time:
+        now = SimulationLoop.instance().time
+        if now - self.last_shot_time < self.cooldown_time:
             return  # If not enough time has passed since the last shot, do nothing
 
         # Update the last shot time
-        self.last_shot_time = time.time()
+        self.last_shot_time = now
 
         # Apply recoil effect in the local space
         self.current_recoil_position = self.forward * self.recoil_offset.z
@@ -128,6 +145,12 @@ class Gun(Entity):
 
         # Shoot the bullet in the direction the gun is pointing
         bullet_direction = self.forward
-        Bullet(position=bullet_start_position, direction=bullet_direction)
+        bullet_pool.acquire(position=bullet_start_position, direction=bullet_direction)
 
-        print("Shot fired!")
+        event_log.debug('player_shot')
+
+    def on_destroy(self) -> None:
+        """
+        Called by Ursina when the gun is destroyed along with the player. Stops stepping it.
+        """
+        SimulationLoop.instance().unregister(self)
@@ -0,0 +1,176 @@
+from ursina import *
+import sys
+import os
+import time as wall_time
+from pathlib import Path
+from panda3d.core import ClockObject, Filename, getModelPath, loadPrcFileData
+
+# Add the src directory to the system path to allow imports from the src package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.state import StateMachine
+from src.ui import UIManager
+from src.level import create_level
+from src.game_manager import GameManager
+from src.enemy import enemy_bullet_pool
+from src.bullet import bullet_pool
+from src.asset_registry import AssetRegistry
+from src.simulation_loop import SimulationLoop
+from src.enums.game_state import GameState
+
+FIXED_DT = 1 / 60
+
+class InputScript:
+    """
+    A timeline of input for a headless run. Key presses and releases are delivered through
+    Ursina's normal input path, so held_keys and entity input() handlers see them exactly as
+    they would from a keyboard; mouse buttons are set in held_keys and look deltas are written
+    to mouse.velocity for one frame.
+    """
+
+    def __init__(self) -> None:
+        self.events: dict = {}  # frame -> [(kind, value)]
+
+    def add(self, frame: int, kind: str, value) -> 'InputScript':
+        self.events.setdefault(frame, []).append((kind, value))
+        return self
+
+    def press(self, frame: int, key: str) -> 'InputScript':
+        """
+        Presses a key (e.g. 'w', 'space', 'left mouse') at the start of a frame.
+        """
+        return self.add(frame, 'press', key)
+
+    def release(self, frame: int, key: str) -> 'InputScript':
+        """
+        Releases a key at the start of a frame.
+        """
+        return self.add(frame, 'release', key)
+
+    def hold(self, frame: int, key: str, frames: int) -> 'InputScript':
+        """
+        Holds a key down for a number of frames.
+        """
+        return self.press(frame, key).release(frame + frames, key)
+
+    def look(self, frame: int, dx: float, dy: float) -> 'InputScript':
+        """
+        Moves the mouse by (dx, dy) in screen units during a frame.
+        """
+        return self.add(frame, 'look', (dx, dy))
+
+    def apply(self, frame: int) -> None:
+        """
+        Delivers the input scheduled for a frame.
+        """
+        mouse.velocity = Vec3(0, 0, 0)
+        for kind, value in self.events.get(frame, ()):
+            if kind == 'look':
+                mouse.velocity = Vec3(value[0], value[1], 0)
+            elif value.endswith('mouse'):
+                # Ursina's mouse button handling reads the pointer from the window, so buttons
+                # are only reflected in held_keys, which is what the game polls
+                held_keys[value] = int(kind == 'press')
+            else:
+                application.base.input(value if kind == 'press' else f"{value} up", is_raw=True)
+
+class HeadlessGame:
+    """
+    Runs the full game -- GameManager, Player, enemy waves and projectiles -- with no window and
+    no rendering. Time advances by a fixed step per frame instead of following the wall clock, so
+    runs are as fast as the simulation allows and independent of the machine's frame rate.
+
+    Ursina only supports one app per process, so every HeadlessGame in a process shares it and
+    the game built on it.
+    """
+    _world = None  # (app, game manager), created by the first HeadlessGame
+
+    def __init__(self, fixed_dt: float = FIXED_DT, seed=None) -> None:
+        """
+        Creates the windowless app (once per process) and the game.
+
+        Args:
+            fixed_dt (float): Simulated seconds per frame.
+            seed (int): The seed every run starts from, for reproducible waves, or None for a
+                fresh one each run.
+        """
+        if HeadlessGame._world is None:
+            loadPrcFileData('', 'audio-library-name null')  # No sound device on servers
+            app = Ursina(window_type='none', development_mode=False)
+            # Asset paths are relative to src/; resolve them from there whatever the working directory
+            SimulationLoop.instance()
+            application.asset_folder = Path(os.path.dirname(os.path.abspath(__file__)))
+            getModelPath().prepend_directory(Filename.from_os_specific(str(application.asset_folder)))
+            AssetRegistry().mount_pack()
+            AssetRegistry().prewarm()
+            create_level()
+            bullet_pool.prewarm()
+            enemy_bullet_pool.prewarm()
+            ui_manager = UIManager(state_machine=StateMachine())
+            HeadlessGame._world = (app, GameManager(StateMachine(), ui_manager, headless=True))
+        self.app, self.game_manager = HeadlessGame._world
+        self.game_manager.seed = seed
+        self.state_machine = StateMachine()
+
+        self.fixed_dt = fixed_dt
+        globalClock.setMode(ClockObject.MNonRealTime)
+        globalClock.setDt(fixed_dt)
+        self.frame = 0
+
+    def start(self) -> None:
+        """
+        Starts (or restarts) a run from wave 1, as if the play button was clicked.
+        """
+        self.game_manager.start_game()
+        self.frame = 0
+
+    @property
+    def player(self):
+        return self.game_manager.player
+
+    @property
+    def game_over(self) -> bool:
+        return self.state_machine.game_state == GameState.GAME_OVER
+
+    def step(self, script: InputScript = None) -> None:
+        """
+        Advances the simulation by one fixed step, delivering any scripted input first.
+        """
+        if script:
+            script.apply(self.frame)
+        self.app.step()
+        self.frame += 1
+
+    def run(self, frames: int, script: InputScript = None, stop_on_game_over: bool = True) -> dict:
+        """
+        Advances the simulation by a number of frames.
+
+        Args:
+            frames (int): The number of fixed steps to run.
+            script (InputScript): Scripted input to deliver, indexed by frame since start().
+            stop_on_game_over (bool): Stop early once the player has died.
+
+        Returns:
+            dict: A summary of the run: frames, simulated and wall seconds, speedup over real
+                time, wave, kills and player health.
+        """
+        start = wall_time.perf_counter()
+        first_frame = self.frame
+        for _ in range(frames):
+            self.step(script)
+            if stop_on_game_over and self.game_over:
+                break
+
+        frames_run = self.frame - first_frame
+        wall_seconds = wall_time.perf_counter() - start
+        simulated = frames_run * self.fixed_dt
+        return {
+            'frames': frames_run,
+            'simulated_seconds': simulated,
+            'wall_seconds': wall_seconds,
+            'speedup': simulated / wall_seconds if wall_seconds else float('inf'),
+            'wave': self.game_manager.current_wave,
+            'kills': self.state_machine.kills,
+            'player_health': self.state_machine.player_health,
+            'game_over': self.game_over,
+        }
@@ -1,24 +1,37 @@
 from ursina import *
+import sys
+import os
+
+# Add the src directory to the system path to allow imports from the src package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.asset_streamer import AssetStreamer
+from src.enums.asset_priority import AssetPriority
+from src.arena import Arena
 
 def create_level() -> None:
     """
-    Creates the game level by setting up the ground, ambient light, and a custom skybox.
-    This function initializes essential elements of the environment.
+    Creates the game level: the procedural arena, ambient light and a custom skybox. The arena
+    chunks around the spawn point are built at once; the rest stream in around the player.
 
     Returns:
         None
     """
-    # Create the ground entity with a large plane model and apply texture
-    ground = Entity(model='plane', scale=(100, 1, 100), collider='box')
-    ground.texture = load_texture('../assets/images/ground.png')
-    ground.texture_scale = (5, 5)  # Scale the texture to repeat across the ground
+    # Build the arena around the spawn point; later chunks are streamed in as the player moves
+    Arena.instance().stream(Vec3(0, 0, 0))
 
     # Add ambient lighting to the scene with a specific rotation and color
     AmbientLight(y=2, z=3, rotation=(45, -45, 45), color=(color.rgb(255, 50, 50)))
 
-    # Create a custom skybox using a spherical model and apply a texture to it
+    # Headless runs have no camera lens for the sky to follow, and nothing to draw it to
+    if application.window_type == 'none':
+        return
+
+    # Create a custom skybox using a spherical model; the sky texture is the largest asset, so it
+    # streams in last and Ursina's default sky shows until it is ready
     custom_skybox = Sky()
-    custom_skybox.texture = load_texture('../assets/images/Sky.png')
+    AssetStreamer.instance().texture('../assets/images/Sky.png', custom_skybox.texture_setter,
+                                     AssetPriority.BACKGROUND, placeholder=False)
     custom_skybox.scale = 1000  # Scale the skybox to encompass the entire scene
     custom_skybox.double_sided_setter(True)  # Ensure the skybox is visible from the inside
     custom_skybox.model = 'sphere'  # Use a spherical model for the skybox
@@ -1,102 +1,190 @@
 from ursina import *
 import sys
 import os
+import argparse
+import time as wall_time
 
-from player import Player
-from enemy import Enemy
-from ui import UIManager
-from state import StateMachine
-from level import create_level
+# Add the src directory to the system path to allow imports from the src package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.enemy import enemy_bullet_pool
+from src.ui import UIManager
+from src.state import StateMachine
+from src.level import create_level
+from src.game_manager import GameManager
 from src.enums.game_state import GameState
+from src.bullet import bullet_pool
+from src.asset_registry import AssetRegistry, PREWARM_TEXTURES
+from src.asset_streamer import AssetStreamer
+from src.simulation_loop import SimulationLoop
+from src.frame_profiler import ProfilerOverlay
+from src.profile_capture import ProfileCapture
+from src.event_log import event_log, LEVELS
+from src.snapshot import SNAPSHOT_PATH, SnapshotError, load_snapshot
+from src.replay import REPLAY_PATH, InputRecorder, InputReplay, ReplayError, load_replay
+
+def restore_run(game_manager: GameManager, path: str) -> bool:
+    """
+    Restores a run from a snapshot file and prints its size and how long loading took.
+
+    Args:
+        game_manager (GameManager): The game to restore into.
+        path (str): The snapshot file.
+
+    Returns:
+        bool: Whether the run was restored; if not, the reason is printed and the game is unchanged.
+    """
+    start = wall_time.perf_counter()
+    try:
+        snapshot = load_snapshot(path)
+    except (OSError, SnapshotError) as error:
+        print(f"Could not load snapshot {path}: {error}")
+        return False
+    game_manager.restore(snapshot)
+    print(f"Restored wave {game_manager.current_wave} with {len(game_manager.enemies)} enemies from {path} "
+          f"({os.path.getsize(path)} bytes) in {(wall_time.perf_counter() - start) * 1000:.1f} ms")
+    return True
+
+def run_headless(frames: int, fixed_dt: float, seed=None, profile_frames: int = 0, profile_at: int = 0,
+                 load: str = None, record: str = None) -> dict:
+    """
+    Plays one game with no window for a number of fixed steps and prints a summary.
+
+    Args:
+        frames (int): The number of fixed steps to simulate.
+        fixed_dt (float): Simulated seconds per step.
+        seed (int): Seed for reproducible waves.
+        profile_frames (int): Frames to capture with cProfile, or 0 to not profile.
+        profile_at (int): The step at which the capture begins.
+        load (str): A snapshot to resume from instead of starting at wave 1.
+        record (str): A file to record the run's input to, or None.
+
+    Returns:
+        dict: The run summary from HeadlessGame.run().
+    """
+    from src.headless import HeadlessGame
+
+    game = HeadlessGame(fixed_dt=fixed_dt, seed=seed)
+    if record:
+        game.game_manager.recorder = InputRecorder(record)
+    game.start()
+    if load:
+        restore_run(game.game_manager, load)
+    if profile_frames:
+        ProfileCapture.instance().start(profile_frames, delay=profile_at)
+    summary = game.run(frames)
+    if profile_frames:
+        ProfileCapture.instance().stop()  # Writes out a capture cut short by the end of the run
+    print(
+        f"Simulated {summary['simulated_seconds']:.1f} s in {summary['wall_seconds']:.2f} s "
+        f"({summary['speedup']:.1f}x real time): wave {summary['wave']}, {summary['kills']} kills, "
+        f"{summary['player_health']} health"
+    )
+    return summary
+
+def run_replay(path: str, profile_frames: int = 0, profile_at: int = 0):
+    """
+    Plays an input recording back with no window, as fast as the simulation allows, and prints
+    whether the run ended as it did when it was recorded.
+
+    Args:
+        path (str): The recording.
+        profile_frames (int): Frames to capture with cProfile, or 0 to not profile.
+        profile_at (int): The frame at which the capture begins.
+
+    Returns:
+        dict: The run summary from HeadlessGame.run(), with the differences from the recording
+            under 'mismatches', or None if the recording could not be loaded.
+    """
+    from src.headless import HeadlessGame
+
+    try:
+        recording = load_replay(path)
+    except (OSError, ReplayError) as error:
+        print(f"Could not load recording {path}: {error}")
+        return None
+    game = HeadlessGame()
+    replay = InputReplay(recording)
+    replay.prepare(game.game_manager)
+    game.start()
+    if profile_frames:
+        ProfileCapture.instance().start(profile_frames, delay=profile_at)
+    summary = game.run(len(recording['frames']), replay, stop_on_game_over=False)
+    if profile_frames:
+        ProfileCapture.instance().stop()
+    summary['simulated_seconds'] = float(recording['frames']['dt'].sum())  # Recorded frames vary in length
+    summary['speedup'] = summary['simulated_seconds'] / summary['wall_seconds'] if summary['wall_seconds'] else float('inf')
+    summary['mismatches'] = replay.mismatches()
+    print(
+        f"Replayed {summary['frames']} frames ({summary['simulated_seconds']:.1f} s, seed {recording['seed']}) "
+        f"in {summary['wall_seconds']:.2f} s ({summary['speedup']:.1f}x real time): wave {summary['wave']}, "
+        f"{summary['kills']} kills, {summary['player_health']} health"
+    )
+    print('Replay diverged: ' + ', '.join(summary['mismatches']) if summary['mismatches'] else 'Replay matched the recording')
+    return summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Shooter game')
+    parser.add_argument('--headless', action='store_true', help='simulate with no window or rendering')
+    parser.add_argument('--frames', type=int, default=3600, help='steps to simulate in headless mode')
+    parser.add_argument('--dt', type=float, default=1 / 60, help='seconds per step in headless mode')
+    parser.add_argument('--seed', type=int, default=None, help='seed for every run (default: a fresh one per run)')
+    parser.add_argument('--profile-frames', type=int, default=0, help='steps to capture with cProfile in headless mode')
+    parser.add_argument('--profile-at', type=int, default=0, help='step at which the headless capture begins')
+    parser.add_argument('--load', nargs='?', const=SNAPSHOT_PATH, default=None, metavar='SNAPSHOT',
+                        help='resume from a snapshot (default: the autosave)')
+    parser.add_argument('--record', nargs='?', const=REPLAY_PATH, default=None, metavar='RECORDING',
+                        help='record the input of each run (default: replays/last.replay)')
+    parser.add_argument('--replay', nargs='?', const=REPLAY_PATH, default=None, metavar='RECORDING',
+                        help='play a recorded run back headless, as fast as possible')
+    parser.add_argument('--log-level', choices=LEVELS, default='info', help='lowest game event level written to logs/game.log')
+    args = parser.parse_args(argv)
+    event_log.set_level(args.log_level)
+
+    if args.replay:
+        run_replay(args.replay, args.profile_frames, args.profile_at)
+        return
+    if args.headless:
+        run_headless(args.frames, args.dt, args.seed, args.profile_frames, args.profile_at, args.load, args.record)
+        return
 
-def main():
     app = Ursina()
 
+    # Step the game at a fixed rate whatever the frame rate
+    SimulationLoop.instance()
+
+    # Per-subsystem frame timings, shown with F3
+    ProfilerOverlay()
+
+    # cProfile captures of the next few hundred frames, taken with F4
+    ProfileCapture.instance()
+
+    # Serve assets from the packed archive when one has been built, except any changed since it
+    # was. Models are loaded up front so spawns never wait on the disk; textures stream in on a
+    # loading thread, the ones the first frame needs first, with placeholders shown until they arrive
+    AssetRegistry().mount_pack()
+    load_time = AssetRegistry().prewarm(textures=())
+    print(f"Prewarmed models in {load_time * 1000:.0f} ms")
+    AssetStreamer.instance().prefetch(textures=PREWARM_TEXTURES)
+
     state_machine = StateMachine()
     ui_manager = UIManager(state_machine=state_machine)
 
-    player = None
-    enemies = []
+    create_level()
 
-    wave_number = 1  # Keeps track of the current wave
+    # Allocate projectiles up front so firing never creates nodes mid-fight
+    bullet_pool.prewarm()
+    enemy_bullet_pool.prewarm()
 
-    create_level()
+    # Waves, player death and restarts are handled by the GameManager, which hooks itself
+    # up to the start and restart buttons, and autosaves each wave once it has spawned.
+    # With --record, each run's input is recorded for replaying
+    recorder = InputRecorder(args.record) if args.record else None
+    game_manager = GameManager(state_machine, ui_manager, autosave=SNAPSHOT_PATH, seed=args.seed, recorder=recorder)
 
-    def start_game():
-        nonlocal player, enemies, wave_number
-        wave_number = 1  # Reset the wave number
-
-        state_machine.reset_game()
-
-        # Destroy old entities if they exist
-        if player:
-            destroy(player)
-            player = None
-        for enemy in enemies:
-            destroy(enemy)
-        enemies.clear()
-
-        # Create new player
-        player = Player(
-            stateMachine=state_machine,  # Changed from state_machine to stateMachine
-            uiManager=ui_manager,        # Changed from ui_manager to uiManager
-            position=(0, 1.5, 0),
-            on_death=on_player_death
-        )
-
-        print(player)
-
-        # Start the first wave
-        start_wave()
-
-        # Set the game state to PLAYING
-        state_machine.game_state = GameState.PLAYING
-
-        # Hide the mouse cursor during gameplay
-        mouse.visible = False
-        mouse.locked = True
-
-
-    def start_wave():
-        nonlocal enemies, wave_number
-        print(f"Spawning wave {wave_number} with {wave_number} enemies.")
-        for i in range(wave_number):
-            enemy_position = Vec3(i * 5, 2, 10)  # Adjust positions as needed
-            enemy = Enemy(player=player, state_machine=state_machine, position=enemy_position, on_death=on_enemy_death)
-            enemies.append(enemy)
-
-    def on_enemy_death(enemy):
-        nonlocal enemies, wave_number
-        if enemy in enemies:
-            enemies.remove(enemy)
-        else:
-            print("Enemy not in enemies list.")
-
-        # Check if all enemies are dead
-        if not enemies:
-            wave_number += 1
-            start_wave()
-
-
-    def on_player_death():
-        # Handle game over logic
-        state_machine.game_state = GameState.GAME_OVER
-
-        # Make the mouse cursor visible
-        mouse.visible = True
-        mouse.locked = False
-
-        # Destroy all enemies
-        for enemy in enemies:
-            destroy(enemy)
-        enemies.clear()
-
-    # Disable the player (already done in player.die())
-
-    # Set the initial game state to MENU
-    ui_manager.start_game_callback = start_game
-    ui_manager.restart_game_callback = start_game
-    state_machine.game_state = GameState.MENU
+    if not (args.load and restore_run(game_manager, args.load)):
+        # Set the initial game state to MENU
+        state_machine.game_state = GameState.MENU
 
     app.run()
 
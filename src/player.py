@@ -6,16 +6,25 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.gun import Gun
+from src.simulation_loop import SimulationLoop
 from src.state import StateMachine
 from src.ui import UIManager
 from src.enums.game_state import GameState
 from src.enums.player_state import PlayerState
+from src.enums.state_event import StateEvent
+from src.frame_profiler import profiled
+from src.event_log import event_log
+from src.static_world import static_world
+
+STEP_HEIGHT = 0.3  # Ledges up to this high are stepped onto rather than blocking the player
+GROUND_TOLERANCE = 1e-3  # How far above the ground the player's feet can be and still stand on it
 
 class Player(Entity):
     """
     The Player class represents the player character in the game. It manages movement,
     interactions with the environment, and integrates with the StateMachine and UIManager
-    for game state management and UI updates.
+    for game state management and UI updates. Walls and ground come from the StaticWorld,
+    so moving never tests against enemies or bullets.
     """
 
     def __init__(self, stateMachine: StateMachine, uiManager: UIManager, on_death=None, test: bool = False, **kwargs):
@@ -35,6 +44,7 @@ class Player(Entity):
             collider='box',
             **kwargs
         )
+        SimulationLoop.instance().register(self)  # Before the gun, so the player steps first
         self.state_machine = stateMachine
         self.ui_manager = uiManager
         self.on_death = on_death
@@ -55,25 +65,27 @@ class Player(Entity):
         camera.position = (0, 0, 0)
         camera.rotation = (0, 0, 0)
         camera.fov = 120
-        mouse.locked = True
+        if application.window_type != 'none':
+            mouse.locked = True  # There is no window to capture the mouse in headless runs
 
         self.gun: Gun = Gun(parent=self)
 
+        # Movement runs in fixed steps; draw the player between them
+        SimulationLoop.instance().track(self)
+
+        # Follow the game state and health as they change rather than checking them every frame
+        self.playing: bool = self.state_machine.game_state == GameState.PLAYING
+        self.state_machine.subscribe(StateEvent.GAME_STATE, self.on_game_state)
+        self.state_machine.subscribe(StateEvent.HEALTH, self.on_health)
+
+    @profiled('Player.update')
     def update(self) -> None:
         """
-        Called every frame to update the player's state and handle input.
-        Manages movement, gravity, jumping, and interaction with the gun and UI.
+        Called every frame to handle mouse look and update the gun's aim.
         """
-        if self.state_machine.game_state != GameState.PLAYING and not self.test:
+        if not self.playing and not self.test:
             return
 
-        self.handle_movement()
-        self.apply_gravity()
-        self.jump()
-        self.apply_friction()
-
-        
-
         # Update camera rotation based on mouse movement
         self.camera_pivot.rotation_y += mouse.velocity[0] * 2000 * time.dt
         self.camera_pivot.rotation_x -= mouse.velocity[1] * 1700 * time.dt
@@ -84,30 +96,57 @@ class Player(Entity):
         camera_x_rotation = self.camera_pivot.rotation_x
         self.gun.set_target_rotation(camera_y_rotation, camera_x_rotation)
 
-        if held_keys['left mouse']:
-            self.gun.shoot()
+    @profiled('Player.fixed_update')
+    def fixed_update(self, dt: float) -> None:
+        """
+        Called by the SimulationLoop every fixed step. Manages movement, gravity, jumping and firing.
 
-        # Update UI elements
-        self.ui_manager.update()
+        Args:
+            dt (float): The length of the step in seconds.
+        """
+        if not self.playing and not self.test:
+            return
 
-        if self.state_machine.player_health <= 0:
-            self.die()
+        self.handle_movement(dt)
+        self.apply_gravity(dt)
+        self.jump()
+        self.apply_friction(dt)
+
+        if held_keys['left mouse']:
+            self.gun.shoot()
 
     def take_damage(self, amount):
         """
-        Reduces the player's health by the specified amount and checks for death.
+        Reduces the player's health by the specified amount. Dying is handled by on_health.
 
         Args:
             amount (int): The amount of damage to apply to the player.
         """
         self.state_machine.player_health -= amount
-        print(f"Player health: {self.state_machine.player_health}/{self.state_machine.max_health}")
+        event_log.debug('player_damaged', amount=amount, health=self.state_machine.player_health)
+
+    def on_game_state(self, game_state: GameState) -> None:
+        self.playing = game_state == GameState.PLAYING
 
-        if self.state_machine.player_health <= 0:
+    def on_health(self, health: int) -> None:
+        """
+        Kills the player once their health runs out, however it was lost.
+        """
+        if health <= 0 and self.enabled:
             self.die()
 
+    def on_destroy(self):
+        """
+        Called by Ursina when the player is destroyed. Stops stepping and interpolating it and
+        following the state.
+        """
+        SimulationLoop.instance().unregister(self)
+        SimulationLoop.instance().untrack(self)
+        self.state_machine.unsubscribe(StateEvent.GAME_STATE, self.on_game_state)
+        self.state_machine.unsubscribe(StateEvent.HEALTH, self.on_health)
+
     def die(self):
-        print("Player died!")
+        event_log.info('player_died')
         self.state_machine.game_state = GameState.GAME_OVER
 
         # Disable player controls and visibility instead of destroying
@@ -118,9 +157,12 @@ class Player(Entity):
             self.on_death()
 
 
-    def handle_movement(self) -> None:
+    def handle_movement(self, dt: float) -> None:
         """
         Handles player movement based on keyboard input, applying directional velocity.
+
+        Args:
+            dt (float): The length of the step in seconds.
         """
         forward = Vec3(camera.forward.x, 0, camera.forward.z).normalized()
         right = Vec3(camera.right.x, 0, camera.right.z).normalized()
@@ -131,25 +173,52 @@ class Player(Entity):
         ).normalized()
 
         if direction != Vec3(0, 0, 0):
-            self.velocity += direction * self.acceleration * time.dt
+            self.velocity += direction * self.acceleration * dt
             if self.velocity.length() > self.speed:
                 self.velocity = self.velocity.normalized() * self.speed
 
-        self.position += self.velocity * time.dt
+        self.move(self.velocity * dt)
+
+    def collision_bounds(self) -> tuple:
+        """
+        Returns the minimum and maximum corners of the player's box in world space.
+        """
+        half = self.scale * 0.5
+        return tuple(self.position - half), tuple(self.position + half)
+
+    def move(self, delta: Vec3) -> None:
+        """
+        Moves the player, sliding along static walls instead of passing through them. Speed into
+        a wall is lost.
 
-    def apply_gravity(self) -> None:
+        Args:
+            delta (Vec3): The movement wanted.
         """
-        Applies gravity to the player, making them fall if not grounded.
+        low, high = self.collision_bounds()
+        (dx, dz), (blocked_x, blocked_z) = static_world.sweep(low, high, (delta.x, delta.z), STEP_HEIGHT)
+        if blocked_x:
+            self.velocity.x = 0
+        if blocked_z:
+            self.velocity.z = 0
+        self.position += Vec3(dx, delta.y, dz)
+
+    def apply_gravity(self, dt: float) -> None:
+        """
+        Applies gravity to the player, making them fall if not grounded, and lands them on the
+        highest static surface under their feet.
+
+        Args:
+            dt (float): The length of the step in seconds.
         """
         if not self.grounded:
-            self.velocity.y -= self.gravity * time.dt
-
-        hit_info = self.intersects()
-        if hit_info.hit:
-            if self.velocity.y < 0:
-                self.grounded = True
-                self.velocity.y = 0
-                self.y = hit_info.entity.world_y + 0.5 * self.scale_y
+            self.velocity.y -= self.gravity * dt
+
+        low, high = self.collision_bounds()
+        ground = static_world.ground_height(low, high, STEP_HEIGHT)
+        if ground is not None and low[1] <= ground + GROUND_TOLERANCE and self.velocity.y <= 0:
+            self.grounded = True
+            self.velocity.y = 0
+            self.y = ground + 0.5 * self.scale_y
         else:
             self.grounded = False
 
@@ -161,11 +230,14 @@ class Player(Entity):
             self.velocity.y += math.sqrt(2 * self.jump_height * self.gravity)
             self.grounded = False
 
-    def apply_friction(self) -> None:
+    def apply_friction(self, dt: float) -> None:
         """
         Applies friction to the player's horizontal movement, slowing them down over time.
+
+        Args:
+            dt (float): The length of the step in seconds.
         """
         if self.velocity.length() > 0:
-            friction_force = self.friction * time.dt
+            friction_force = self.friction * dt
             self.velocity.x -= self.velocity.x * friction_force
             self.velocity.z -= self.velocity.z * friction_force
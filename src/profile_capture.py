@@ -0,0 +1,178 @@
+from ursina import *
+import sys
+import os
+import cProfile
+import pstats
+import datetime
+import re
+
+# Add the src directory to the system path to allow imports from the src package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+PROFILE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'profiles'))
+CAPTURE_FRAMES = 300
+CAPTURE_KEY = 'f4'
+MAX_STACK_DEPTH = 64
+
+def frame_name(function: tuple) -> str:
+    """
+    Returns a flamegraph frame name for a pstats function key (file, line, name).
+    """
+    filename, line, name = function
+    name = re.sub(r' at 0x[0-9a-f]+', '', name).replace(';', ',')  # Stable names, no stack separators
+    if filename == '~':
+        return name  # Built-ins, e.g. <built-in method math.sqrt>
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+def collapsed_stacks(stats: pstats.Stats) -> dict:
+    """
+    Rebuilds call stacks from cProfile's caller graph, in the collapsed format flamegraph tools
+    read. cProfile only records caller -> callee edges, so time is split across the paths into a
+    function in proportion to the time each incoming edge accounts for.
+
+    Args:
+        stats (pstats.Stats): The captured profile.
+
+    Returns:
+        dict: 'frame;frame;frame' -> microseconds of own time on that stack.
+    """
+    callees: dict = {}
+    for function, (_, _, _, _, callers) in stats.stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((function, edge[3]))  # Cumulative time through the edge
+
+    stacks: dict = {}
+
+    def visit(function, path: tuple, fraction: float) -> None:
+        own_time, cumulative_time = stats.stats[function][2], stats.stats[function][3]
+        stack = path + (frame_name(function),)
+        key = ';'.join(stack)
+        stacks[key] = stacks.get(key, 0.0) + own_time * fraction * 1e6
+
+        if len(stack) >= MAX_STACK_DEPTH or cumulative_time <= 0:
+            return
+        for callee, edge_time in callees.get(function, ()):
+            if callee == function or frame_name(callee) in stack:
+                continue  # Recursion is folded into the first occurrence
+            callee_total = stats.stats[callee][3]
+            if callee_total > 0:
+                visit(callee, stack, fraction * edge_time / callee_total)
+
+    roots = [function for function, entry in stats.stats.items() if not entry[4]]
+    for root in roots:
+        visit(root, (), 1.0)
+    return {stack: us for stack, us in stacks.items() if us >= 1}
+
+def write_collapsed(stats: pstats.Stats, path: str) -> None:
+    """
+    Writes a collapsed-stack file: one 'frame;frame;frame count' line per stack, with the count
+    in microseconds.
+    """
+    with open(path, 'w') as f:
+        for stack, microseconds in sorted(collapsed_stacks(stats).items()):
+            f.write(f"{stack} {int(round(microseconds))}\n")
+
+class ProfileCapture(Entity):
+    """
+    Captures a bounded window of frames with cProfile while the game keeps running. Press F4 or
+    call start() to profile the next CAPTURE_FRAMES frames; the result is written to profiles/
+    as a .prof file (for pstats, snakeviz and similar) and a .collapsed file (for flamegraph.pl,
+    speedscope and similar).
+    """
+    _instance = None  # Holds the shared ProfileCapture
+
+    @classmethod
+    def instance(cls) -> 'ProfileCapture':
+        """
+        Returns the shared ProfileCapture, creating it on first use.
+        """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, capture_key: str = CAPTURE_KEY, output_dir: str = PROFILE_DIR, **kwargs) -> None:
+        """
+        Args:
+            capture_key (str): The key that starts a capture.
+            output_dir (str): Where captures are written.
+            **kwargs: Additional arguments passed to the Entity constructor.
+        """
+        super().__init__(eternal=True, **kwargs)
+        self.capture_key = capture_key
+        self.output_dir = output_dir
+        self.profiler = None
+        self.frames_left: int = 0  # Frames still to capture, including any scheduled capture
+        self.delay: int = 0  # Frames to wait before a scheduled capture begins
+        self.capture_name = None
+        self.last_capture = None  # (prof path, collapsed path) of the last finished capture
+
+    @property
+    def capturing(self) -> bool:
+        return self.profiler is not None
+
+    def input(self, key) -> None:
+        if key == self.capture_key:
+            self.start()
+
+    def start(self, frames: int = CAPTURE_FRAMES, delay: int = 0, name: str = None) -> None:
+        """
+        Starts profiling, now or after a number of frames; the capture stops by itself after the
+        given number of frames. Starting while a capture is running or scheduled does nothing.
+
+        Args:
+            frames (int): The number of frames to capture.
+            delay (int): Frames to let pass before profiling, e.g. to reach a late wave in a
+                headless run.
+            name (str): The output file name, without extension. Defaults to a timestamp.
+        """
+        if self.capturing or self.frames_left > 0:
+            return
+        self.frames_left = frames
+        self.delay = delay
+        self.capture_name = name or datetime.datetime.now().strftime('capture-%Y%m%d-%H%M%S')
+        taskMgr.add(self.count_frame, 'profile-capture', sort=52)  # After rendering
+        if delay <= 0:
+            self.begin()
+
+    def begin(self) -> None:
+        print(f"Profiling {self.frames_left} frames...")
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+
+    def count_frame(self, task):
+        if not self.capturing:
+            self.delay -= 1
+            if self.delay <= 0:
+                self.begin()
+            return task.cont
+
+        self.frames_left -= 1
+        if self.frames_left <= 0:
+            self.stop()
+            return task.done
+        return task.cont
+
+    def stop(self) -> tuple:
+        """
+        Ends the capture (early, or when its frames are done) and writes it out. A capture that
+        has not begun yet is cancelled.
+
+        Returns:
+            tuple: The .prof and .collapsed paths, or None if nothing was being captured.
+        """
+        taskMgr.remove('profile-capture')
+        self.frames_left = 0
+        if not self.capturing:
+            return None
+        self.profiler.disable()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        prof_path = os.path.join(self.output_dir, self.capture_name + '.prof')
+        collapsed_path = os.path.join(self.output_dir, self.capture_name + '.collapsed')
+        self.profiler.dump_stats(prof_path)
+        write_collapsed(pstats.Stats(self.profiler), collapsed_path)
+
+        self.profiler = None
+        self.last_capture = (prof_path, collapsed_path)
+        print(f"Profile written to {prof_path} and {collapsed_path}")
+        return self.last_capture
@@ -0,0 +1,101 @@
+from ursina import *
+import sys
+import os
+import numpy as np
+from panda3d.core import (
+    Geom, GeomEnums, GeomNode, GeomPoints, GeomVertexArrayFormat, GeomVertexData, GeomVertexFormat,
+    InternalName, OmniBoundingVolume, PNMImage, TexGenAttrib, Texture as PandaTexture, TextureStage,
+    TransparencyAttrib,
+)
+
+# Add the src directory to the system path to allow imports from the src package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+SPRITE_RESOLUTION = 32  # Pixels across the round sprite texture
+
+# One vertex per projectile: position, radius in world units and color, interleaved as
+# Panda3D lays them out, so a NumPy record array can be copied straight into the vertex data
+VERTEX_DTYPE = np.dtype([('position', np.float32, 3), ('size', np.float32), ('color', np.uint8, 4)])
+
+def vertex_format() -> GeomVertexFormat:
+    array = GeomVertexArrayFormat()
+    array.addColumn(InternalName.getVertex(), 3, GeomEnums.NT_float32, GeomEnums.C_point)
+    array.addColumn(InternalName.getSize(), 1, GeomEnums.NT_float32, GeomEnums.C_other)
+    array.addColumn(InternalName.getColor(), 4, GeomEnums.NT_uint8, GeomEnums.C_color)
+    return GeomVertexFormat.registerFormat(array)
+
+def disc_texture(resolution: int = SPRITE_RESOLUTION) -> PandaTexture:
+    """
+    Returns a white disc on a transparent background, so each square sprite draws round.
+    """
+    image = PNMImage(resolution, resolution, 4)
+    image.fill(1, 1, 1)
+    centre = (resolution - 1) / 2
+    for x in range(resolution):
+        for y in range(resolution):
+            inside = (x - centre) ** 2 + (y - centre) ** 2 <= (resolution / 2) ** 2
+            image.setAlpha(x, y, 1.0 if inside else 0.0)
+    texture = PandaTexture('projectile_disc')
+    texture.load(image)
+    return texture
+
+class ProjectileBatch(Entity):
+    """
+    Draws any number of projectiles as one point-sprite mesh: one draw call, one node. Each
+    projectile is a single vertex with its own size and color; Panda3D expands the points into
+    camera-facing squares sized in world units, and a disc texture rounds them off, so a sprite
+    looks the same as the flat-shaded sphere a projectile entity would draw. Vertices are
+    rewritten in place from a flat buffer every frame.
+    """
+
+    def __init__(self, capacity: int = 256, **kwargs) -> None:
+        """
+        Args:
+            capacity (int): The initial number of vertices. The buffer doubles when full. Defaults to 256.
+            **kwargs: Additional arguments passed to the Entity constructor.
+        """
+        super().__init__(**kwargs)
+        self.vertices = np.zeros(capacity, dtype=VERTEX_DTYPE)
+        self.vertex_data = GeomVertexData('projectiles', vertex_format(), GeomEnums.UH_dynamic)
+        self.points = GeomPoints(GeomEnums.UH_dynamic)
+        geom = Geom(self.vertex_data)
+        geom.addPrimitive(self.points)
+        node = GeomNode('projectile_batch')
+        node.addGeom(geom)
+        node.setBounds(OmniBoundingVolume())  # Projectiles fly everywhere; skip recomputing bounds
+        node.setFinal(True)
+        self.mesh = self.attachNewNode(node)
+
+        self.mesh.setRenderModePerspective(True)  # Sizes are in world units, not pixels
+        self.mesh.setTexGen(TextureStage.getDefault(), TexGenAttrib.MPointSprite)
+        self.mesh.setTexture(disc_texture(), 1)
+        self.mesh.setTransparency(TransparencyAttrib.MBinary)
+        self.mesh.setLightOff(1)
+        self.mesh.setShaderOff(1)
+        self.count: int = 0
+
+    def draw(self, positions: np.ndarray, sizes: np.ndarray, colors: np.ndarray) -> None:
+        """
+        Replaces the drawn projectiles.
+
+        Args:
+            positions (np.ndarray): (n, 3) world positions.
+            sizes (np.ndarray): (n,) diameters in world units.
+            colors (np.ndarray): (n, 4) RGBA colors, 0 to 255.
+        """
+        n = len(positions)
+        if n > len(self.vertices):
+            self.vertices = np.zeros(max(n, len(self.vertices) * 2), dtype=VERTEX_DTYPE)
+        vertices = self.vertices[:n]
+        vertices['position'] = positions
+        vertices['size'] = sizes * 0.5  # Perspective points extend `size` either side of the vertex
+        vertices['color'] = colors
+
+        if n != self.count:
+            self.vertex_data.setNumRows(n)
+            self.points.clearVertices()
+            if n:
+                self.points.addConsecutiveVertices(0, n)
+            self.count = n
+        if n:
+            memoryview(self.vertex_data.modifyArray(0)).cast('B')[:] = vertices.tobytes()
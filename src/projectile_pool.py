@@ -0,0 +1,135 @@
+import sys
+import os
+
+# Add the src directory to the system path to allow imports from the src package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.enums.overflow_policy import OverflowPolicy
+
+class ProjectilePool:
+    """
+    A fixed-capacity pool of projectile entities. Entities are pre-allocated, disabled while
+    idle and reset on reuse, so firing does not create and destroy Panda3D nodes and colliders.
+    """
+
+    def __init__(self, factory, capacity: int = 64, overflow: OverflowPolicy = OverflowPolicy.GROW) -> None:
+        """
+        Initializes an empty pool. Nothing is allocated until prewarm() or the first acquire().
+
+        Args:
+            factory (callable): Creates a new projectile. The projectile must provide reset(**kwargs).
+            capacity (int): The number of projectiles to pre-allocate. Defaults to 64.
+            overflow (OverflowPolicy): What to do when every projectile is in use. Defaults to GROW.
+        """
+        self.factory = factory
+        self.capacity: int = capacity
+        self.overflow: OverflowPolicy = overflow
+
+        self.free: list = []
+        self.active: dict = {}  # Insertion-ordered, so the first key is the oldest live projectile
+        self.allocated: int = 0
+
+        # Counters
+        self.hits: int = 0  # Acquires served from the free list
+        self.misses: int = 0  # Acquires that found the free list empty
+        self.dropped: int = 0  # Acquires refused by the DROP policy
+        self.recycled: int = 0  # Live projectiles reclaimed by the RECYCLE_OLDEST policy
+        self.high_water: int = 0  # Most projectiles live at once
+
+    def prewarm(self) -> None:
+        """
+        Allocates projectiles up to the pool's capacity and parks them disabled on the free list.
+        Must be called after the Ursina app has been created.
+        """
+        while self.allocated < self.capacity:
+            entity = self._create()
+            self._deactivate(entity)
+            self.free.append(entity)
+
+    def acquire(self, **kwargs):
+        """
+        Takes a projectile from the pool, enables it and resets it with the given arguments.
+
+        Args:
+            **kwargs: Arguments passed to the projectile's reset() method.
+
+        Returns:
+            The projectile, or None if the pool is full and the overflow policy is DROP.
+        """
+        if self.free:
+            entity = self.free.pop()
+            self.hits += 1
+        else:
+            self.misses += 1
+            if self.allocated < self.capacity or self.overflow == OverflowPolicy.GROW:
+                entity = self._create()
+            elif self.overflow == OverflowPolicy.RECYCLE_OLDEST and self.active:
+                entity = next(iter(self.active))
+                del self.active[entity]
+                self.recycled += 1
+            else:
+                self.dropped += 1
+                return None
+
+        self.active[entity] = None
+        self.high_water = max(self.high_water, len(self.active))
+        entity.enabled = True
+        entity.reset(**kwargs)
+        return entity
+
+    def release(self, entity) -> None:
+        """
+        Returns a live projectile to the pool and disables it. Releasing a projectile that is
+        not live (for example twice in the same frame) does nothing.
+
+        Args:
+            entity: The projectile to return.
+        """
+        if entity not in self.active:
+            return
+
+        del self.active[entity]
+        self._deactivate(entity)
+        self.free.append(entity)
+
+    def discard(self, entity) -> None:
+        """
+        Forgets a projectile that was destroyed outside the pool so it is never handed out again.
+
+        Args:
+            entity: The destroyed projectile.
+        """
+        if entity in self.active:
+            del self.active[entity]
+        elif entity in self.free:
+            self.free.remove(entity)
+        else:
+            return
+        self.allocated -= 1
+
+    def stats(self) -> dict:
+        """
+        Returns the pool's occupancy and counters.
+        """
+        return {
+            'capacity': self.capacity,
+            'allocated': self.allocated,
+            'active': len(self.active),
+            'free': len(self.free),
+            'hits': self.hits,
+            'misses': self.misses,
+            'dropped': self.dropped,
+            'recycled': self.recycled,
+            'high_water': self.high_water,
+        }
+
+    def _create(self):
+        entity = self.factory()
+        entity.pool = self
+        self.allocated += 1
+        return entity
+
+    def _deactivate(self, entity) -> None:
+        entity.enabled = False
+        if hasattr(entity, 'on_release'):
+            entity.on_release()
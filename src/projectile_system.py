@@ -0,0 +1,291 @@
+from ursina import *
+import sys
+import os
+import numpy as np
+
+# Add the src directory to the system path to allow imports from the src package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.enums.collision_layer import CollisionLayer
+from src.spatial_hash import collision_grid
+from src.swept_collision import segment_aabb_times, segment_sphere_times
+from src.frame_profiler import profiled
+from src.event_log import event_log
+from src.projectile_batch import ProjectileBatch
+from src.simulation_loop import SimulationLoop
+
+BATCHED_RENDERING = True  # Whether the shared system draws projectiles as one mesh
+
+class ProjectileSystem(Entity):
+    """
+    Moves every live projectile in one vectorized step per simulation step. Positions, directions,
+    speeds, damage, owners, time-to-live and range are kept in struct-of-arrays NumPy buffers indexed
+    by slot; the projectile entities themselves are only used for rendering and collision queries,
+    and are drawn between their last two simulated positions once per frame. Hits are swept from
+    each projectile's previous to current position so fast bullets cannot tunnel through targets
+    between steps.
+
+    In batched mode the projectile entities have no model and are never moved: every live
+    projectile is drawn by one ProjectileBatch mesh instead, so heavy fire costs one draw call.
+    """
+    _instance = None  # Holds the shared ProjectileSystem
+
+    @classmethod
+    def instance(cls) -> 'ProjectileSystem':
+        """
+        Returns the shared ProjectileSystem, creating it on first use. Must be called after the
+        Ursina app has been created.
+        """
+        if cls._instance is None:
+            cls._instance = cls(batched=BATCHED_RENDERING)
+        return cls._instance
+
+    def __init__(self, capacity: int = 256, batched: bool = False, **kwargs) -> None:
+        """
+        Initializes empty projectile buffers.
+
+        Args:
+            capacity (int): The initial number of slots. The buffers double when full. Defaults to 256.
+            batched (bool): Draw all projectiles as one mesh instead of moving each entity. Defaults to False.
+            **kwargs: Additional arguments passed to the Entity constructor.
+        """
+        super().__init__(eternal=True, **kwargs)
+        SimulationLoop.instance().register(self)
+        self.batched = batched
+        self.batch = ProjectileBatch(parent=self, capacity=capacity) if batched else None
+        self.count: int = 0
+        self.capacity: int = 0
+        self.entities: list = []  # slot -> projectile entity
+        self.anchors: list = []  # Entities that projectiles measure their range against
+        self.max_step: float = 0.0  # Furthest any projectile moved during the last step
+        self.allocate(capacity)
+
+    def allocate(self, capacity: int) -> None:
+        """
+        Resizes the buffers to the given number of slots, keeping live projectiles.
+
+        Args:
+            capacity (int): The new number of slots. Must be at least the live count.
+        """
+        def resized(old, shape, dtype):
+            new = np.zeros(shape, dtype=dtype)
+            if old is not None:
+                new[:self.count] = old[:self.count]
+            return new
+
+        self.positions = resized(getattr(self, 'positions', None), (capacity, 3), np.float32)
+        self.previous_positions = resized(getattr(self, 'previous_positions', None), (capacity, 3), np.float32)
+        self.directions = resized(getattr(self, 'directions', None), (capacity, 3), np.float32)
+        self.cells = resized(getattr(self, 'cells', None), (capacity, 3), np.int32)
+        self.speeds = resized(getattr(self, 'speeds', None), capacity, np.float32)
+        self.damages = resized(getattr(self, 'damages', None), capacity, np.int32)
+        self.owners = resized(getattr(self, 'owners', None), capacity, np.uint8)
+        self.ttls = resized(getattr(self, 'ttls', None), capacity, np.float32)
+        self.ranges = resized(getattr(self, 'ranges', None), capacity, np.float32)
+        self.anchor_ids = resized(getattr(self, 'anchor_ids', None), capacity, np.int32)
+        self.sizes = resized(getattr(self, 'sizes', None), capacity, np.float32)
+        self.colors = resized(getattr(self, 'colors', None), (capacity, 4), np.uint8)
+        self.capacity = capacity
+
+    def spawn(self, entity, position, direction, speed: float, damage: int, owner: CollisionLayer,
+              ttl: float, max_range: float, anchor, size: float = 0.1, color=(1, 0, 0, 1)) -> None:
+        """
+        Adds a projectile to the buffers. Spawning a projectile that is already live re-launches it.
+
+        Args:
+            entity (Entity): The projectile entity to drive.
+            position (Vec3): The starting position.
+            direction (Vec3): The normalized direction of travel.
+            speed (float): The speed in units per second.
+            damage (int): The damage dealt on hit.
+            owner (CollisionLayer): The projectile's collision layer.
+            ttl (float): Seconds before the projectile despawns.
+            max_range (float): The distance from the anchor at which the projectile despawns.
+            anchor (Entity): The entity range is measured against; its target, for enemy bullets.
+            size (float): The drawn diameter, in batched mode.
+            color (Color): The drawn color, in batched mode.
+        """
+        if getattr(entity, 'slot', None) is not None:
+            self.remove(entity)
+        if self.count == self.capacity:
+            self.allocate(self.capacity * 2)
+
+        i = self.count
+        self.positions[i] = (position[0], position[1], position[2])
+        self.previous_positions[i] = self.positions[i]
+        self.directions[i] = (direction[0], direction[1], direction[2])
+        self.cells[i] = collision_grid.cell_of(position)
+        self.speeds[i] = speed
+        self.damages[i] = damage
+        self.owners[i] = owner
+        self.ttls[i] = ttl
+        self.ranges[i] = max_range
+        self.anchor_ids[i] = self.anchor_id(anchor)
+        self.sizes[i] = size
+        self.colors[i] = [round(c * 255) for c in color]
+
+        self.entities.append(entity)
+        entity.slot = i
+        self.count += 1
+
+    def remove(self, entity) -> None:
+        """
+        Removes a projectile from the buffers by moving the last live slot into its place.
+        Removing a projectile that is not live does nothing.
+
+        Args:
+            entity (Entity): The projectile entity to remove.
+        """
+        i = getattr(entity, 'slot', None)
+        if i is None:
+            return
+
+        last = self.count - 1
+        if i != last:
+            for buffer in (self.positions, self.previous_positions, self.directions, self.cells, self.speeds, self.damages,
+                           self.owners, self.ttls, self.ranges, self.anchor_ids, self.sizes, self.colors):
+                buffer[i] = buffer[last]
+            moved = self.entities[last]
+            self.entities[i] = moved
+            moved.slot = i
+
+        self.entities.pop()
+        self.count -= 1
+        entity.slot = None
+
+    def anchor_id(self, anchor) -> int:
+        """
+        Returns the index of an anchor entity, registering it if it is new.
+
+        Args:
+            anchor (Entity): The entity projectiles measure their range against.
+        """
+        for i, known in enumerate(self.anchors):
+            if known is anchor:
+                return i
+        self.anchors.append(anchor)
+        return len(self.anchors) - 1
+
+    @profiled('ProjectileSystem.fixed_update')
+    def fixed_update(self, dt: float) -> None:
+        """
+        Advances, culls and hit-tests every live projectile in one batched step.
+
+        Args:
+            dt (float): The length of the step in seconds.
+        """
+        n = self.count
+        if n == 0:
+            self.anchors.clear()  # No slot refers to an anchor, so stale players can be dropped
+            return
+
+        positions = self.positions[:n]
+        self.previous_positions[:n] = positions
+        positions += self.directions[:n] * (self.speeds[:n] * dt)[:, None]
+        self.max_step = float(self.speeds[:n].max()) * dt
+        self.ttls[:n] -= dt
+
+        # Range check against each projectile's anchor; missing or disabled anchors cull everything using them
+        anchor_positions = np.array(
+            [tuple(a.world_position) if a and a.enabled else (np.nan, np.nan, np.nan) for a in self.anchors],
+            dtype=np.float32,
+        )
+        offsets = positions - anchor_positions[self.anchor_ids[:n]]
+        distances_sq = np.einsum('ij,ij->i', offsets, offsets)
+        expired = (self.ttls[:n] <= 0) | ~(distances_sq <= self.ranges[:n] ** 2)
+
+        # Re-bucket only the projectiles that changed grid cell; entities are drawn in interpolate()
+        entities = self.entities
+        cells = np.floor(positions / collision_grid.cell_size).astype(np.int32)
+        for i in np.flatnonzero((cells != self.cells[:n]).any(axis=1)).tolist():
+            collision_grid.update(entities[i], positions[i].tolist())
+        self.cells[:n] = cells
+
+        # Enemy bullets are swept against their target's box
+        targeted = np.flatnonzero(~expired & (self.owners[:n] == CollisionLayer.ENEMY_BULLET))
+        hits = []
+        if len(targeted):
+            half_extents = np.array(
+                [tuple(a.world_scale * 0.5) if a and a.enabled else (0, 0, 0) for a in self.anchors],
+                dtype=np.float32,
+            )
+            ids = self.anchor_ids[targeted]
+            times = segment_aabb_times(
+                self.previous_positions[targeted], positions[targeted],
+                anchor_positions[ids] - half_extents[ids], anchor_positions[ids] + half_extents[ids],
+            )
+            for i in targeted[np.isfinite(times)].tolist():
+                hits.append((entities[i], self.anchors[self.anchor_ids[i]], int(self.damages[i])))
+
+        # Despawn from the back so swap-removal never moves an unvisited slot
+        for i in np.flatnonzero(expired)[::-1].tolist():
+            entities[i].despawn()
+
+        for entity, target, damage in hits:
+            target.take_damage(damage)
+            entity.despawn()
+            event_log.debug('player_hit', damage=damage)
+
+    @profiled('ProjectileSystem.interpolate')
+    def interpolate(self, alpha: float) -> None:
+        """
+        Draws every live projectile `alpha` of a step past its previous simulated position.
+
+        Args:
+            alpha (float): How far between the last two simulation steps to draw, from 0 to 1.
+        """
+        n = self.count
+        if self.batched:
+            if n or self.batch.count:
+                previous = self.previous_positions[:n]
+                self.batch.draw(previous + (self.positions[:n] - previous) * alpha, self.sizes[:n], self.colors[:n])
+            return
+        if n == 0:
+            return
+
+        previous = self.previous_positions[:n]
+        drawn = previous + (self.positions[:n] - previous) * alpha
+        for entity, position in zip(self.entities, drawn.tolist()):
+            entity.setPos(*position)
+
+    def near(self, owner: CollisionLayer, mask: CollisionLayer, radius: float) -> list:
+        """
+        Returns the objects on the masked layers that any projectile of an owner passed within
+        `radius` of during the last step, each once. Lets targets be hit-tested only when a
+        projectile came close, instead of every target querying every step.
+
+        Args:
+            owner (CollisionLayer): The projectiles' layer, e.g. PLAYER_BULLET.
+            mask (CollisionLayer): The layers of the objects to find.
+            radius (float): How close a projectile has to pass, e.g. the largest target's radius.
+        """
+        n = self.count
+        found = {}
+        for i in np.flatnonzero(self.owners[:n] == owner).tolist():
+            start, end = self.previous_positions[i], self.positions[i]
+            reach = float(np.linalg.norm(end - start)) / 2 + radius
+            for obj in collision_grid.query(((start + end) / 2).tolist(), reach, mask):
+                found[obj] = None
+        return list(found)
+
+    def first_hit(self, candidates: list, center, radius: float):
+        """
+        Sweeps the given projectiles' last movement against a sphere and returns the one that
+        touched it first.
+
+        Args:
+            candidates (list): Live projectile entities, usually from a broadphase query.
+            center (Vec3): The centre of the target's bounding sphere.
+            radius (float): The radius of the target's bounding sphere.
+
+        Returns:
+            The projectile entity that hit first, or None.
+        """
+        live = [entity for entity in candidates if entity.slot is not None]
+        if not live:
+            return None
+
+        slots = [entity.slot for entity in live]
+        times = segment_sphere_times(self.previous_positions[slots], self.positions[slots], tuple(center), radius)
+        first = int(np.argmin(times))
+        return live[first] if np.isfinite(times[first]) else None
@@ -0,0 +1,286 @@
+from ursina import *
+import sys
+import os
+import struct
+import atexit
+import zlib
+from math import isnan
+import time as wall_time
+import numpy as np
+from panda3d.core import ClockObject
+
+# Add the src directory to the system path to allow imports from the src package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.enums.game_state import GameState
+from src.enums.spawn_pattern import SpawnPattern
+from src.simulation_loop import ManualClock, SimulationLoop
+from src.snapshot import write_atomic
+from src.event_log import event_log
+from src.rng import rng
+
+REPLAY_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'replays', 'last.replay'))
+REPLAY_MAGIC = b'RPLY'
+REPLAY_VERSION = 1
+REPLAY_KEYS = ('w', 'a', 's', 'd', 'space', 'left mouse')  # The held keys the game polls, one bit each
+PATTERNS = tuple(SpawnPattern)  # Spawn patterns by their number in the file
+
+# Layout, little-endian throughout: header, then zlib-compressed run record, result record and
+# one record per frame. zlib's own checksum catches damage
+HEADER = struct.Struct('<4sH')  # magic, version
+RUN = struct.Struct('<qdddBiI')  # seed, simulated time, step accumulator and clock when the run started
+                                 # (NaN before the loop's first update), spawn pattern, max health, frames
+RESULT = struct.Struct('<IiI3f')  # wave, health, kills and player position when the recording ended
+FRAME = struct.Struct('<ddffBH')  # dt, loop clock, mouse velocity (x, y), held keys, spawns built
+FRAME_DTYPE = np.dtype([
+    ('dt', '<f8'), ('clock', '<f8'), ('mouse', '<f4', 2), ('keys', 'u1'), ('spawns', '<u2'),
+])
+
+class ReplayError(ValueError):
+    """
+    Raised for data that is not an input recording, is damaged, or was written by another version.
+    """
+
+def pack_replay(recording: dict) -> bytes:
+    """
+    Packs an input recording into the binary format.
+
+    Args:
+        recording (dict): The run's seed, time, accumulator, clock, pattern, max health and result,
+            and its frames as a FRAME_DTYPE array, as unpack_replay() returns them.
+
+    Returns:
+        bytes: The packed recording.
+    """
+    frames = np.ascontiguousarray(recording['frames'], dtype=FRAME_DTYPE)
+    result = recording['result']
+    body = b''.join((
+        RUN.pack(recording['seed'], recording['time'], recording['accumulator'], recording['clock'],
+                 PATTERNS.index(recording['pattern']), recording['max_health'], len(frames)),
+        RESULT.pack(result['wave'], result['health'], result['kills'], *result['position']),
+        frames.tobytes(),
+    ))
+    return HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION) + zlib.compress(body)
+
+def unpack_replay(data: bytes) -> dict:
+    """
+    Unpacks an input recording packed by pack_replay().
+
+    Args:
+        data (bytes): The packed recording.
+
+    Returns:
+        dict: The recording, as InputReplay takes it.
+
+    Raises:
+        ReplayError: If the data is not a recording of this version or is damaged.
+    """
+    if len(data) < HEADER.size:
+        raise ReplayError('Recording is truncated')
+    magic, version = HEADER.unpack_from(data)
+    if magic != REPLAY_MAGIC:
+        raise ReplayError('Not an input recording')
+    if version != REPLAY_VERSION:
+        raise ReplayError(f"Unsupported recording version {version}, expected {REPLAY_VERSION}")
+    try:
+        body = zlib.decompress(memoryview(data)[HEADER.size:])
+    except zlib.error as error:
+        raise ReplayError(f"Recording is damaged: {error}") from None
+    if len(body) < RUN.size + RESULT.size:
+        raise ReplayError('Recording is truncated')
+
+    seed, run_time, accumulator, clock, pattern, max_health, frame_count = RUN.unpack_from(body)
+    wave, health, kills, *position = RESULT.unpack_from(body, RUN.size)
+    offset = RUN.size + RESULT.size
+    if pattern >= len(PATTERNS):
+        raise ReplayError(f"Unknown spawn pattern {pattern}")
+    if offset + frame_count * FRAME_DTYPE.itemsize != len(body):
+        raise ReplayError('Recording size does not match its frame count')
+    return {
+        'seed': seed,
+        'time': run_time,
+        'accumulator': accumulator,
+        'clock': clock,
+        'pattern': PATTERNS[pattern],
+        'max_health': max_health,
+        'frames': np.frombuffer(body, dtype=FRAME_DTYPE, count=frame_count, offset=offset),
+        'result': {'wave': wave, 'health': health, 'kills': kills, 'position': tuple(position)},
+    }
+
+def load_replay(path: str = REPLAY_PATH) -> dict:
+    """
+    Reads and unpacks an input recording, logging its size.
+
+    Args:
+        path (str): The recording. Defaults to the last one recorded.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ReplayError: If the file is not a recording of this version or is damaged.
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+    recording = unpack_replay(data)
+    event_log.info('replay_read', path=path, bytes=len(data), frames=len(recording['frames']))
+    return recording
+
+def run_result(game_manager) -> dict:
+    """
+    Returns what a replay is checked against: the wave, health, kills and the player's simulated
+    position.
+    """
+    state = game_manager.state_machine
+    player = game_manager.player
+    position = SimulationLoop.instance().simulated_position(player) if player else (0.0, 0.0, 0.0)
+    return {
+        'wave': game_manager.current_wave,
+        'health': state.player_health,
+        'kills': state.kills,
+        'position': tuple(np.float32(position).tolist()),
+    }
+
+class InputRecorder:
+    """
+    Records everything a run depends on besides its seed, one fixed-size record per frame: the
+    frame's dt and loop clock, the mouse velocity, the keys the game polls and how many queued
+    spawns the frame built (the spawn budget is wall-clock time). Frames are captured in a task
+    that runs right after Ursina's update, so they hold exactly what the frame's update saw.
+
+    Recording starts with each run the GameManager starts from wave 1 and is written out, zlib
+    compressed, when the player dies, when another run starts, or when the game exits. The file
+    is replaced each run, so it holds the last one.
+    """
+
+    def __init__(self, path: str = REPLAY_PATH) -> None:
+        """
+        Args:
+            path (str): The file to write. Defaults to replays/last.replay.
+        """
+        self.path = path
+        self.game_manager = None  # The game being recorded, while recording
+        self.run: dict = {}
+        self.frames = bytearray()
+        self.saved = None  # Size in bytes of the last recording written, for tests
+        atexit.register(self.stop)
+
+    @property
+    def recording(self) -> bool:
+        return self.game_manager is not None
+
+    def start(self, game_manager) -> None:
+        """
+        Starts recording a run that has just started, writing out any recording under way.
+
+        Args:
+            game_manager (GameManager): The game to record.
+        """
+        self.stop()
+        loop = SimulationLoop.instance()
+        self.game_manager = game_manager
+        self.run = {
+            'seed': rng.current_seed,
+            'time': loop.time,
+            'accumulator': loop.accumulator,
+            'clock': float('nan') if loop.last_clock is None else loop.last_clock,
+            'pattern': game_manager.spawn_pattern,
+            'max_health': game_manager.state_machine.max_health,
+        }
+        self.frames = bytearray()
+        taskMgr.add(self.capture, 'input-recorder', sort=1)  # After the update task
+
+    def capture(self, task):
+        manager = self.game_manager
+        keys = 0
+        for bit, key in enumerate(REPLAY_KEYS):
+            if held_keys[key]:
+                keys |= 1 << bit
+        velocity = mouse.velocity
+        self.frames += FRAME.pack(time.dt, SimulationLoop.instance().clock(), velocity[0], velocity[1], keys,
+                                  manager.spawn_queue.built)
+        if manager.state_machine.game_state == GameState.GAME_OVER:
+            self.stop()
+            return task.done
+        return task.cont
+
+    def stop(self) -> int:
+        """
+        Ends the recording and writes it out. Stopping when not recording does nothing.
+
+        Returns:
+            int: The size of the recording in bytes, or None if nothing was being recorded.
+        """
+        taskMgr.remove('input-recorder')
+        if not self.recording:
+            return None
+        manager, self.game_manager = self.game_manager, None
+
+        start = wall_time.perf_counter()
+        frames = np.frombuffer(bytes(self.frames), dtype=FRAME_DTYPE)
+        data = pack_replay(dict(self.run, frames=frames, result=run_result(manager)))
+        write_atomic(self.path, data)
+        self.saved = len(data)
+        event_log.info('replay_saved', path=self.path, seed=self.run['seed'], frames=len(frames), bytes=len(data),
+                       write_ms=round((wall_time.perf_counter() - start) * 1000, 3))
+        return len(data)
+
+class InputReplay:
+    """
+    Plays a recording back into a headless game. The run is started from the recorded seed and
+    the simulation loop's recorded state, and before each frame the recorded dt, loop clock,
+    keys, mouse velocity and spawn count are put in place, so every update sees what it saw
+    when the run was recorded. Frames go as fast as the simulation allows.
+
+    Takes the place of an InputScript in HeadlessGame.run().
+    """
+
+    def __init__(self, recording: dict) -> None:
+        """
+        Args:
+            recording (dict): What load_replay() returns.
+        """
+        self.recording = recording
+        self.frames = recording['frames']
+        self.clock = ManualClock()
+        self.game_manager = None
+
+    def prepare(self, game_manager) -> None:
+        """
+        Sets the game up to start the recorded run: its seed, spawn pattern, the player's max
+        health and the simulation loop's state. Call before starting the run.
+
+        Args:
+            game_manager (GameManager): The game to replay into.
+        """
+        recording = self.recording
+        self.game_manager = game_manager
+        game_manager.seed = recording['seed']
+        game_manager.spawn_pattern = recording['pattern']
+        game_manager.state_machine.max_health = recording['max_health']
+
+        loop = SimulationLoop.instance()
+        loop.set_clock(self.clock)
+        loop.time = recording['time']
+        loop.accumulator = recording['accumulator']
+        loop.last_clock = None if isnan(recording['clock']) else recording['clock']
+        globalClock.setMode(ClockObject.MNonRealTime)
+
+    def apply(self, frame: int) -> None:
+        """
+        Puts a recorded frame's input in place before the frame runs.
+        """
+        record = self.frames[frame]
+        globalClock.setDt(float(record['dt']))
+        self.clock.now = float(record['clock'])
+        keys = int(record['keys'])
+        for bit, key in enumerate(REPLAY_KEYS):
+            held_keys[key] = (keys >> bit) & 1
+        mouse.velocity = Vec3(float(record['mouse'][0]), float(record['mouse'][1]), 0)
+        self.game_manager.spawn_queue.quota = int(record['spawns'])
+
+    def mismatches(self) -> list:
+        """
+        Returns what differs between the end of the replay and the end of the recording, e.g.
+        ['kills: 41 != 40'], or an empty list when the replay matched.
+        """
+        replayed, recorded = run_result(self.game_manager), self.recording['result']
+        return [f"{key}: {replayed[key]} != {recorded[key]}" for key in recorded if replayed[key] != recorded[key]]
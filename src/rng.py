@@ -0,0 +1,50 @@
+import sys
+import os
+import random
+
+# Add the src directory to the system path to allow imports from the src package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+class RandomStreams:
+    """
+    Independent random number generators for the game's systems, all derived from one run seed.
+    Each system draws from its own named stream, so the numbers one system gets do not depend
+    on how many another has drawn, and a run started with the same seed gets the same numbers.
+    Nothing in the game should use the random module's shared generator.
+    """
+
+    def __init__(self, seed: int = None) -> None:
+        """
+        Args:
+            seed (int): The run seed, or None for a fresh one.
+        """
+        self.streams: dict = {}  # name -> random.Random
+        self.seed(seed)
+
+    def seed(self, seed: int = None) -> int:
+        """
+        Restarts every stream from a run seed.
+
+        Args:
+            seed (int): The run seed, or None to pick a fresh one.
+
+        Returns:
+            int: The seed used, so a run started without one can be repeated.
+        """
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(63)
+        self.current_seed = seed
+        self.streams.clear()
+        return seed
+
+    def stream(self, name: str) -> random.Random:
+        """
+        Returns the generator for a system, e.g. 'enemy' or 'spawn', creating it on first use.
+        """
+        stream = self.streams.get(name)
+        if stream is None:
+            stream = self.streams[name] = random.Random(f"{self.current_seed}:{name}")
+        return stream
+
+# Shared streams, seeded by the GameManager at the start of each run
+rng = RandomStreams()
@@ -0,0 +1,238 @@
+from ursina import *
+import sys
+import os
+import time as wall_time
+
+# Add the src directory to the system path to allow imports from the src package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.frame_profiler import profiled
+
+SIMULATION_RATE = 120  # Simulation steps per second
+MAX_STEPS_PER_FRAME = 8  # Beyond this the simulation falls behind instead of spiralling
+
+class ManualClock:
+    """
+    A clock that only moves when told to, for driving the simulation from tests and tools
+    instead of the frame clock.
+    """
+
+    def __init__(self, start: float = 0.0) -> None:
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+def frame_clock() -> float:
+    """
+    Returns Panda3D's frame time: real time in a window, fixed increments in headless runs.
+    """
+    return globalClock.getFrameTime()
+
+class SimulationLoop(Entity):
+    """
+    Runs the game simulation at a fixed rate, independent of the frame rate. Each frame, the time
+    elapsed on the clock is added to an accumulator and consumed in fixed steps; every registered
+    entity with a fixed_update(dt) method is stepped, in the order they were registered, with the
+    same dt every time. Whatever is left over becomes `alpha`, the fraction of a step that
+    rendering is ahead of the simulation.
+
+    Tracked entities are drawn between their last two simulated positions at `alpha`, so motion
+    stays smooth when the frame rate and simulation rate differ. Before the next step their exact
+    simulated position is restored, so the simulation never sees an interpolated state.
+    Systems that keep positions in their own arrays register to interpolate themselves in
+    interpolate(alpha).
+
+    Cooldowns and timers should read `time` (simulated seconds) rather than the wall clock.
+    """
+    _instance = None  # Holds the shared SimulationLoop
+
+    @classmethod
+    def instance(cls) -> 'SimulationLoop':
+        """
+        Returns the shared SimulationLoop, creating it on first use.
+        """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, rate: int = SIMULATION_RATE, clock=frame_clock, **kwargs) -> None:
+        """
+        Args:
+            rate (int): Simulation steps per second. Defaults to 120.
+            clock (callable): Returns the current time in seconds. Defaults to the frame clock.
+            **kwargs: Additional arguments passed to the Entity constructor. The loop is eternal unless
+                eternal=False is given.
+        """
+        kwargs.setdefault('eternal', True)
+        super().__init__(**kwargs)
+        self.step = 1 / rate
+        self.clock = clock
+        self.time: float = 0.0  # Simulated seconds
+        self.steps: int = 0  # Steps run since creation
+        self.accumulator: float = 0.0
+        self.alpha: float = 0.0
+        self.last_clock = None
+        self.tracked: dict = {}  # entity -> [previous position, simulated position, drawn position]
+        self.stepped: dict = {}  # Registered entities with fixed_update, in registration order
+        self.interpolated: dict = {}  # Registered entities with interpolate, in registration order
+        self.timings = None  # class name -> seconds in fixed_update, while timing is on
+
+    def set_clock(self, clock) -> None:
+        """
+        Switches the clock the loop follows. Time already accumulated is kept.
+
+        Args:
+            clock (callable): Returns the current time in seconds.
+        """
+        self.clock = clock
+        self.last_clock = None
+
+    def time_systems(self, enabled: bool = True) -> None:
+        """
+        Starts (or stops) adding up the time each class of entity spends in fixed_update.
+        Starting clears previous totals.
+
+        Args:
+            enabled (bool): Whether to time fixed updates.
+        """
+        self.timings = {} if enabled else None
+
+    def register(self, entity) -> None:
+        """
+        Starts stepping an entity's fixed_update(dt) and calling its interpolate(alpha) each frame,
+        whichever of the two it has. Entities are stepped in the order they were registered.
+
+        Args:
+            entity (Entity): The entity; it should unregister itself when destroyed.
+        """
+        if hasattr(entity, 'fixed_update'):
+            self.stepped[entity] = None
+        if hasattr(entity, 'interpolate'):
+            self.interpolated[entity] = None
+
+    def unregister(self, entity) -> None:
+        """
+        Stops stepping and interpolating an entity. Unregistering an entity that is not registered
+        does nothing.
+
+        Args:
+            entity (Entity): The entity to stop stepping.
+        """
+        self.stepped.pop(entity, None)
+        self.interpolated.pop(entity, None)
+
+    def track(self, entity) -> None:
+        """
+        Starts interpolating an entity's position between simulation steps.
+
+        Args:
+            entity (Entity): An entity moved by fixed_update.
+        """
+        position = tuple(entity.getPos())
+        self.tracked[entity] = [position, position, position]
+
+    def simulated_position(self, entity) -> tuple:
+        """
+        Returns where an entity is in the simulation, rather than where it is drawn between steps.
+
+        Args:
+            entity (Entity): Any entity; untracked ones are where they are.
+        """
+        state = self.tracked.get(entity)
+        position = tuple(entity.getPos())
+        if state is None or position != state[2]:  # Untracked, or moved outside the simulation
+            return position
+        return state[1]
+
+    def untrack(self, entity) -> None:
+        """
+        Stops interpolating an entity. Untracking an entity that is not tracked does nothing.
+
+        Args:
+            entity (Entity): The entity to stop tracking.
+        """
+        self.tracked.pop(entity, None)
+
+    @profiled('SimulationLoop.update')
+    def update(self) -> None:
+        """
+        Runs as many fixed steps as the elapsed time allows, then interpolates for drawing.
+        """
+        now = self.clock()
+        if self.last_clock is None:
+            self.last_clock = now
+        self.accumulator = min(self.accumulator + now - self.last_clock, self.step * MAX_STEPS_PER_FRAME)
+        self.last_clock = now
+
+        self.restore()
+        while self.accumulator >= self.step:
+            self.advance()
+            self.accumulator -= self.step
+
+        self.alpha = self.accumulator / self.step
+        self.interpolate(self.alpha)
+
+    def advance(self) -> None:
+        """
+        Runs a single fixed step, whatever the clock says.
+        """
+        for entity, state in self.tracked.items():
+            state[0] = tuple(entity.getPos())
+
+        timings = self.timings
+        for entity in tuple(self.stepped):  # A step may destroy an entity and unregister it
+            if not entity.enabled or entity.ignore or entity.has_disabled_ancestor():
+                continue
+            if application.paused and entity.ignore_paused is False:
+                continue
+            if timings is None:
+                entity.fixed_update(self.step)
+            else:
+                start = wall_time.perf_counter()
+                entity.fixed_update(self.step)
+                name = type(entity).__name__
+                timings[name] = timings.get(name, 0.0) + wall_time.perf_counter() - start
+
+        self.time += self.step
+        self.steps += 1
+
+        for entity, state in self.tracked.items():
+            state[1] = tuple(entity.getPos())
+
+    def restore(self) -> None:
+        """
+        Puts tracked entities back at their simulated positions. An entity that was moved since it
+        was last drawn (spawned, teleported or reset outside the simulation) keeps its new position
+        and is not interpolated from the old one.
+        """
+        for entity, state in self.tracked.items():
+            position = tuple(entity.getPos())
+            if position != state[2]:
+                state[0] = state[1] = position
+            else:
+                entity.setPos(*state[1])
+
+    def interpolate(self, alpha: float) -> None:
+        """
+        Draws tracked entities, and lets systems draw theirs, `alpha` of a step past the previous
+        simulated state.
+
+        Args:
+            alpha (float): How far between the last two simulation steps to draw, from 0 to 1.
+        """
+        for entity, state in self.tracked.items():
+            previous, current = state[0], state[1]
+            if previous == current:
+                drawn = current
+            else:
+                entity.setPos(*(p + (c - p) * alpha for p, c in zip(previous, current)))
+                drawn = tuple(entity.getPos())
+            state[2] = drawn
+
+        for entity in self.interpolated:
+            if entity.enabled:
+                entity.interpolate(alpha)
@@ -0,0 +1,225 @@
+import sys
+import os
+import queue
+import struct
+import threading
+import atexit
+import zlib
+import time as wall_time
+import numpy as np
+
+# Add the src directory to the system path to allow imports from the src package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.event_log import event_log
+
+SNAPSHOT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'saves', 'autosave.snap'))
+SNAPSHOT_MAGIC = b'SNAP'
+SNAPSHOT_VERSION = 1
+
+# Layout, little-endian throughout: header, game record, enemy records, queued spawn positions,
+# then a CRC-32 of everything before it
+HEADER = struct.Struct('<4sH')  # magic, version
+GAME = struct.Struct('<IiiI3f3f2f3f?II')  # wave, health, max health, kills, player position, rotation,
+                                          # look (pitch, yaw), velocity, grounded, enemies, queued spawns
+CHECKSUM = struct.Struct('<I')
+ENEMY_DTYPE = np.dtype([
+    ('position', '<f4', 3), ('velocity', '<f4', 3), ('heading', '<f4'),
+    ('health', '<i4'), ('max_health', '<i4'), ('since_shot', '<f4'),
+    ('size', 'u1'), ('speed', 'u1'), ('hover_height', 'u1'), ('friction', '<f4'),
+])
+SPAWN_DTYPE = np.dtype(('<f4', 3))
+
+class SnapshotError(ValueError):
+    """
+    Raised for data that is not a snapshot, is damaged, or was written by another version.
+    """
+
+def pack_snapshot(snapshot: dict) -> bytes:
+    """
+    Packs a snapshot into the binary format.
+
+    Args:
+        snapshot (dict): What GameManager.snapshot() returns.
+
+    Returns:
+        bytes: The packed snapshot.
+    """
+    player = snapshot['player']
+    enemies = np.ascontiguousarray(snapshot['enemies'], dtype=ENEMY_DTYPE)
+    spawns = np.ascontiguousarray(snapshot['spawns'], dtype=np.float32).reshape(-1, 3)
+    data = b''.join((
+        HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION),
+        GAME.pack(snapshot['wave'], snapshot['health'], snapshot['max_health'], snapshot['kills'],
+                  *player['position'], *player['rotation'], *player['look'], *player['velocity'], player['grounded'],
+                  len(enemies), len(spawns)),
+        enemies.tobytes(),
+        spawns.tobytes(),
+    ))
+    return data + CHECKSUM.pack(zlib.crc32(data))
+
+def unpack_snapshot(data: bytes) -> dict:
+    """
+    Unpacks a snapshot packed by pack_snapshot().
+
+    Args:
+        data (bytes): The packed snapshot.
+
+    Returns:
+        dict: The snapshot, as GameManager.restore() takes it.
+
+    Raises:
+        SnapshotError: If the data is not a snapshot of this version or is damaged.
+    """
+    if len(data) < HEADER.size + GAME.size + CHECKSUM.size:
+        raise SnapshotError('Snapshot is truncated')
+    magic, version = HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotError('Not a snapshot')
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {version}, expected {SNAPSHOT_VERSION}")
+    body = memoryview(data)[:-CHECKSUM.size]
+    if CHECKSUM.unpack_from(data, len(body))[0] != zlib.crc32(body):
+        raise SnapshotError('Snapshot checksum does not match')
+
+    fields = GAME.unpack_from(data, HEADER.size)
+    enemy_count, spawn_count = fields[-2:]
+    offset = HEADER.size + GAME.size
+    if offset + enemy_count * ENEMY_DTYPE.itemsize + spawn_count * SPAWN_DTYPE.itemsize != len(body):
+        raise SnapshotError('Snapshot size does not match its counts')
+    enemies = np.frombuffer(body, dtype=ENEMY_DTYPE, count=enemy_count, offset=offset)
+    spawns = np.frombuffer(body, dtype=SPAWN_DTYPE, count=spawn_count, offset=offset + enemies.nbytes)
+    return {
+        'wave': fields[0],
+        'health': fields[1],
+        'max_health': fields[2],
+        'kills': fields[3],
+        'player': {
+            'position': fields[4:7],
+            'rotation': fields[7:10],
+            'look': fields[10:12],
+            'velocity': fields[12:15],
+            'grounded': fields[15],
+        },
+        'enemies': enemies,
+        'spawns': spawns,
+    }
+
+def write_atomic(path: str, data: bytes) -> None:
+    """
+    Writes a file so that it is either the old file or the whole new one, even if the process
+    dies halfway: the data goes to a temporary file next to it, which is flushed to disk and
+    then renamed over it.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f"{path}.tmp"
+    with open(temporary, 'wb') as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+def load_snapshot(path: str = SNAPSHOT_PATH) -> dict:
+    """
+    Reads and unpacks a snapshot file, logging its size and how long it took.
+
+    Args:
+        path (str): The snapshot file. Defaults to the autosave.
+
+    Raises:
+        OSError: If the file cannot be read.
+        SnapshotError: If the file is not a snapshot of this version or is damaged.
+    """
+    start = wall_time.perf_counter()
+    with open(path, 'rb') as file:
+        data = file.read()
+    snapshot = unpack_snapshot(data)
+    event_log.info('snapshot_read', path=path, bytes=len(data), enemies=len(snapshot['enemies']),
+                   read_ms=round((wall_time.perf_counter() - start) * 1000, 3))
+    return snapshot
+
+class SnapshotWriter:
+    """
+    Saves snapshots without holding up the game. The game state is packed on the calling
+    thread, so the snapshot is of one moment, and a background thread writes it out with an
+    atomic rename: a crash mid-save leaves the previous snapshot in place. Saves queued while
+    one is being written are coalesced, so only the newest is written.
+    """
+    _instance = None  # Holds the shared SnapshotWriter
+
+    @classmethod
+    def instance(cls) -> 'SnapshotWriter':
+        """
+        Returns the shared SnapshotWriter, creating it on first use.
+        """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self) -> None:
+        self.queue = queue.SimpleQueue()
+        self.writer = None  # Started by the first save
+        self.saved: int = 0  # Snapshots written, for tests
+        atexit.register(self.close)
+
+    def save(self, snapshot: dict, path: str = SNAPSHOT_PATH) -> int:
+        """
+        Packs a snapshot now and queues it to be written.
+
+        Args:
+            snapshot (dict): What GameManager.snapshot() returns.
+            path (str): The file to write. Defaults to the autosave.
+
+        Returns:
+            int: The size of the packed snapshot in bytes.
+        """
+        start = wall_time.perf_counter()
+        data = pack_snapshot(snapshot)
+        pack_ms = (wall_time.perf_counter() - start) * 1000
+        if self.writer is None:
+            self.writer = threading.Thread(target=self.drain, name='snapshot-writer', daemon=True)
+            self.writer.start()
+        self.queue.put((path, data, snapshot['wave'], pack_ms))
+        return len(data)
+
+    def drain(self) -> None:
+        """
+        Writes queued snapshots until close() is called. Runs on the writer thread.
+        """
+        while True:
+            saves = [self.queue.get()]
+            while True:
+                try:
+                    saves.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            latest = {}  # path -> newest save queued for it
+            for save in saves:
+                if save is not None:
+                    latest[save[0]] = save
+            for path, data, wave, pack_ms in latest.values():
+                start = wall_time.perf_counter()
+                try:
+                    write_atomic(path, data)
+                except OSError as error:
+                    event_log.error('snapshot_failed', path=path, error=repr(error))
+                    continue
+                self.saved += 1
+                event_log.info('snapshot_saved', path=path, wave=wave, bytes=len(data), pack_ms=round(pack_ms, 3),
+                               write_ms=round((wall_time.perf_counter() - start) * 1000, 3))
+            if None in saves:
+                return
+
+    def close(self) -> None:
+        """
+        Writes out every queued snapshot and stops the writer thread. Saving afterwards starts
+        a new writer.
+        """
+        if self.writer is None:
+            return
+        self.queue.put(None)
+        self.writer.join()
+        self.writer = None
+
+snapshot_writer = SnapshotWriter.instance()
@@ -0,0 +1,153 @@
+import sys
+import os
+from math import floor
+
+# Add the src directory to the system path to allow imports from the src package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.enums.collision_layer import CollisionLayer
+
+class SpatialHash:
+    """
+    A uniform-grid spatial hash used as the collision broadphase. Objects register with a
+    collision layer and are re-bucketed whenever they move into a new cell, so a query only
+    has to look at the cells around a point instead of every entity in the scene.
+    """
+
+    def __init__(self, cell_size: float = 4.0) -> None:
+        """
+        Initializes an empty grid.
+
+        Args:
+            cell_size (float): The edge length of a grid cell in world units. Defaults to 4.
+        """
+        self.cell_size: float = cell_size
+        self.cells: dict = {}  # layer -> {cell: set of objects}
+        self.entries: dict = {}  # object -> (layer, cell)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, obj) -> bool:
+        return obj in self.entries
+
+    def cell_of(self, position) -> tuple:
+        """
+        Returns the integer cell coordinates containing the given position.
+
+        Args:
+            position (Vec3): The world position to hash.
+        """
+        size = self.cell_size
+        return (floor(position[0] / size), floor(position[1] / size), floor(position[2] / size))
+
+    def insert(self, obj, position, layer: CollisionLayer) -> None:
+        """
+        Registers an object on a collision layer at the given position. Inserting an object
+        that is already registered moves it instead.
+
+        Args:
+            obj: The object to register, usually an Entity.
+            position (Vec3): The object's current world position.
+            layer (CollisionLayer): The single layer the object belongs to.
+        """
+        if obj in self.entries:
+            self.remove(obj)
+
+        cell = self.cell_of(position)
+        self.cells.setdefault(layer, {}).setdefault(cell, set()).add(obj)
+        self.entries[obj] = (layer, cell)
+
+    def update(self, obj, position) -> None:
+        """
+        Moves a registered object to its new position, re-bucketing it only if it changed cell.
+        Objects that are not registered are ignored.
+
+        Args:
+            obj: The registered object.
+            position (Vec3): The object's new world position.
+        """
+        entry = self.entries.get(obj)
+        if entry is None:
+            return
+
+        layer, old_cell = entry
+        cell = self.cell_of(position)
+        if cell == old_cell:
+            return
+
+        layer_cells = self.cells[layer]
+        bucket = layer_cells[old_cell]
+        bucket.discard(obj)
+        if not bucket:
+            del layer_cells[old_cell]
+
+        layer_cells.setdefault(cell, set()).add(obj)
+        self.entries[obj] = (layer, cell)
+
+    def remove(self, obj) -> None:
+        """
+        Unregisters an object. Removing an object that is not registered does nothing.
+
+        Args:
+            obj: The object to remove.
+        """
+        entry = self.entries.pop(obj, None)
+        if entry is None:
+            return
+
+        layer, cell = entry
+        layer_cells = self.cells[layer]
+        bucket = layer_cells[cell]
+        bucket.discard(obj)
+        if not bucket:
+            del layer_cells[cell]
+
+    def query(self, position, radius: float, mask: CollisionLayer) -> list:
+        """
+        Returns every object on a layer in the mask whose cell overlaps the cube of half-size
+        `radius` around the position. This is a broadphase: callers still run their own
+        narrowphase test on the returned candidates.
+
+        Args:
+            position (Vec3): The centre of the query.
+            radius (float): The half-size of the query volume in world units.
+            mask (CollisionLayer): The layers to include in the result.
+        """
+        size = self.cell_size
+        min_x, max_x = floor((position[0] - radius) / size), floor((position[0] + radius) / size)
+        min_y, max_y = floor((position[1] - radius) / size), floor((position[1] + radius) / size)
+        min_z, max_z = floor((position[2] - radius) / size), floor((position[2] + radius) / size)
+        cells_in_range = (max_x - min_x + 1) * (max_y - min_y + 1) * (max_z - min_z + 1)
+
+        result = []
+        for layer, layer_cells in self.cells.items():
+            if not layer & mask:
+                continue
+
+            if cells_in_range <= len(layer_cells):
+                # Small query: probe each cell in range
+                for x in range(min_x, max_x + 1):
+                    for y in range(min_y, max_y + 1):
+                        for z in range(min_z, max_z + 1):
+                            bucket = layer_cells.get((x, y, z))
+                            if bucket:
+                                result.extend(bucket)
+            else:
+                # Large query relative to occupancy: walk the occupied cells instead
+                for (x, y, z), bucket in layer_cells.items():
+                    if min_x <= x <= max_x and min_y <= y <= max_y and min_z <= z <= max_z:
+                        result.extend(bucket)
+
+        return result
+
+    def clear(self) -> None:
+        """
+        Removes every registered object from the grid.
+        """
+        self.cells.clear()
+        self.entries.clear()
+
+
+# Shared broadphase grid that bullets and enemies register with
+collision_grid = SpatialHash()
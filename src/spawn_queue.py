@@ -0,0 +1,170 @@
+from ursina import *
+import sys
+import os
+import time as wall_time
+from collections import deque
+from math import cos, sin, tau
+
+# Add the src directory to the system path to allow imports from the src package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.enums.spawn_pattern import SpawnPattern
+from src.frame_profiler import profiled
+from src.event_log import event_log
+from src.rng import rng
+
+SPAWN_BUDGET_MS = 2.0  # Wall-clock milliseconds per frame spent constructing queued spawns
+LATENCY_HISTORY = 256  # Spawns kept for the latency statistics
+SPAWN_HEIGHT = 2
+LINE_SPACING = 5
+LINE_DISTANCE = 10
+RING_RADIUS = 20
+SCATTER_RADIUS = (15, 45)  # Inner and outer radius of the ring spawns are scattered over
+
+def spawn_positions(pattern: SpawnPattern, count: int, center=(0, 0, 0)) -> list:
+    """
+    Returns where each enemy of a wave appears.
+
+    Args:
+        pattern (SpawnPattern): LINE puts them in a row ahead of the centre, LINE_SPACING apart;
+            RING spaces them evenly on a circle around it, growing the circle for large waves;
+            SCATTER drops them at random between the two SCATTER_RADIUS circles, from the run's
+            'spawn' stream.
+        count (int): The number of positions.
+        center (Vec3): The point the pattern is laid out around.
+
+    Returns:
+        list: A Vec3 per enemy.
+    """
+    x, z = center[0], center[2]
+    if pattern == SpawnPattern.LINE:
+        return [Vec3(x + i * LINE_SPACING, SPAWN_HEIGHT, z + LINE_DISTANCE) for i in range(count)]
+    if pattern == SpawnPattern.RING:
+        radius = max(RING_RADIUS, count * LINE_SPACING / tau)  # Keep neighbours LINE_SPACING apart
+        return [
+            Vec3(x + cos(tau * i / count) * radius, SPAWN_HEIGHT, z + sin(tau * i / count) * radius)
+            for i in range(count)
+        ]
+    stream = rng.stream('spawn')
+    positions = []
+    for _ in range(count):
+        angle, radius = stream.uniform(0, tau), stream.uniform(*SCATTER_RADIUS)
+        positions.append(Vec3(x + cos(angle) * radius, SPAWN_HEIGHT, z + sin(angle) * radius))
+    return positions
+
+class SpawnQueue(Entity):
+    """
+    Spreads the construction of a wave over frames instead of building every enemy in the frame
+    the wave starts. Queued spawns are built in order, each frame, until the frame's time budget
+    is spent; at least one is built per frame so the queue always drains. An optional rate caps
+    spawns per simulated second on top of the budget.
+
+    The queue depth and how long each spawn waited, in frames and milliseconds, are kept for
+    stats(); each time the queue empties, the wave's spawn statistics are logged.
+
+    Since the budget is wall-clock time, how many spawns a frame builds depends on the machine.
+    An input recording keeps the count built each frame, and a replay sets `quota` before each
+    frame to build exactly as many again.
+    """
+
+    def __init__(self, spawn, budget_ms: float = SPAWN_BUDGET_MS, rate: float = None, on_drained=None,
+                 **kwargs) -> None:
+        """
+        Args:
+            spawn (callable): Called with each queued position; builds and returns the entity.
+            budget_ms (float): Wall-clock milliseconds per frame to spend spawning. Defaults to 2.
+            rate (float): The most spawns per second, or None for as many as the budget allows.
+            on_drained (callable): Called with no arguments each time the last queued spawn has been built.
+            **kwargs: Additional arguments passed to the Entity constructor.
+        """
+        super().__init__(**kwargs)
+        self.spawn = spawn
+        self.on_drained = on_drained
+        self.budget_ms = budget_ms
+        self.rate = rate
+        self.pending = deque()  # (position, wall time queued, frame queued)
+        self.allowance: float = 0.0  # Spawns the rate allows right now
+        self.frame: int = 0
+        self.spawned: int = 0  # Spawns built since the queue last emptied
+        self.built: int = 0  # Spawns built in the last update
+        self.quota = None  # Spawns the next update builds instead of what the budget allows, when replaying
+        self.latencies = deque(maxlen=LATENCY_HISTORY)  # (milliseconds, frames) waited per spawn
+
+    @property
+    def depth(self) -> int:
+        return len(self.pending)
+
+    def push(self, position) -> None:
+        """
+        Queues a spawn.
+
+        Args:
+            position (Vec3): Where the entity appears.
+        """
+        self.pending.append((position, wall_time.perf_counter(), self.frame))
+
+    def clear(self) -> None:
+        """
+        Drops every queued spawn.
+        """
+        self.pending.clear()
+        self.allowance = 0.0
+        self.spawned = 0
+
+    @profiled('SpawnQueue.update')
+    def update(self) -> None:
+        self.frame += 1
+        self.built = 0
+        quota, self.quota = self.quota, None
+        if not self.pending:
+            return
+        if self.rate is not None:
+            self.allowance = min(self.allowance + self.rate * time.dt, max(self.rate * time.dt, 1.0))
+        if quota is not None:
+            while self.pending and self.built < quota:
+                self.spawn_next()
+                self.built += 1
+            return
+
+        deadline = wall_time.perf_counter() + self.budget_ms / 1000
+        while self.pending:
+            if self.rate is not None and self.allowance < 1:
+                break
+            if self.built and wall_time.perf_counter() >= deadline:
+                break
+            self.spawn_next()
+            self.built += 1
+
+    def flush(self) -> None:
+        """
+        Builds every queued spawn now, ignoring the budget and rate.
+        """
+        while self.pending:
+            self.spawn_next()
+
+    def spawn_next(self) -> None:
+        position, queued_at, queued_frame = self.pending.popleft()
+        self.spawn(position)
+        self.spawned += 1
+        if self.rate is not None:
+            self.allowance -= 1
+        self.latencies.append(((wall_time.perf_counter() - queued_at) * 1000, self.frame - queued_frame))
+        if not self.pending:
+            event_log.info('spawn_queue_drained', **self.stats())
+            self.spawned = 0
+            if self.on_drained:
+                self.on_drained()
+
+    def stats(self) -> dict:
+        """
+        Returns the queue depth, spawns built since it last emptied and the mean and max time
+        recent spawns spent queued, in milliseconds and frames.
+        """
+        waits = self.latencies
+        return {
+            'depth': len(self.pending),
+            'spawned': self.spawned,
+            'latency_mean_ms': sum(ms for ms, _ in waits) / len(waits) if waits else 0.0,
+            'latency_max_ms': max((ms for ms, _ in waits), default=0.0),
+            'latency_max_frames': max((frames for _, frames in waits), default=0),
+        }
@@ -7,12 +7,18 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.enums.game_state import GameState
 from src.enums.player_state import PlayerState
+from src.enums.state_event import StateEvent
+from src.event_log import event_log
 
 class StateMachine:
     """
     Singleton class that manages the game's state, including the player's health, 
     kills, and the overall game state. It ensures that only one instance of 
     StateMachine exists and provides methods to modify the game state.
+
+    Health, kills and the game state are properties: setting one to a new value notifies the
+    callbacks subscribed to its StateEvent, so the UI and entities react to changes instead of
+    polling every frame. Setting the value it already has notifies no one.
     """
     _instance = None  # Holds the singleton instance of StateMachine
 
@@ -34,13 +40,77 @@ class StateMachine:
         Initializes the StateMachine with default values for the player's state, health,
         kills, and the overall game state.
         """
+        self.subscribers: dict = {event: {} for event in StateEvent}  # event -> {callback: None}, in subscription order
+        self._player_health: int = 100
+        self._max_health: int = 100
+        self._kills: int = 0
+        self._game_state: GameState = GameState.PLAYING
         self.state: PlayerState = PlayerState.ALIVE
-        self.player_health: int = 100
-        self.max_health: int = 100
-        self.kills: int = 0
-        self.game_state: GameState = GameState.PLAYING
         self.player = player
 
+    def subscribe(self, event: StateEvent, callback) -> None:
+        """
+        Calls `callback(value)` whenever the value behind an event changes.
+
+        Args:
+            event (StateEvent): The value to watch.
+            callback (callable): Called with the new value. Health callbacks get the health.
+        """
+        self.subscribers[event][callback] = None
+
+    def unsubscribe(self, event: StateEvent, callback) -> None:
+        """
+        Stops calling a callback. Unsubscribing a callback that is not subscribed does nothing.
+        """
+        self.subscribers[event].pop(callback, None)
+
+    def notify(self, event: StateEvent, value) -> None:
+        """
+        Calls every callback subscribed to an event with the new value.
+        """
+        for callback in list(self.subscribers[event]):  # Callbacks may unsubscribe themselves
+            callback(value)
+
+    @property
+    def player_health(self) -> int:
+        return self._player_health
+
+    @player_health.setter
+    def player_health(self, value: int) -> None:
+        if value != self._player_health:
+            self._player_health = value
+            self.notify(StateEvent.HEALTH, value)
+
+    @property
+    def max_health(self) -> int:
+        return self._max_health
+
+    @max_health.setter
+    def max_health(self, value: int) -> None:
+        if value != self._max_health:
+            self._max_health = value
+            self.notify(StateEvent.HEALTH, self._player_health)  # The health fraction changed
+
+    @property
+    def kills(self) -> int:
+        return self._kills
+
+    @kills.setter
+    def kills(self, value: int) -> None:
+        if value != self._kills:
+            self._kills = value
+            self.notify(StateEvent.KILLS, value)
+
+    @property
+    def game_state(self) -> GameState:
+        return self._game_state
+
+    @game_state.setter
+    def game_state(self, value: GameState) -> None:
+        if value != self._game_state:
+            self._game_state = value
+            self.notify(StateEvent.GAME_STATE, value)
+
     def change_state(self, new_state: PlayerState) -> None:
         """
         Changes the player's state to the provided new state if it is valid.
@@ -53,7 +123,7 @@ class StateMachine:
         """
         if isinstance(new_state, PlayerState):
             self.state = new_state
-            print(f"State changed to: {self.state.value}")
+            event_log.info('player_state', state=self.state.value)
         else:
             raise ValueError(f"Invalid state: {new_state}")
 
@@ -71,7 +141,7 @@ class StateMachine:
                 self.player_health = 0
                 self.change_state(PlayerState.DEAD)
                 self.game_state = GameState.GAME_OVER
-            print(f"Player health: {self.player_health}/{self.max_health}")
+            event_log.debug('player_health', health=self.player_health)
 
     def heal(self, amount: int) -> None:
         """
@@ -85,14 +155,14 @@ class StateMachine:
             self.player_health += amount
             if self.player_health > self.max_health:
                 self.player_health = self.max_health
-            print(f"Player health: {self.player_health}/{self.max_health}")
+            event_log.debug('player_health', health=self.player_health)
 
     def add_kill(self) -> None:
         """
         Increments the player's kill count by one.
         """
         self.kills += 1
-        print(f"Kills: {self.kills}")
+        event_log.debug('kill', kills=self.kills)
 
     def pause_game(self) -> None:
         """
@@ -100,10 +170,10 @@ class StateMachine:
         """
         if self.game_state == GameState.PLAYING:
             self.game_state = GameState.PAUSED
-            print("Game paused.")
+            event_log.info('game_paused')
         elif self.game_state == GameState.PAUSED:
             self.game_state = GameState.PLAYING
-            print("Game resumed.")
+            event_log.info('game_resumed')
 
     def reset_game(self) -> None:
         """
@@ -115,4 +185,4 @@ class StateMachine:
         self.player_health = self.max_health
         self.kills = 0
         self.game_state = GameState.PLAYING
-        print("Game reset.")
+        event_log.info('game_reset', health=self.max_health)
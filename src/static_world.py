@@ -0,0 +1,271 @@
+import sys
+import os
+from math import ceil, floor
+import numpy as np
+
+# Add the src directory to the system path to allow imports from the src package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+HEIGHTFIELD_CELL = 0.5  # Edge length of a heightfield cell in world units
+LEAF_SIZE = 4  # Most boxes held by a leaf of an AABBTree
+SKIN = 1e-3  # Gap kept between a moving box and the walls it stops against
+
+def overlaps(box, low, high) -> bool:
+    """
+    Returns whether a (min x, min y, min z, max x, max y, max z) box overlaps the box from `low`
+    to `high`. Boxes that only touch do not overlap.
+    """
+    return (box[0] < high[0] and low[0] < box[3] and
+            box[1] < high[1] and low[1] < box[4] and
+            box[2] < high[2] and low[2] < box[5])
+
+class AABBTree:
+    """
+    A bounding-volume hierarchy over a fixed set of axis-aligned boxes, built once. Each node
+    splits its boxes in half at the median along the longest axis of its bounds, down to leaves
+    of at most LEAF_SIZE boxes, so a query only visits the branches whose bounds it overlaps.
+    """
+
+    def __init__(self, boxes: np.ndarray, leaf_size: int = LEAF_SIZE) -> None:
+        """
+        Args:
+            boxes (np.ndarray): (n, 6) boxes as (min x, min y, min z, max x, max y, max z).
+            leaf_size (int): The most boxes a leaf holds. Defaults to 4.
+        """
+        self.boxes = [tuple(box) for box in np.asarray(boxes, dtype=np.float64).reshape(-1, 6).tolist()]
+        self.leaf_size = leaf_size
+        self.nodes: list = []  # (bounds, left child, right child, box indices of a leaf or None)
+        if self.boxes:
+            self.build(np.arange(len(self.boxes)), np.array(self.boxes))
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    def build(self, indices: np.ndarray, boxes: np.ndarray) -> int:
+        """
+        Adds the subtree over the given boxes and returns the index of its root.
+        """
+        selected = boxes[indices]
+        bounds = tuple(selected[:, :3].min(axis=0).tolist() + selected[:, 3:].max(axis=0).tolist())
+        node = len(self.nodes)
+        self.nodes.append(None)
+        if len(indices) <= self.leaf_size:
+            self.nodes[node] = (bounds, -1, -1, indices.tolist())
+            return node
+
+        axis = int(np.argmax(np.subtract(bounds[3:], bounds[:3])))
+        centres = selected[:, axis] + selected[:, axis + 3]
+        order = indices[np.argsort(centres, kind='stable')]
+        half = len(order) // 2
+        left = self.build(order[:half], boxes)
+        right = self.build(order[half:], boxes)
+        self.nodes[node] = (bounds, left, right, None)
+        return node
+
+    def query(self, low, high) -> list:
+        """
+        Returns the boxes that overlap the box from `low` to `high`.
+
+        Args:
+            low (tuple): The query's minimum corner.
+            high (tuple): The query's maximum corner.
+        """
+        if not self.nodes:
+            return []
+        found, stack = [], [0]
+        while stack:
+            bounds, left, right, leaf = self.nodes[stack.pop()]
+            if not overlaps(bounds, low, high):
+                continue
+            if leaf is None:
+                stack.append(left)
+                stack.append(right)
+            else:
+                found.extend(box for box in (self.boxes[i] for i in leaf) if overlaps(box, low, high))
+        return found
+
+class Heightfield:
+    """
+    The height of the highest static surface over each cell of a grid. A box raises every cell
+    its footprint touches, so a cell is never lower than anything standing on it.
+    """
+
+    def __init__(self, low_x: float, low_z: float, size_x: float, size_z: float, cell_size: float = HEIGHTFIELD_CELL,
+                 base: float = 0.0) -> None:
+        """
+        Args:
+            low_x (float): The grid's minimum x.
+            low_z (float): The grid's minimum z.
+            size_x (float): The grid's extent along x.
+            size_z (float): The grid's extent along z.
+            cell_size (float): The edge length of a cell. Defaults to 0.5.
+            base (float): The height of the ground under the grid. Defaults to 0.
+        """
+        self.low_x, self.low_z = low_x, low_z
+        self.cell_size = cell_size
+        self.heights = np.full((ceil(size_x / cell_size), ceil(size_z / cell_size)), base, dtype=np.float32)
+
+    def cells(self, low_x: float, low_z: float, high_x: float, high_z: float) -> tuple:
+        """
+        Returns the (x, z) slices of the cells a footprint touches, clipped to the grid.
+        """
+        size, shape = self.cell_size, self.heights.shape
+        return (slice(max(floor((low_x - self.low_x) / size), 0), min(ceil((high_x - self.low_x) / size), shape[0])),
+                slice(max(floor((low_z - self.low_z) / size), 0), min(ceil((high_z - self.low_z) / size), shape[1])))
+
+    def raise_box(self, box) -> None:
+        """
+        Raises the cells under a box to its top.
+        """
+        cells = self.cells(box[0], box[2], box[3], box[5])
+        np.maximum(self.heights[cells], box[4], out=self.heights[cells])
+
+    def max_height(self, low_x: float, low_z: float, high_x: float, high_z: float, ceiling: float):
+        """
+        Returns the highest surface under a footprint that is no higher than `ceiling`, or None
+        if the footprint is off the grid or every surface under it is higher.
+        """
+        heights = self.heights[self.cells(low_x, low_z, high_x, high_z)]
+        reachable = heights[heights <= ceiling]
+        return float(reachable.max()) if reachable.size else None
+
+class StaticWorld:
+    """
+    Collision for level geometry that never moves, kept apart from the dynamic entities the
+    Ursina colliders and the collision grid deal with. The level registers each chunk of static
+    boxes when it is loaded; the chunk's boxes go into an AABBTree for wall tests and are
+    rasterized into a Heightfield for ground tests. Queries only look at the few chunks they
+    touch, so their cost depends on the geometry nearby, not on how many enemies and bullets
+    are alive or how big the level is.
+    """
+
+    def __init__(self, chunk_size: float = 64.0) -> None:
+        """
+        Args:
+            chunk_size (float): The edge length of the square chunks the level registers.
+        """
+        self.reset(chunk_size)
+
+    def reset(self, chunk_size: float = None) -> None:
+        """
+        Removes every chunk, optionally switching to chunks of a different size.
+
+        Args:
+            chunk_size (float): The new chunk size. Defaults to the current one.
+        """
+        if chunk_size is not None:
+            self.chunk_size = chunk_size
+        self.trees: dict = {}  # (x, z) -> AABBTree
+        self.heightfields: dict = {}  # (x, z) -> Heightfield
+
+    def __len__(self) -> int:
+        return len(self.trees)
+
+    def add_chunk(self, coords: tuple, boxes: np.ndarray, footprint: tuple, ground: float = 0.0) -> None:
+        """
+        Registers the static boxes of one chunk, replacing whatever the chunk held before.
+
+        Args:
+            coords (tuple): The chunk's (x, z) coordinates; chunk (x, z) covers the square of
+                chunk_size centred on (x * chunk_size, z * chunk_size).
+            boxes (np.ndarray): (n, 6) boxes as (min x, min y, min z, max x, max y, max z).
+            footprint (tuple): The chunk's (min x, min z, max x, max z) on the ground.
+            ground (float): The height of the ground across the chunk. Defaults to 0.
+        """
+        tree = AABBTree(boxes)
+        heightfield = Heightfield(footprint[0], footprint[1], footprint[2] - footprint[0], footprint[3] - footprint[1],
+                                  base=ground)
+        for box in tree.boxes:
+            heightfield.raise_box(box)
+        self.trees[coords] = tree
+        self.heightfields[coords] = heightfield
+
+    def remove_chunk(self, coords: tuple) -> None:
+        """
+        Unregisters a chunk. Removing a chunk that is not registered does nothing.
+        """
+        self.trees.pop(coords, None)
+        self.heightfields.pop(coords, None)
+
+    def chunks_under(self, low_x: float, low_z: float, high_x: float, high_z: float) -> list:
+        """
+        Returns the coordinates of the registered chunks a footprint touches.
+        """
+        size = self.chunk_size
+        return [
+            (x, z)
+            for x in range(floor(low_x / size + 0.5), floor(high_x / size + 0.5) + 1)
+            for z in range(floor(low_z / size + 0.5), floor(high_z / size + 0.5) + 1)
+            if (x, z) in self.trees
+        ]
+
+    def boxes_in(self, low, high) -> list:
+        """
+        Returns every static box overlapping the box from `low` to `high`.
+        """
+        found = []
+        for coords in self.chunks_under(low[0], low[2], high[0], high[2]):
+            found.extend(self.trees[coords].query(low, high))
+        return found
+
+    def ground_height(self, low, high, step: float = 0.0):
+        """
+        Returns the height of the highest surface under a box that it could stand on: anything
+        up to `step` above the bottom of the box. Returns None where there is no registered
+        ground, e.g. off the edge of the level.
+
+        Args:
+            low (tuple): The box's minimum corner.
+            high (tuple): The box's maximum corner.
+            step (float): How far above its bottom the box can step up onto a surface.
+        """
+        ground = None
+        for coords in self.chunks_under(low[0], low[2], high[0], high[2]):
+            height = self.heightfields[coords].max_height(low[0], low[2], high[0], high[2], low[1] + step)
+            if height is not None and (ground is None or height > ground):
+                ground = height
+        return ground
+
+    def sweep(self, low, high, delta, step: float = 0.0) -> tuple:
+        """
+        Moves a box horizontally as far as it can go towards `delta`, one axis at a time, so it
+        slides along the walls it runs into instead of stopping dead. Surfaces less than `step`
+        above the bottom of the box are stepped onto rather than treated as walls, and boxes it
+        already overlaps do not hold it back.
+
+        Args:
+            low (tuple): The box's minimum corner.
+            high (tuple): The box's maximum corner.
+            delta (tuple): The (x, z) movement wanted.
+            step (float): How far above its bottom the box can step up onto a surface.
+
+        Returns:
+            tuple: ((x, z) movement allowed, (x blocked, z blocked)).
+        """
+        low = [low[0], low[1] + step, low[2]]
+        high = list(high)
+        moved, blocked = [0.0, 0.0], [False, False]
+        for i, axis in enumerate((0, 2)):
+            wanted = delta[i]
+            if wanted == 0:
+                continue
+            query_low, query_high = list(low), list(high)
+            if wanted > 0:
+                query_high[axis] += wanted
+            else:
+                query_low[axis] += wanted
+
+            allowed = wanted
+            for box in self.boxes_in(query_low, query_high):
+                if wanted > 0 and high[axis] <= box[axis] + SKIN:
+                    allowed = min(allowed, max(box[axis] - SKIN - high[axis], 0.0))
+                elif wanted < 0 and low[axis] >= box[axis + 3] - SKIN:
+                    allowed = max(allowed, min(box[axis + 3] + SKIN - low[axis], 0.0))
+            low[axis] += allowed
+            high[axis] += allowed
+            moved[i] = allowed
+            blocked[i] = allowed != wanted
+        return tuple(moved), tuple(blocked)
+
+# Shared static collision for the level, filled in by the Arena as chunks stream in
+static_world = StaticWorld()
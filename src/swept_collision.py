@@ -0,0 +1,69 @@
+import numpy as np
+
+def segment_sphere_times(starts, ends, centers, radii):
+    """
+    Swept test of many line segments against spheres. Each projectile's movement this frame is
+    the segment from its previous to its current position, so hits are found even when both
+    endpoints are outside the sphere (tunnelling).
+
+    Args:
+        starts (ndarray): (N, 3) segment start points.
+        ends (ndarray): (N, 3) segment end points.
+        centers (ndarray): (3,) or (N, 3) sphere centres.
+        radii (float or ndarray): Scalar or (N,) sphere radii.
+
+    Returns:
+        ndarray: (N,) fraction along each segment where it first touches its sphere, 0 if it
+        starts inside, or inf if it misses.
+    """
+    starts = np.asarray(starts, dtype=np.float64)
+    deltas = np.asarray(ends, dtype=np.float64) - starts
+    offsets = starts - np.asarray(centers, dtype=np.float64)
+
+    a = np.einsum('ij,ij->i', deltas, deltas)
+    b = 2 * np.einsum('ij,ij->i', offsets, deltas)
+    c = np.einsum('ij,ij->i', offsets, offsets) - np.asarray(radii, dtype=np.float64) ** 2
+
+    discriminant = b * b - 4 * a * c
+    moving = a > 0
+    t = (-b - np.sqrt(np.maximum(discriminant, 0))) / (2 * np.where(moving, a, 1))
+
+    inside = c <= 0
+    hit = moving & (discriminant >= 0) & (t >= 0) & (t <= 1)
+    return np.where(inside, 0.0, np.where(hit, t, np.inf))
+
+def segment_aabb_times(starts, ends, box_mins, box_maxs):
+    """
+    Swept test of many line segments against axis-aligned boxes using the slab method.
+
+    Args:
+        starts (ndarray): (N, 3) segment start points.
+        ends (ndarray): (N, 3) segment end points.
+        box_mins (ndarray): (3,) or (N, 3) minimum box corners.
+        box_maxs (ndarray): (3,) or (N, 3) maximum box corners.
+
+    Returns:
+        ndarray: (N,) fraction along each segment where it first touches its box, 0 if it
+        starts inside, or inf if it misses.
+    """
+    starts = np.asarray(starts, dtype=np.float64)
+    deltas = np.asarray(ends, dtype=np.float64) - starts
+    box_mins = np.asarray(box_mins, dtype=np.float64)
+    box_maxs = np.asarray(box_maxs, dtype=np.float64)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t1 = (box_mins - starts) / deltas
+        t2 = (box_maxs - starts) / deltas
+    t_near = np.minimum(t1, t2)
+    t_far = np.maximum(t1, t2)
+
+    # Axes the segment does not move along either always or never overlap the slab
+    parallel = deltas == 0
+    in_slab = (starts >= box_mins) & (starts <= box_maxs)
+    t_near = np.where(parallel, np.where(in_slab, -np.inf, np.inf), t_near)
+    t_far = np.where(parallel, np.where(in_slab, np.inf, -np.inf), t_far)
+
+    t_enter = t_near.max(axis=1)
+    t_exit = t_far.min(axis=1)
+    hit = (t_enter <= t_exit) & (t_exit >= 0) & (t_enter <= 1)
+    return np.where(hit, np.maximum(t_enter, 0.0), np.inf)
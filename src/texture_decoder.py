@@ -0,0 +1,58 @@
+import sys
+import os
+from panda3d.core import CPTA_uchar, Filename, Texture
+
+# Add the src directory to the system path to allow imports from the src package
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.asset_pack import AssetPack
+
+# Panda3D's texture readers hold the GIL for the whole read, so textures are decoded in a worker
+# process with this module, which imports neither Ursina nor the game, and handed back as raw
+# images that are cheap to copy into a texture on the main thread.
+
+_packs: dict = {}  # pack path -> AssetPack mounted in this process
+
+def decode_texture(source: str, key: str = None) -> tuple:
+    """
+    Reads a texture and returns its raw images, ready to be sent to another process.
+
+    Args:
+        source (str): The image or TXO file, or the asset pack when `key` is given.
+        key (str): The texture's key in the pack, or None to read `source` itself.
+
+    Returns:
+        tuple: (x size, y size, component type, format, compression, [bytes per mipmap level]).
+
+    Raises:
+        OSError: If the texture cannot be read.
+    """
+    texture = Texture()
+    if key is not None:
+        pack = _packs.get(source)
+        if pack is None:
+            pack = _packs[source] = AssetPack(source)
+        ok = texture.read_txo(pack.stream(key))
+    else:
+        ok = texture.read(Filename.fromOsSpecific(source))
+    if not ok:
+        raise OSError(f"Could not read texture: {source}{f' ({key})' if key else ''}")
+    images = [bytes(texture.getRamMipmapImage(level)) for level in range(texture.getNumRamMipmapImages())]
+    return (texture.getXSize(), texture.getYSize(), texture.getComponentType(), texture.getFormat(),
+            texture.getRamImageCompression(), images)
+
+def build_texture(decoded: tuple, name: str = '') -> Texture:
+    """
+    Creates a 2D texture from the images decode_texture() returned.
+
+    Args:
+        decoded (tuple): What decode_texture() returned.
+        name (str): The texture's name.
+    """
+    x_size, y_size, component_type, texture_format, compression, images = decoded
+    texture = Texture(name)
+    texture.setup2dTexture(x_size, y_size, component_type, texture_format)
+    texture.setRamImage(CPTA_uchar(images[0]), compression)
+    for level, image in enumerate(images[1:], 1):
+        texture.setRamMipmapImage(level, CPTA_uchar(image))
+    return texture
@@ -7,11 +7,15 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.state import StateMachine
 from src.enums.game_state import GameState
+from src.asset_streamer import AssetStreamer
+from src.enums.asset_priority import AssetPriority
+from src.enums.state_event import StateEvent
+from src.event_log import event_log
 
 class UIManager(Entity):
     """
     Manages and updates the game's UI elements based on the current state of the game.
-    Inherits from Entity to utilize the update method and parent UI elements properly.
+    Subscribes to the StateMachine, so elements are only changed when their values change.
     """
 
     def __init__(self, state_machine: StateMachine, start_game_callback=None, restart_game_callback=None) -> None:
@@ -35,34 +39,41 @@ class UIManager(Entity):
         # Initialize Game Over Screen elements
         self.init_game_over_screen()
 
-        print("UIManager initialized with StateMachine")
+        # Rebuild UI elements only when the values behind them change, starting from the current ones
+        self.state_machine.subscribe(StateEvent.GAME_STATE, self.on_game_state)
+        self.state_machine.subscribe(StateEvent.HEALTH, self.on_health)
+        self.state_machine.subscribe(StateEvent.KILLS, self.on_kills)
+        self.on_game_state(self.state_machine.game_state)
+        self.on_health(self.state_machine.player_health)
+        self.on_kills(self.state_machine.kills)
+
+        event_log.info('ui_initialized')
 
     def init_hud_elements(self):
         """
         Initializes the HUD elements (health bar, skull icon, kill count text).
         """
-        health_bar_texture = load_texture('../assets/images/HealthBar.png')
-
         self.health_bar = Entity(
             parent=self,
             model='quad',
-            texture=health_bar_texture,
             scale=(0.4, 0.03),
             position=(0, -0.45),
             origin=(0, 0),
             visible=False  # Start as not visible
         )
 
-        skull_icon_texture = load_texture('../assets/images/Kills.png')
         self.skull_icon = Entity(
             parent=self,
             model='quad',
-            texture=skull_icon_texture,
             scale=(0.04, 0.05),
             position=(-0.05, -0.39),
             origin=(0, 0),
             visible=False  # Start as not visible
         )
+        AssetStreamer.instance().texture('../assets/images/HealthBar.png', self.health_bar.texture_setter,
+                                         AssetPriority.CRITICAL)
+        AssetStreamer.instance().texture('../assets/images/Kills.png', self.skull_icon.texture_setter,
+                                         AssetPriority.CRITICAL)
 
         # Create the kill count text entity
         self.kill_count_text = Text(
@@ -175,9 +186,7 @@ class UIManager(Entity):
         # Change the game state to PLAYING
         self.state_machine.game_state = GameState.PLAYING
         # Make HUD elements visible
-        self.health_bar.visible = True
-        self.skull_icon.visible = True
-        self.kill_count_text.visible = True
+        self.set_hud_visible(True)
 
         # Call the start_game_callback to initialize game entities
         if self.start_game_callback:
@@ -195,9 +204,7 @@ class UIManager(Entity):
         # Enable the game over screen
         self.game_over_screen.enable()
         # Hide HUD elements
-        self.health_bar.visible = False
-        self.skull_icon.visible = False
-        self.kill_count_text.visible = False
+        self.set_hud_visible(False)
 
     def restart_game(self):
         """
@@ -211,36 +218,54 @@ class UIManager(Entity):
         if self.restart_game_callback:
             self.restart_game_callback()
 
-    def update(self) -> None:
+    def on_destroy(self) -> None:
+        """
+        Called by Ursina when the UI is destroyed. Stops following the state.
+        """
+        self.state_machine.unsubscribe(StateEvent.GAME_STATE, self.on_game_state)
+        self.state_machine.unsubscribe(StateEvent.HEALTH, self.on_health)
+        self.state_machine.unsubscribe(StateEvent.KILLS, self.on_kills)
+
+    def set_hud_visible(self, visible: bool) -> None:
+        """
+        Shows or hides the HUD elements.
+        """
+        self.health_bar.visible = visible
+        self.skull_icon.visible = visible
+        self.kill_count_text.visible = visible
+
+    def on_game_state(self, game_state: GameState) -> None:
         """
-        Updates the UI based on the current game state.
-        This method is called every frame.
+        Switches between the start screen, the game over screen and the HUD when the game state changes.
+
+        Args:
+            game_state (GameState): The new game state.
         """
-        if self.state_machine.game_state == GameState.MENU:
+        if game_state == GameState.MENU:
             # Show start screen, hide HUD and game over screen
             self.start_screen.enable()
             self.game_over_screen.disable()
-            self.health_bar.visible = False
-            self.skull_icon.visible = False
-            self.kill_count_text.visible = False
-        elif self.state_machine.game_state == GameState.GAME_OVER:
+            self.set_hud_visible(False)
+        elif game_state == GameState.GAME_OVER:
             # Show game over screen, hide HUD
             self.start_screen.disable()
             self.game_over_screen.enable()
-            self.health_bar.visible = False
-            self.skull_icon.visible = False
-            self.kill_count_text.visible = False
+            self.set_hud_visible(False)
             self.kills_text.text = f'Kills: {self.state_machine.kills}'
         else:
             # Hide start and game over screens, show HUD
             self.start_screen.disable()
             self.game_over_screen.disable()
-            self.health_bar.visible = True
-            self.skull_icon.visible = True
-            self.kill_count_text.visible = True
+            self.set_hud_visible(True)
 
-            # Update HUD elements
-            health_percentage = self.state_machine.player_health / self.state_machine.max_health
-            self.health_bar.scale_x = health_percentage * 0.4
+    def on_health(self, health: int) -> None:
+        """
+        Resizes the health bar when the player's health changes.
+        """
+        self.health_bar.scale_x = health / self.state_machine.max_health * 0.4
 
-            self.kill_count_text.text = f'Kills: {self.state_machine.kills}'
+    def on_kills(self, kills: int) -> None:
+        """
+        Rebuilds the kill count text when the kill count changes.
+        """
+        self.kill_count_text.text = f'Kills: {kills}'
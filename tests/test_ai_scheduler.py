@@ -0,0 +1,101 @@
+import unittest
+
+import numpy as np
+
+from src.ai_scheduler import AIScheduler
+from src.enums.ai_tier import AITier
+
+TIERS = ((AITier.NEAR, 10.0, 1), (AITier.MID, 20.0, 2), (AITier.FAR, np.inf, 4))
+
+class TestAIScheduler(unittest.TestCase):
+    """
+    Unit test class for the distance-tiered, budgeted AI scheduler.
+    """
+
+    def run_steps(self, scheduler: AIScheduler, distances, steps: int) -> np.ndarray:
+        """
+        Runs the scheduler for a number of steps as the EnemySwarm does, returning how often each enemy ticked.
+        """
+        distances = np.asarray(distances, dtype=np.float32)
+        phases = np.arange(len(distances), dtype=np.int32)
+        waits = np.zeros(len(distances), dtype=np.int32)
+        ticks = np.zeros(len(distances), dtype=np.int64)
+        for _ in range(steps):
+            waits += 1
+            selected = scheduler.select(distances, phases, waits)
+            ticks[selected] += 1
+            waits[selected] = 0
+        return ticks
+
+    def test_tiers_tick_at_their_rates(self) -> None:
+        """
+        Tests that near enemies tick every step, mid ones every other step and far ones every fourth.
+        """
+        scheduler = AIScheduler(tiers=TIERS, budget=100)
+        ticks = self.run_steps(scheduler, [5, 10, 15, 25, 500], steps=8)
+
+        self.assertEqual(ticks.tolist(), [8, 8, 4, 2, 2])
+        self.assertEqual(scheduler.tiers_of(np.array([0, 10, 10.5, 20, 21])).tolist(), [0, 0, 1, 1, 2])
+
+    def test_far_enemies_are_staggered(self) -> None:
+        """
+        Tests that a wave of far enemies is spread evenly over the steps instead of ticking together.
+        """
+        scheduler = AIScheduler(tiers=TIERS, budget=100)
+        distances = np.full(40, 100, dtype=np.float32)
+        phases = np.arange(40, dtype=np.int32)
+        waits = np.ones(40, dtype=np.int32)
+
+        for _ in range(4):
+            self.assertEqual(len(scheduler.select(distances, phases, waits)), 10)
+            self.assertEqual(scheduler.counts()['far_ticks'], 10)
+
+    def test_budget_keeps_near_enemies_at_full_rate(self) -> None:
+        """
+        Tests that over the budget the near enemies still tick every step, and that deferred
+        far enemies still get their turn, having waited longer.
+        """
+        scheduler = AIScheduler(tiers=TIERS, budget=4)
+        ticks = self.run_steps(scheduler, [5, 5, 5] + [100] * 8, steps=8)
+        counts = scheduler.counts()
+
+        self.assertEqual(ticks[:3].tolist(), [8, 8, 8])
+        self.assertEqual(ticks[3:].tolist(), [1] * 8)  # One far tick a step fits beside the three near ones
+        self.assertEqual(counts['near_mean'], 3.0)
+        self.assertEqual(counts['far_mean'], 1.0)
+
+    def test_far_crowd_shares_what_near_enemies_leave(self) -> None:
+        """
+        Tests that with fewer near enemies than the budget and a far crowd well over the rest of
+        it, every near enemy ticks every step and the far ones are slowed evenly.
+        """
+        scheduler = AIScheduler(tiers=TIERS, budget=64)
+        distances = np.array([5] * 40 + [100] * 300, dtype=np.float32)
+        phases = np.arange(len(distances), dtype=np.int32)
+        waits = np.zeros(len(distances), dtype=np.int32)
+        ticks = np.zeros(len(distances), dtype=np.int64)
+        for _ in range(100):
+            waits += 1
+            selected = scheduler.select(distances, phases, waits)
+            self.assertEqual(scheduler.counts()['near_ticks'], 40)
+            ticks[selected] += 1
+            waits[selected] = 0
+
+        self.assertEqual(ticks[:40].tolist(), [100] * 40)
+        self.assertEqual(ticks[40:].sum(), 24 * 100)
+        self.assertGreaterEqual(ticks[40:].min(), 7)  # 24 of 300 a step: every 12.5 steps on average
+        self.assertLessEqual(ticks[40:].max() - ticks[40:].min(), 2)
+
+    def test_near_crowd_over_the_budget_shares_it(self) -> None:
+        """
+        Tests that near enemies alone over the budget are slowed evenly, none waiting more than
+        one extra step.
+        """
+        scheduler = AIScheduler(tiers=TIERS, budget=64)
+        ticks = self.run_steps(scheduler, [5] * 100, steps=40)
+
+        self.assertEqual(ticks.sum(), 64 * 40)
+        self.assertGreaterEqual(ticks.min(), 20)
+
+if __name__ == '__main__':
+    unittest.main()
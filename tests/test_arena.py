@@ -0,0 +1,141 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+import numpy as np
+
+from src.arena import (
+    ARENA_RADIUS, CHUNK_SIZE, FACES, PIECE_GAP, SPAWN_CLEARING, VIEW_DISTANCE, build_chunk_geometry, generate_chunk,
+)
+from src.enums.arena_piece import ArenaPiece
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Ursina allows one app per process, so the arena is streamed in a child process
+STREAMING = """
+import json, sys
+sys.path.insert(0, {root!r})
+from ursina import Vec3
+from src.headless import HeadlessGame
+from src.arena import Arena
+from src.static_world import static_world
+from src.frame_profiler import scene_counts
+game = HeadlessGame(seed=0)
+arena = Arena.instance()
+
+def snapshot():
+    return {{
+        'loaded': len(arena.chunks),
+        'enabled': sum(chunk.enabled for chunk in arena.chunks.values()),
+        'pending': len(arena.pending),
+        'registered': sorted(static_world.trees) == sorted(arena.chunks),
+        'draw_calls': scene_counts()['draw_calls'],
+    }}
+
+results = [snapshot()]
+far = Vec3(3 * arena.chunk_size, 0, 0)
+built = arena.stream(far, budget=1)
+results.append({{'built': built, 'center_loaded': arena.center in arena.chunks, **snapshot()}})
+while arena.pending:
+    arena.stream(far, budget=1)
+results.append(snapshot())
+box = arena.chunks[arena.center].boxes[0].tolist()
+results.append({{'top': box[4], 'ground': static_world.ground_height(box[:3], box[3:], step=box[4])}})
+print(json.dumps(results))
+"""
+
+class TestArena(unittest.TestCase):
+    """
+    Unit test class for the procedural arena and its chunk streaming.
+    """
+
+    def test_layout_is_seeded(self) -> None:
+        """
+        Tests that a chunk's layout depends only on the seed and its coordinates.
+        """
+        boxes, kinds = generate_chunk(7, (2, -1))
+        again, again_kinds = generate_chunk(7, (2, -1))
+        other, _ = generate_chunk(8, (2, -1))
+
+        np.testing.assert_array_equal(boxes, again)
+        np.testing.assert_array_equal(kinds, again_kinds)
+        self.assertFalse(np.array_equal(boxes, other))
+
+    def test_pieces_fit_their_chunk(self) -> None:
+        """
+        Tests that pieces stand on the ground inside their chunk, keep apart from each other and
+        leave the spawn point clear.
+        """
+        for coords in ((0, 0), (1, 0), (-1, 1), (3, -2)):
+            boxes, kinds = generate_chunk(0, coords)
+            low = (np.array(coords) - 0.5) * CHUNK_SIZE
+            self.assertTrue(np.all(boxes[:, 1] == 0))
+            self.assertTrue(np.all(boxes[:, [0, 2]] >= low) and np.all(boxes[:, [3, 5]] <= low + CHUNK_SIZE))
+            self.assertTrue(set(kinds.tolist()) <= set(ArenaPiece))
+
+            for i, box in enumerate(boxes):
+                dx = max(box[0], -box[3], 0)
+                dz = max(box[2], -box[5], 0)
+                self.assertGreaterEqual(dx * dx + dz * dz, SPAWN_CLEARING ** 2 - 1e-3)
+                for other in boxes[i + 1:]:
+                    apart = (box[3] + PIECE_GAP <= other[0] or other[3] + PIECE_GAP <= box[0] or
+                             box[5] + PIECE_GAP <= other[2] or other[5] + PIECE_GAP <= box[2])
+                    self.assertTrue(apart)
+
+    def test_edge_chunks_are_walled(self) -> None:
+        """
+        Tests that chunks on the arena's edge get a perimeter wall along their outer sides.
+        """
+        inner, _ = generate_chunk(0, (0, 0))
+        corner, kinds = generate_chunk(0, (ARENA_RADIUS, -ARENA_RADIUS))
+        high_x = (ARENA_RADIUS + 0.5) * CHUNK_SIZE
+        low_z = -(ARENA_RADIUS + 0.5) * CHUNK_SIZE
+
+        self.assertFalse(np.any(inner[:, 3] == CHUNK_SIZE / 2))
+        walls = corner[kinds == ArenaPiece.WALL]
+        self.assertTrue(np.any((walls[:, 3] == high_x) & (walls[:, 5] - walls[:, 2] == CHUNK_SIZE)))
+        self.assertTrue(np.any((walls[:, 2] == low_z) & (walls[:, 3] - walls[:, 0] == CHUNK_SIZE)))
+
+    def test_chunk_is_one_geom(self) -> None:
+        """
+        Tests that a chunk's ground and pieces are merged into a single Geom with a quad per face.
+        """
+        boxes, kinds = generate_chunk(0, (1, 1))
+        node = build_chunk_geometry(boxes, kinds, (32, 32, 96, 96))
+
+        self.assertEqual(node.getNumGeoms(), 1)
+        geom = node.getGeom(0)
+        quads = 1 + len(FACES) * len(boxes)
+        self.assertEqual(geom.getVertexData().getNumRows(), 4 * quads)
+        self.assertEqual(geom.getPrimitive(0).getNumVertices(), 6 * quads)
+
+    def test_chunks_stream_around_a_position(self) -> None:
+        """
+        Tests that only the chunks around the focus are drawn, that moving builds the chunk
+        underfoot at once and the rest within the budget, that the drawn set stays the same size,
+        and that the collision of every built chunk is registered with the static world.
+        """
+        result = subprocess.run(
+            [sys.executable, '-c', STREAMING.format(root=ROOT_DIR)],
+            cwd=ROOT_DIR, capture_output=True, text=True, timeout=300,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+        start, moved, settled, surface = json.loads(result.stdout.strip().splitlines()[-1])
+
+        view = (2 * VIEW_DISTANCE + 1) ** 2
+        kept = (2 * VIEW_DISTANCE + 3) ** 2
+        self.assertEqual(start['enabled'], view)
+        self.assertEqual(start['loaded'], kept)
+        self.assertEqual(moved['built'], 1)
+        self.assertTrue(moved['center_loaded'])
+        self.assertGreater(moved['pending'], 0)
+        self.assertEqual(settled['enabled'], view)
+        self.assertEqual(settled['loaded'], kept)
+        self.assertEqual(settled['draw_calls'], start['draw_calls'])
+        self.assertTrue(start['registered'] and settled['registered'])
+        self.assertEqual(surface['ground'], surface['top'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+
+from unittest.mock import patch
+
+from src import asset_pack
+from src.asset_pack import AssetPack
+from src.bake_assets import file_hash
+
+class TestAssetPack(unittest.TestCase):
+    """
+    Unit test class for writing and reading the packed asset archive. Entry collection is
+    mocked so no real assets are loaded.
+    """
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'assets.pak')
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_pack_round_trips_entries(self) -> None:
+        """
+        Tests that every entry written to the pack reads back byte for byte, aligned, with its index metadata.
+        """
+        entries = [
+            ('models/drone.fbx', 'bam', b'model-bytes', {'source_size': 1234}),
+            ('images/a.png', 'txo', b'texture', {}),
+            ('fonts/primary.ttf', 'raw', b'font', {}),
+        ]
+        with patch.object(asset_pack, 'collect_entries', return_value=entries):
+            asset_pack.write_pack(self.path)
+
+        pack = AssetPack(self.path)
+        try:
+            for key, kind, data, _ in entries:
+                self.assertIn(key, pack)
+                self.assertEqual(bytes(pack.read(key)), data)
+                self.assertEqual(pack.entry(key)['kind'], kind)
+                self.assertEqual(pack.entry(key)['offset'] % asset_pack.ALIGNMENT, 0)
+            self.assertEqual(pack.entry('models/drone.fbx')['source_size'], 1234)
+            self.assertIsNone(pack.entry('images/missing.png'))
+        finally:
+            pack.close()
+
+    def test_entries_whose_source_changed_are_stale(self) -> None:
+        """
+        Tests that an entry is current while its source keeps the content it was packed with,
+        even if touched, or is missing, and stale once the source changes or if the entry has no
+        source stats.
+        """
+        assets_dir = os.path.join(self.temp_dir.name, 'assets')
+        os.makedirs(assets_dir)
+        names = ('a.png', 'b.png', 'c.png', 'touched.png', 'rewritten.png')
+        for name in names:
+            with open(os.path.join(assets_dir, name), 'wb') as f:
+                f.write(b'source')
+        stat = os.stat(os.path.join(assets_dir, 'a.png'))
+        packed = {'source_size': stat.st_size, 'source_mtime': stat.st_mtime,
+                  'source_hash': file_hash(os.path.join(assets_dir, 'a.png'))}
+        entries = [(name, 'raw', name.encode(), packed) for name in names if name != 'c.png']
+        entries += [('c.png', 'raw', b'c', {}), ('gone.png', 'raw', b'gone', packed)]
+        with patch.object(asset_pack, 'collect_entries', return_value=entries):
+            asset_pack.write_pack(self.path)
+        with open(os.path.join(assets_dir, 'b.png'), 'ab') as f:
+            f.write(b' edited')
+        with open(os.path.join(assets_dir, 'rewritten.png'), 'wb') as f:
+            f.write(b'SOURCE')  # Same size, other content
+        for name in ('touched.png', 'rewritten.png'):
+            os.utime(os.path.join(assets_dir, name), (stat.st_atime + 60, stat.st_mtime + 60))
+
+        pack = AssetPack(self.path)
+        try:
+            with patch.object(asset_pack, 'ASSETS_DIR', assets_dir):
+                current = {key: pack.is_current(key) for key in names + ('gone.png',)}
+        finally:
+            pack.close()
+        self.assertEqual(current, {'a.png': True, 'b.png': False, 'c.png': False, 'touched.png': True,
+                                   'rewritten.png': False, 'gone.png': True})
+
+    def test_rejects_file_that_is_not_a_pack(self) -> None:
+        """
+        Tests that mounting a file with the wrong magic raises ValueError.
+        """
+        with open(self.path, 'wb') as f:
+            f.write(b'\0' * 64)
+
+        with self.assertRaises(ValueError):
+            AssetPack(self.path)
+
+if __name__ == '__main__':
+    unittest.main()
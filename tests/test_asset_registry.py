@@ -0,0 +1,122 @@
+import os
+import tempfile
+import unittest
+
+from unittest.mock import patch, MagicMock
+
+from src.asset_registry import AssetRegistry
+from src.bake_assets import file_hash
+
+class TestAssetRegistry(unittest.TestCase):
+    """
+    Unit test class for the AssetRegistry. Ursina's loaders are mocked so no files are read.
+    """
+
+    def setUp(self) -> None:
+        """
+        Clears the singleton registry's caches before each test.
+        """
+        self.registry = AssetRegistry()
+        self.registry.init_registry()
+
+    def test_texture_loaded_once_and_shared(self) -> None:
+        """
+        Tests that a texture is loaded once and the same handle is returned afterwards.
+        """
+        with patch('src.asset_registry.load_texture', MagicMock(return_value='texture')) as mock_load:
+            first = self.registry.texture('a.png')
+            second = self.registry.texture('a.png')
+
+        mock_load.assert_called_once_with('a.png')
+        self.assertIs(first, second)
+        self.assertEqual(self.registry.stats['a.png']['hits'], 1)
+        self.assertEqual(self.registry.stats['a.png']['misses'], 1)
+
+    def test_model_handles_are_copies_of_prototype(self) -> None:
+        """
+        Tests that each model request returns a new copy of the cached prototype.
+        """
+        prototype = MagicMock()
+        prototype.copyTo.side_effect = lambda parent: MagicMock()
+        with patch('src.asset_registry.load_model', MagicMock(return_value=prototype)) as mock_load:
+            first = self.registry.model('drone.fbx')
+            second = self.registry.model('drone.fbx')
+
+        mock_load.assert_called_once()
+        self.assertIsNot(first, second)
+        self.assertEqual(prototype.copyTo.call_count, 2)
+
+    def test_packed_models_load_as_packed(self) -> None:
+        """
+        Tests that a packed model is decoded from the pack as it is, without looking for its bake
+        or source, and that its entities get the same unit scale as with the source model.
+        """
+        path = '../assets/models/untitled.fbx'
+        pack = MagicMock()
+        pack.entry.return_value = {'kind': 'bam'}
+        pack.read.return_value = b''
+        self.registry.pack = pack
+        prototype = MagicMock()
+        with patch('src.asset_registry.NodePath') as node_path, \
+             patch.object(self.registry, 'baked_path') as baked_path:
+            node_path.decode_from_bam_stream.return_value = prototype
+            self.assertIs(self.registry.load_model(path), prototype)
+
+        baked_path.assert_not_called()  # Served from the pack without touching the source or bake
+        prototype.setScale.assert_not_called()
+        self.assertEqual(self.registry.unit_scale(path), 0.001)
+
+    def test_bake_is_used_only_while_source_content_matches(self) -> None:
+        """
+        Tests that a bake is used while its source keeps its size and mtime, without reading the
+        source, or keeps its content after being touched; and not once the source is rewritten.
+        """
+        with tempfile.TemporaryDirectory() as folder:
+            assets_dir, bake_dir = os.path.join(folder, 'assets'), os.path.join(folder, 'baked')
+            os.makedirs(os.path.join(assets_dir, 'images'))
+            os.makedirs(bake_dir)
+            source = os.path.join(assets_dir, 'images', 'a.png')
+            with open(source, 'wb') as f:
+                f.write(b'original')
+            with open(os.path.join(bake_dir, 'a.txo'), 'wb') as f:
+                f.write(b'baked')
+            stat = os.stat(source)
+            self.registry.manifest = {'images/a.png': {
+                'hash': file_hash(source), 'output': 'a.txo', 'source_size': stat.st_size, 'source_mtime': stat.st_mtime,
+            }}
+
+            with patch('src.asset_registry.SRC_DIR', os.path.join(folder, 'src')), \
+                 patch('src.asset_registry.ASSETS_DIR', assets_dir), \
+                 patch('src.asset_registry.BAKE_DIR', bake_dir):
+                unchanged = self.registry.baked_path('../assets/images/a.png')
+                hashed = dict(self.registry.source_hashes)
+
+                os.utime(source, (stat.st_atime + 60, stat.st_mtime + 60))
+                touched = self.registry.baked_path('../assets/images/a.png')
+
+                with open(source, 'wb') as f:
+                    f.write(b'edited!!')
+                self.registry.source_hashes.clear()  # As on the next run
+                edited = self.registry.baked_path('../assets/images/a.png')
+
+        self.assertEqual(unchanged, os.path.join(bake_dir, 'a.txo'))
+        self.assertEqual(hashed, {})
+        self.assertEqual(touched, os.path.join(bake_dir, 'a.txo'))
+        self.assertIsNone(edited)
+
+    def test_prewarm_makes_later_requests_hits(self) -> None:
+        """
+        Tests that assets loaded during prewarm are served from the cache without a miss.
+        """
+        with patch('src.asset_registry.load_model', MagicMock(return_value=MagicMock())), \
+             patch('src.asset_registry.load_texture', MagicMock(return_value='texture')):
+            self.registry.prewarm(models=('drone.fbx',), textures=('a.png',))
+            self.registry.model('drone.fbx')
+            self.registry.texture('a.png')
+
+        self.assertEqual(self.registry.stats['drone.fbx']['hits'], 1)
+        self.assertEqual(self.registry.stats['drone.fbx']['misses'], 1)
+        self.assertEqual(self.registry.stats['a.png']['misses'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
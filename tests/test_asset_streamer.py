@@ -0,0 +1,88 @@
+import unittest
+
+from ursina import Entity, destroy
+
+from src.asset_registry import AssetRegistry
+from src.asset_streamer import AssetStreamer
+from src.enums.asset_priority import AssetPriority
+
+SKY = '../assets/images/Sky.png'
+HEALTH_BAR = '../assets/images/HealthBar.png'
+KILLS = '../assets/images/Kills.png'
+DRONE = '../assets/images/drone_d.png'
+
+class TestAssetStreamer(unittest.TestCase):
+    """
+    Unit test class for the AssetStreamer. Textures are decoded from the real asset files in the
+    streamer's worker process.
+    """
+
+    def setUp(self) -> None:
+        """
+        Clears the singleton registry's caches before each test.
+        """
+        self.registry = AssetRegistry()
+        self.registry.init_registry()
+        self.streamer = AssetStreamer()
+        self.addCleanup(destroy, self.streamer)
+        self.delivered = []
+
+    def tearDown(self) -> None:
+        if self.streamer.executor:
+            self.streamer.executor.shutdown()
+
+    def record(self, path: str):
+        return lambda texture: self.delivered.append((path, texture))
+
+    def test_placeholder_until_loaded(self) -> None:
+        """
+        Tests that an uncached texture is answered with the placeholder at once and with the
+        real texture once the worker has decoded it, and that later requests are served from the cache.
+        """
+        self.streamer.texture(KILLS, self.record(KILLS))
+        self.assertEqual(self.delivered, [(KILLS, self.streamer.placeholder)])
+        self.assertEqual(self.streamer.pending, 1)
+
+        self.streamer.update()
+        path, decoding = self.streamer.decoding
+        self.assertEqual(path, KILLS)
+        self.assertTrue(self.streamer.wait(timeout=60))
+        self.assertIsNone(decoding.exception())  # Decoded by the worker, not read again on this thread
+        self.assertIs(self.delivered[-1][1], self.registry.textures[KILLS])
+        self.assertEqual(self.delivered[-1][1]._texture.getXSize(), self.registry.read_texture(KILLS).getXSize())
+
+        self.streamer.texture(KILLS, self.record(KILLS))
+        self.assertIs(self.delivered[-1][1], self.registry.textures[KILLS])
+        self.assertEqual(self.streamer.pending, 0)
+
+    def test_most_urgent_first(self) -> None:
+        """
+        Tests that queued textures are delivered in order of priority, and that asking again
+        for a texture at a higher priority moves it up the queue.
+        """
+        self.streamer.texture(SKY, self.record(SKY), AssetPriority.BACKGROUND, placeholder=False)
+        self.streamer.texture(DRONE, self.record(DRONE), AssetPriority.NORMAL, placeholder=False)
+        self.streamer.prefetch(textures=(KILLS,))
+        self.streamer.texture(HEALTH_BAR, self.record(HEALTH_BAR), AssetPriority.CRITICAL, placeholder=False)
+        self.streamer.texture(KILLS, self.record(KILLS), AssetPriority.CRITICAL, placeholder=False)
+
+        self.assertTrue(self.streamer.wait(timeout=60))
+        self.assertEqual([path for path, _ in self.delivered], [HEALTH_BAR, KILLS, DRONE, SKY])
+        self.assertEqual(self.registry.stats[KILLS]['misses'], 1)
+
+    def test_destroyed_entities_are_skipped(self) -> None:
+        """
+        Tests that a texture arriving after the entity that asked for it was destroyed is not applied to it.
+        """
+        kept, dropped = Entity(model='quad'), Entity(model='quad')
+        self.addCleanup(destroy, kept)
+        self.streamer.texture(KILLS, kept.texture_setter)
+        self.streamer.texture(KILLS, dropped.texture_setter)
+        self.assertIs(kept.texture, self.streamer.placeholder)
+        destroy(dropped)
+
+        self.assertTrue(self.streamer.wait(timeout=60))
+        self.assertIs(kept.texture, self.registry.textures[KILLS])
+
+if __name__ == '__main__':
+    unittest.main()
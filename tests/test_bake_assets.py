@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+
+from unittest.mock import patch
+
+from src import bake_assets
+
+class TestBakeAssets(unittest.TestCase):
+    """
+    Unit test class for the bake manifest bookkeeping that decides what needs rebaking.
+    """
+
+    def setUp(self) -> None:
+        """
+        Points the bake output at a temporary folder.
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.bake_dir_patch = patch.object(bake_assets, 'BAKE_DIR', self.temp_dir.name)
+        self.bake_dir_patch.start()
+
+    def tearDown(self) -> None:
+        self.bake_dir_patch.stop()
+        self.temp_dir.cleanup()
+
+    def write_output(self, name: str) -> None:
+        with open(os.path.join(self.temp_dir.name, name), 'wb') as f:
+            f.write(b'baked')
+
+    def test_entry_is_current_only_when_hash_options_and_output_match(self) -> None:
+        """
+        Tests that a changed hash, changed option or missing output all force a rebake.
+        """
+        entry = {'hash': 'abc', 'output': 'drone.txo', 'compress': False}
+
+        self.assertFalse(bake_assets.is_current(entry, 'abc', {'compress': False}))  # Output missing
+        self.write_output('drone.txo')
+        self.assertTrue(bake_assets.is_current(entry, 'abc', {'compress': False}))
+        self.assertFalse(bake_assets.is_current(entry, 'def', {'compress': False}))
+        self.assertFalse(bake_assets.is_current(entry, 'abc', {'compress': True}))
+        self.assertFalse(bake_assets.is_current(None, 'abc', {'compress': False}))
+
+    def test_output_path_mirrors_assets_folder(self) -> None:
+        """
+        Tests that baked files keep their folder under assets/ and get the baked extension.
+        """
+        output = bake_assets.output_path('images/pistol/color.png', '.txo')
+
+        self.assertEqual(output, os.path.join(self.temp_dir.name, 'images', 'pistol', 'color.txo'))
+
+    def test_file_hash_changes_with_content(self) -> None:
+        """
+        Tests that the content hash tracks file contents.
+        """
+        path = os.path.join(self.temp_dir.name, 'a.png')
+        self.write_output('a.png')
+        first = bake_assets.file_hash(path)
+        with open(path, 'ab') as f:
+            f.write(b'!')
+
+        self.assertNotEqual(bake_assets.file_hash(path), first)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+
+from benchmarks.bench_scenarios import compare, percentiles
+
+class TestBenchScenarios(unittest.TestCase):
+    """
+    Unit test class for the benchmark runner's statistics and baseline comparison.
+    """
+
+    def test_percentiles_are_in_milliseconds(self) -> None:
+        """
+        Tests that frame times in seconds are summarised as millisecond percentiles.
+        """
+        stats = percentiles([0.001] * 98 + [0.010, 0.020])
+
+        self.assertAlmostEqual(stats['p50_ms'], 1.0)
+        self.assertGreater(stats['p99_ms'], stats['p95_ms'])
+
+    def test_only_slowdowns_beyond_tolerance_regress(self) -> None:
+        """
+        Tests that a scenario fails only when its p95 exceeds the baseline by more than the tolerance,
+        and that scenarios missing from the baseline are skipped.
+        """
+        baseline = {'scenarios': {'wave_1': {'p95_ms': 2.0}, 'wave_10': {'p95_ms': 4.0}}}
+        results = {
+            'wave_1': {'p95_ms': 2.4},  # 20% slower: within tolerance
+            'wave_10': {'p95_ms': 5.2},  # 30% slower: regression
+            'wave_50': {'p95_ms': 100.0},  # No baseline
+        }
+
+        regressions = compare(results, baseline, tolerance=0.25)
+
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith('wave_10'))
+
+if __name__ == '__main__':
+    unittest.main()
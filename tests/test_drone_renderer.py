@@ -0,0 +1,74 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Ursina allows one app per process, so the waves are spawned in a child process
+WAVES = """
+import json, sys
+sys.path.insert(0, {root!r})
+from ursina import destroy
+from src.headless import HeadlessGame
+from src.drone_renderer import DroneRenderer
+from src.frame_profiler import scene_counts
+game = HeadlessGame(seed=0)
+drones = DroneRenderer.instance()
+results = []
+for wave in (10, 50):
+    game.start()
+    manager = game.game_manager
+    manager.current_wave = wave
+    manager.spawn_wave()
+    manager.spawn_queue.flush()
+    enemies = manager.enemies
+    ids = sorted(enemy.instance_id for enemy in enemies)
+    results.append({{
+        'enemies': len(enemies),
+        'ids_match': ids == list(range(len(drones.entities))),
+        'instances': drones.geometry.getInstanceCount(),
+        'models': sum(1 for enemy in enemies if enemy.model),
+        **scene_counts(),
+    }})
+for enemy in list(manager.enemies)[::2]:
+    destroy(enemy)
+manager.enemies = [enemy for enemy in manager.enemies if enemy.instance_id is not None]
+results.append({{
+    'remaining': len(manager.enemies),
+    'instances': drones.geometry.getInstanceCount(),
+    'consistent': all(drones.entities[enemy.instance_id] is enemy for enemy in manager.enemies),
+}})
+print(json.dumps(results))
+"""
+
+class TestDroneRenderer(unittest.TestCase):
+    """
+    Unit test class for drawing enemy drones instanced from one shared model.
+    """
+
+    def test_draw_calls_do_not_grow_with_the_wave(self) -> None:
+        """
+        Tests that every drone is an instance of the shared node, that a larger wave adds no draw
+        calls and fewer nodes per drone than a model each, and that destroyed drones free their instance.
+        """
+        result = subprocess.run(
+            [sys.executable, '-c', WAVES.format(root=ROOT_DIR)],
+            cwd=ROOT_DIR, capture_output=True, text=True, timeout=300,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+        small, large, after_destroy = json.loads(result.stdout.strip().splitlines()[-1])
+
+        for wave in (small, large):
+            self.assertTrue(wave['ids_match'])
+            self.assertEqual(wave['instances'], wave['enemies'])
+            self.assertEqual(wave['models'], 0)
+        self.assertEqual(large['draw_calls'], small['draw_calls'])
+        self.assertLessEqual(large['nodes'] - small['nodes'], 2 * (large['enemies'] - small['enemies']))
+
+        self.assertEqual(after_destroy['instances'], after_destroy['remaining'])
+        self.assertTrue(after_destroy['consistent'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+import unittest
+from math import atan2, degrees
+
+from ursina import Vec3
+
+from src.ai_scheduler import AIScheduler
+from src.enemy_swarm import EnemySwarm
+from src.flow_field import FlowField, NavGrid
+from src.state import StateMachine
+from src.enums.game_state import GameState
+
+class FakePlayer:
+    """
+    Stand-in for the Player that the swarm steers towards.
+    """
+
+    def __init__(self, position) -> None:
+        self.position = position
+        self.enabled = True
+
+class FakeEnemy:
+    """
+    Stand-in for an Enemy that records what the swarm writes back.
+    """
+
+    def __init__(self, player, position, speed, friction, hover_height) -> None:
+        self.player = player
+        self.position = position
+        self.ticked = None
+        self.velocity = Vec3(0, 0, 0)
+        self.speed = speed
+        self.friction = friction
+        self.hover_height = hover_height
+        self.heading = None
+
+    def setPos(self, x, y, z) -> None:
+        self.position = Vec3(x, y, z)
+
+    def setH(self, heading) -> None:
+        self.heading = heading
+
+    def tick(self, dt) -> None:
+        self.ticked = dt
+
+def reference_step(enemy, player, dt):
+    """
+    The per-enemy steering that Enemy.update used to do, for comparison.
+    """
+    direction = player.position - enemy.position
+    direction.y = 0
+    distance_to_player = direction.length()
+    direction = direction.normalized() if distance_to_player > 0 else Vec3(0, 0, 0)
+    yaw = degrees(atan2(direction.x, direction.z))
+    velocity = enemy.velocity + direction * enemy.speed * dt
+    velocity -= velocity * enemy.friction * dt
+    position = enemy.position + velocity * dt
+    position.y = enemy.hover_height
+    return position, yaw, distance_to_player
+
+class TestEnemySwarm(unittest.TestCase):
+    """
+    Unit test class for the batched EnemySwarm steering.
+    """
+
+    def setUp(self) -> None:
+        """
+        Creates a small swarm so growing the arrays is exercised, and makes sure the game is playing.
+        """
+        StateMachine().game_state = GameState.PLAYING
+        self.swarm = EnemySwarm(capacity=2)
+        self.player = FakePlayer(Vec3(0, 1.5, 0))
+        self.dt = 1 / 60
+
+    def test_batched_step_matches_per_enemy_steering(self) -> None:
+        """
+        Tests that one batched step gives the same positions, yaw and distances as the old per-enemy code.
+        """
+        enemies = [
+            FakeEnemy(self.player, Vec3(5, 2, 10), speed=4, friction=0.1, hover_height=2),
+            FakeEnemy(self.player, Vec3(-8, 3, 1), speed=12, friction=0.3, hover_height=5),
+            FakeEnemy(self.player, Vec3(0, 4, -6), speed=7, friction=0.2, hover_height=3),
+        ]
+        expected = [reference_step(enemy, self.player, self.dt) for enemy in enemies]
+        for enemy in enemies:
+            self.swarm.add(enemy)
+
+        self.swarm.fixed_update(self.dt)
+
+        for enemy, (position, yaw, distance_to_player) in zip(enemies, expected):
+            for axis in range(3):
+                self.assertAlmostEqual(enemy.position[axis], position[axis], places=4)
+            self.assertAlmostEqual(enemy.heading, -yaw, places=3)
+            self.assertAlmostEqual(self.swarm.distance_to_player(enemy), distance_to_player, places=4)
+
+    def test_far_enemies_tick_less_often_with_the_time_they_missed(self) -> None:
+        """
+        Tests that a far enemy only moves every few steps, by the time since it last moved, while
+        a near one moves every step.
+        """
+        near = FakeEnemy(self.player, Vec3(5, 2, 0), speed=4, friction=0.1, hover_height=2)
+        far = FakeEnemy(self.player, Vec3(200, 2, 0), speed=4, friction=0.1, hover_height=2)
+        self.swarm.add(near)
+        self.swarm.add(far)
+
+        far_steps = []
+        for _ in range(8):
+            before = far.position
+            self.swarm.fixed_update(self.dt)
+            self.assertAlmostEqual(near.ticked, self.dt, places=6)
+            if far.ticked is not None:
+                self.assertNotEqual(far.position, before)
+                far_steps.append(far.ticked)
+                far.ticked = None
+            else:
+                self.assertEqual(far.position, before)
+
+        self.assertEqual(len(far_steps), 2)
+        for step in far_steps:
+            self.assertAlmostEqual(step, 4 * self.dt, places=6)
+
+    def test_missed_time_is_capped(self) -> None:
+        """
+        Tests that an enemy that waited longer than the scheduler's max_wait is only moved by
+        max_wait steps.
+        """
+        self.swarm = EnemySwarm(capacity=2, scheduler=AIScheduler(max_wait=2))
+        far = FakeEnemy(self.player, Vec3(200, 2, 0), speed=4, friction=0.1, hover_height=2)
+        self.swarm.add(far)
+
+        steps = []
+        for _ in range(8):
+            self.swarm.fixed_update(self.dt)
+            if far.ticked is not None:
+                steps.append(far.ticked)
+                far.ticked = None
+        self.assertAlmostEqual(max(steps), 2 * self.dt, places=6)
+
+    def test_walls_are_flown_around(self) -> None:
+        """
+        Tests that an enemy with a wall between it and the player is steered along the wall,
+        while one with a clear way keeps heading straight for the player.
+        """
+        grid = NavGrid(-50, -50, 100, cell_size=4)
+        grid.block_box((10, 0, -20, 11, 4, 20))
+        flow = FlowField(grid)
+        flow.follow(self.player.position)
+        flow.advance()  # Swept all the way out, rather than a few rings a step
+        self.swarm = EnemySwarm(capacity=2, flow=flow)
+        blocked = FakeEnemy(self.player, Vec3(30, 2, 0), speed=4, friction=0.1, hover_height=2)
+        clear = FakeEnemy(self.player, Vec3(-20, 2, 0), speed=4, friction=0.1, hover_height=2)
+        self.swarm.add(blocked)
+        self.swarm.add(clear)
+
+        self.swarm.fixed_update(self.dt)
+
+        self.assertNotEqual(blocked.position.z, 0)
+        self.assertAlmostEqual(clear.position.z, 0, places=6)
+        self.assertAlmostEqual(clear.heading, -90, places=3)
+
+    def test_remove_moves_last_enemy_into_slot(self) -> None:
+        """
+        Tests that removing an enemy keeps the arrays dense and copies its velocity back.
+        """
+        first = FakeEnemy(self.player, Vec3(5, 2, 0), speed=4, friction=0.1, hover_height=2)
+        last = FakeEnemy(self.player, Vec3(-5, 2, 0), speed=4, friction=0.1, hover_height=2)
+        self.swarm.add(first)
+        self.swarm.add(last)
+        self.swarm.fixed_update(self.dt)
+
+        self.swarm.remove(first)
+
+        self.assertIsNone(first.slot)
+        self.assertEqual(last.slot, 0)
+        self.assertEqual(self.swarm.count, 1)
+        self.assertNotEqual(first.velocity, Vec3(0, 0, 0))
+
+if __name__ == '__main__':
+    unittest.main()
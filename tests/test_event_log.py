@@ -0,0 +1,102 @@
+import json
+import os
+import tempfile
+import unittest
+
+from unittest.mock import patch
+
+from src.event_log import DEBUG, INFO, EventLog
+
+class TestEventLog(unittest.TestCase):
+    """
+    Unit test class for the background-written, rate-limited EventLog.
+    """
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'game.log')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def read(self, path=None) -> list:
+        with open(path or self.path) as f:
+            return [json.loads(line) for line in f]
+
+    def test_disabled_levels_queue_nothing(self) -> None:
+        """
+        Tests that records below the level never reach the queue or start the writer.
+        """
+        log = EventLog(self.path, level=INFO)
+        log.debug('enemy_shot')
+
+        self.assertTrue(log.queue.empty())
+        self.assertIsNone(log.writer)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_records_are_written_as_json_lines(self) -> None:
+        """
+        Tests that an enabled record is written with its level, event name and fields.
+        """
+        log = EventLog(self.path, level=DEBUG)
+        log.debug('player_damaged', amount=10, health=90)
+        log.info('wave_spawned', wave=2)
+        log.close()
+
+        records = self.read()
+        self.assertEqual([record['event'] for record in records], ['player_damaged', 'wave_spawned'])
+        self.assertEqual((records[0]['level'], records[0]['amount'], records[0]['health']), ('debug', 10, 90))
+
+    def test_noisy_events_are_rate_limited(self) -> None:
+        """
+        Tests that an event is cut off at the rate limit without limiting other events.
+        """
+        log = EventLog(self.path, level=DEBUG, rate_limit=5)
+        for _ in range(100):
+            log.debug('enemy_shot')
+        log.info('enemy_died')
+        log.close()
+
+        records = self.read()
+        events = [record['event'] for record in records]
+        self.assertLessEqual(events.count('enemy_shot'), 10)  # At most two one-second windows
+        self.assertEqual(events.count('enemy_died'), 1)
+
+        # The drops at the end of the burst are reported even though enemy_shot is not logged again
+        dropped = sum(record['dropped'] for record in records if record['event'] == 'rate_limited')
+        self.assertEqual(dropped + events.count('enemy_shot'), 100)
+
+    def test_drops_are_reported_when_the_second_rolls_over(self) -> None:
+        """
+        Tests that an event's drops are queued as soon as any record is logged in a later second.
+        """
+        log = EventLog(self.path, level=DEBUG, rate_limit=2)
+        with patch('src.event_log.wall_time.time', return_value=100.5):
+            for _ in range(5):
+                log.debug('enemy_shot')
+        with patch('src.event_log.wall_time.time', return_value=101.2):
+            log.info('wave_spawned', wave=2)
+        log.close()
+
+        records = self.read()
+        self.assertEqual([record['event'] for record in records],
+                         ['enemy_shot', 'enemy_shot', 'rate_limited', 'wave_spawned'])
+        self.assertEqual((records[2]['time'], records[2]['dropped']), (101.2, 3))
+
+    def test_file_rotates_at_max_bytes(self) -> None:
+        """
+        Tests that the log rotates into numbered backups and keeps only backup_count of them.
+        """
+        log = EventLog(self.path, level=DEBUG, max_bytes=200, backup_count=2, rate_limit=1000)
+        for index in range(30):
+            log.debug('tick', index=index)
+            log.close()  # One write per record, so every write checks the size
+
+        self.assertTrue(os.path.exists(self.path + '.1'))
+        self.assertTrue(os.path.exists(self.path + '.2'))
+        self.assertFalse(os.path.exists(self.path + '.3'))
+        self.assertEqual(self.read()[-1]['index'], 29)
+        self.assertLessEqual(os.path.getsize(self.path), 200)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import heapq
+import unittest
+
+import numpy as np
+
+from src.flow_field import MOVES, UNREACHED, FlowField, NavGrid
+
+def reference_costs(grid: NavGrid, start: int) -> np.ndarray:
+    """
+    Path costs from one cell by a plain Dijkstra, for comparison.
+    """
+    open_cells, width = grid.open.ravel(), grid.width
+    costs = np.full(open_cells.size, UNREACHED, dtype=np.int32)
+    costs[start] = 0
+    heap = [(0, start)]
+    while heap:
+        cost, cell = heapq.heappop(heap)
+        if cost > costs[cell]:
+            continue
+        for dx, dz, step in MOVES:
+            reached = cell + dx * width + dz
+            if not open_cells[reached] or (dx and dz and not (open_cells[cell + dx * width] and open_cells[cell + dz])):
+                continue
+            if cost + step < costs[reached]:
+                costs[reached] = cost + step
+                heapq.heappush(heap, (cost + step, reached))
+    return costs
+
+class TestFlowField(unittest.TestCase):
+    """
+    Unit test class for the NavGrid and the FlowField swept over it.
+    """
+
+    def setUp(self) -> None:
+        """
+        Builds a 100-unit grid of 4-unit cells with a wall across the x axis in front of the
+        player, a low platform enemies can hover over, and a closed-off pocket.
+        """
+        self.grid = NavGrid(-50, -50, 100, cell_size=4)
+        self.grid.block_box((10, 0, -20, 11, 4, 20))  # Wall
+        self.grid.block_box((-30, 0, -30, -20, 1.2, -20))  # Platform, lower than any enemy hovers
+        for box in ((-44, 0, 30, -30, 4, 31), (-44, 0, 43, -30, 4, 44), (-45, 0, 30, -44, 4, 44), (-31, 0, 30, -30, 4, 44)):
+            self.grid.block_box(box)  # Pocket
+        self.field = FlowField(self.grid, budget=4)
+        self.player = (0, 1.5, 0)
+
+    def test_sweep_matches_dijkstra(self) -> None:
+        """
+        Tests that a finished sweep has the same path costs as a plain Dijkstra, that every cell's
+        move leads to a neighbour one step cheaper, and that the platform does not block.
+        """
+        self.field.follow(self.player)
+        while self.field.sweeping:
+            self.field.follow(self.player)
+
+        start = self.grid.cell_of(0, 0)
+        np.testing.assert_array_equal(self.field.costs, reference_costs(self.grid, start))
+        width = self.grid.width
+        reached = np.flatnonzero((self.field.costs != UNREACHED) & (self.field.costs > 0))
+        for cell in reached.tolist():
+            dx, dz, step = MOVES[self.field.moves[cell]]
+            self.assertEqual(self.field.costs[cell - dx * width - dz], self.field.costs[cell] - step)
+        self.assertNotEqual(self.field.costs[self.grid.cell_of(-25, -25)], UNREACHED)
+        self.assertEqual(self.field.costs[self.grid.cell_of(-37, 37)], UNREACHED)
+
+    def test_steers_only_around_walls(self) -> None:
+        """
+        Tests that positions with a clear way to the player are left to head straight for it,
+        while one behind the wall is sent along it, and positions off the grid or in the pocket
+        are left alone.
+        """
+        self.field.follow(self.player)
+        self.field.advance()
+        positions = np.array([
+            (-20, 3, 10), (0, 3, -30),  # Open ground
+            (30, 3, 0),  # Behind the wall
+            (80, 3, 0), (-37, 3, 37),  # Off the grid, in the pocket
+        ], dtype=np.float32)
+
+        directions, steered = self.field.sample(positions)
+
+        self.assertEqual(steered.tolist(), [False, False, True, False, False])
+        self.assertGreater(abs(directions[2, 1]), 0.5)  # Along the wall rather than into it
+
+    def test_sweeps_only_when_the_player_changes_cell(self) -> None:
+        """
+        Tests that a new sweep starts only when the player moves into another cell, and that
+        while it is under way, settled cells are read from it and the rest from the last field.
+        """
+        self.field.follow(self.player)
+        self.field.advance()
+        self.field.follow((1, 1.5, 1))  # Same cell
+        self.assertEqual(self.field.sweeps, 1)
+        self.assertFalse(self.field.sweeping)
+
+        self.field.follow((-30, 1.5, 0))  # Into another cell
+        self.assertEqual(self.field.sweeps, 2)
+        self.assertTrue(self.field.sweeping)
+        near, far = (-38, 3, 0), (30, 3, 0)
+        _, steered = self.field.sample(np.array([near, far], dtype=np.float32))
+        self.assertFalse(steered[0])  # Settled by the new sweep, with a clear way to the player
+        self.assertTrue(steered[1])  # Still from the finished field, behind the wall
+        self.assertEqual(self.field.sweep_costs[self.grid.cell_of(*far[::2])], UNREACHED)
+
+        while not self.field.advance(1):
+            pass
+        self.assertEqual(self.field.target, self.grid.cell_of(-30, 0))
+
+    def test_no_grid_never_steers(self) -> None:
+        """
+        Tests that a field without a grid leaves every enemy heading straight for the player.
+        """
+        field = FlowField()
+        field.follow(self.player)
+        _, steered = field.sample(np.zeros((3, 3), dtype=np.float32))
+        self.assertFalse(steered.any())
+
+if __name__ == '__main__':
+    unittest.main()
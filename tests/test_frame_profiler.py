@@ -0,0 +1,73 @@
+import unittest
+
+from src.frame_profiler import FrameProfiler, frame_profiler, profiled
+
+class Subsystem:
+    """
+    Stand-in for an instrumented subsystem.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    @profiled('Subsystem.update')
+    def update(self) -> int:
+        self.calls += 1
+        return self.calls
+
+class TestFrameProfiler(unittest.TestCase):
+    """
+    Unit test class for the FrameProfiler's rolling history and the profiled decorator.
+    """
+
+    def tearDown(self) -> None:
+        frame_profiler.set_enabled(False)
+
+    def test_decorator_records_only_while_enabled(self) -> None:
+        """
+        Tests that instrumented methods still run and return while disabled, and are timed once enabled.
+        """
+        subsystem = Subsystem()
+
+        self.assertEqual(subsystem.update(), 1)
+        self.assertNotIn('Subsystem.update', frame_profiler.current)
+
+        frame_profiler.set_enabled(True)
+        subsystem.update()
+        subsystem.update()
+        self.assertIn('Subsystem.update', frame_profiler.current)
+        self.assertEqual(subsystem.calls, 3)
+
+    def test_history_rolls_and_fills_missing_frames_with_zero(self) -> None:
+        """
+        Tests that the history keeps only the last frames and that a section that did not run in
+        a frame records zero for it.
+        """
+        profiler = FrameProfiler(history=4)
+        for ms in (1, 2, 3, 4, 5, 6):
+            profiler.add('a', ms / 1000)
+            profiler.end_frame()
+        profiler.add('b', 0.001)
+        profiler.end_frame()
+
+        self.assertEqual(sorted(profiler.samples('a').round(3).tolist()), [0, 4, 5, 6])
+        self.assertAlmostEqual(profiler.stats('a')['max_ms'], 6, places=3)
+        self.assertEqual(len(profiler.samples('b')), 4)
+
+    def test_histogram_buckets_sum_to_one(self) -> None:
+        """
+        Tests that the histogram is a distribution over the buckets, with slow frames in the last one.
+        """
+        profiler = FrameProfiler(history=10)
+        for ms in (0.05, 0.05, 3, 100):
+            profiler.add('a', ms / 1000)
+            profiler.end_frame()
+
+        histogram = profiler.histogram('a')
+
+        self.assertAlmostEqual(histogram.sum(), 1.0)
+        self.assertAlmostEqual(histogram[0], 0.5)
+        self.assertAlmostEqual(histogram[-1], 0.25)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+from src.headless import InputScript
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Ursina allows one app per process, so simulations run in a child process
+SIMULATION = """
+import json, sys
+sys.path.insert(0, {root!r})
+from src.headless import HeadlessGame, InputScript
+game = HeadlessGame(seed=0)
+game.state_machine.max_health = 10 ** 9  # Survive the whole run, whatever the enemies hit
+game.start()
+summary = game.run(900, InputScript().hold(0, 'left mouse', 900).hold(0, 'w', 10))
+summary['player_z'] = game.player.z
+print(json.dumps(summary))
+"""
+
+class TestHeadless(unittest.TestCase):
+    """
+    Unit test class for the headless simulation mode and its scripted input.
+    """
+
+    def test_script_orders_events_by_frame(self) -> None:
+        """
+        Tests that hold() schedules a press and a matching release and look() is kept per frame.
+        """
+        script = InputScript().hold(5, 'w', 10).look(5, 0.1, 0)
+
+        self.assertEqual(script.events[5], [('press', 'w'), ('look', (0.1, 0))])
+        self.assertEqual(script.events[15], [('release', 'w')])
+
+    def test_simulation_runs_faster_than_real_time(self) -> None:
+        """
+        Tests that a scripted headless game moves the player, kills enemies and runs faster than real time.
+        """
+        result = subprocess.run(
+            [sys.executable, '-c', SIMULATION.format(root=ROOT_DIR)],
+            cwd=ROOT_DIR, capture_output=True, text=True, timeout=300,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+        summary = json.loads(result.stdout.strip().splitlines()[-1])
+
+        self.assertEqual(summary['frames'], 900)
+        self.assertAlmostEqual(summary['simulated_seconds'], 15.0)
+        self.assertGreater(summary['speedup'], 1.0)
+        self.assertGreater(summary['kills'], 0)
+        self.assertGreater(summary['player_z'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
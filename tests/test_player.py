@@ -3,12 +3,15 @@ import time
 
 import unittest
 
+import numpy as np
+
 from unittest.mock import patch, MagicMock
 from ursina import *
 
 from src.player import Player
 from src.state import StateMachine
 from src.ui import UIManager
+from src.static_world import static_world
 
 class TestPlayer(unittest.TestCase):
     """
@@ -63,13 +66,33 @@ class TestPlayer(unittest.TestCase):
         # Manually set time.dt to simulate a time step (simulate 60 FPS)
         time.dt = 1 / 60  
 
-        # Run the game loop for a short time to simulate movement
+        # Run the simulation for a short time to simulate movement; movement runs in fixed steps
         for i in range(10):
-            self.player.update()
+            self.player.fixed_update(time.dt)
             print(f"Frame {i}: Player Position: {self.player.position}, Velocity: {self.player.velocity}")
 
         # Check that the player's position has changed
         self.assertNotEqual(self.player.position, initial_position)
 
+    def test_static_world_stops_and_grounds(self) -> None:
+        """
+        Tests that the player lands on the static ground and stops at a static wall instead of
+        passing through it.
+        """
+        static_world.reset(64)
+        static_world.add_chunk((0, 0), np.array([(3, 0, -10, 4, 4, 10)]), (-32, -32, 32, 32))
+        try:
+            self.player.position = Vec3(0, 1.5, 0)
+            self.player.velocity = Vec3(20, 0, 0)
+            for _ in range(60):
+                self.player.fixed_update(1 / 60)
+
+            self.assertTrue(self.player.grounded)
+            self.assertAlmostEqual(self.player.y, 1.0)
+            self.assertLess(self.player.x + 0.5, 3)
+            self.assertEqual(self.player.velocity.x, 0)
+        finally:
+            static_world.reset()
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
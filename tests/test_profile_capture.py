@@ -0,0 +1,81 @@
+import cProfile
+import os
+import pstats
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from src.profile_capture import collapsed_stacks
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Ursina allows one app per process, so the capture runs in a child process
+CAPTURE = """
+import sys
+sys.path.insert(0, {root!r})
+from src.headless import HeadlessGame
+from src.profile_capture import ProfileCapture
+game = HeadlessGame(seed=0)
+game.start()
+capture = ProfileCapture(output_dir={output_dir!r})
+capture.start(30, delay=60, name='wave')
+game.run(200)
+print(capture.last_capture)
+"""
+
+def leaf(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+def branch() -> int:
+    return leaf(20000) + leaf(20000)
+
+def trunk() -> int:
+    return branch() + leaf(20000)
+
+class TestProfileCapture(unittest.TestCase):
+    """
+    Unit test class for cProfile captures and their collapsed-stack output.
+    """
+
+    def test_collapsed_stacks_follow_the_call_graph(self) -> None:
+        """
+        Tests that time in a function called from two places is split between both stacks.
+        """
+        profiler = cProfile.Profile()
+        profiler.runcall(trunk)
+        stacks = collapsed_stacks(pstats.Stats(profiler))
+
+        leaf_stacks = [stack for stack in stacks if stack.split(';')[-1].startswith('leaf ')]
+        self.assertEqual(len(leaf_stacks), 2)
+        branch_leaf = next(stack for stack in leaf_stacks if 'branch' in stack)
+        trunk_leaf = next(stack for stack in leaf_stacks if 'branch' not in stack)
+        self.assertTrue(branch_leaf.split(';')[0].startswith('trunk '))
+        self.assertGreater(stacks[branch_leaf], stacks[trunk_leaf])  # Called twice as often
+
+    def test_headless_capture_writes_prof_and_collapsed_files(self) -> None:
+        """
+        Tests that a capture scheduled into a headless run stops on its own and writes both files.
+        """
+        with tempfile.TemporaryDirectory() as output_dir:
+            result = subprocess.run(
+                [sys.executable, '-c', CAPTURE.format(root=ROOT_DIR, output_dir=output_dir)],
+                cwd=ROOT_DIR, capture_output=True, text=True, timeout=300,
+            )
+            self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+
+            prof_path = os.path.join(output_dir, 'wave.prof')
+            stats = pstats.Stats(prof_path)
+            steps = [entry[1] for function, entry in stats.stats.items() if function[2] == 'step' and 'headless' in function[0]]
+            self.assertEqual(steps, [30])
+
+            with open(os.path.join(output_dir, 'wave.collapsed')) as f:
+                lines = f.read().splitlines()
+            self.assertTrue(lines)
+            for line in lines:
+                stack, count = line.rsplit(' ', 1)
+                self.assertTrue(stack)
+                self.assertGreater(int(count), 0)
+
+if __name__ == '__main__':
+    unittest.main()
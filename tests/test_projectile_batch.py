@@ -0,0 +1,68 @@
+import unittest
+
+import numpy as np
+from ursina import Vec3, destroy
+
+from src.projectile_batch import VERTEX_DTYPE
+from src.projectile_system import ProjectileSystem
+from src.enums.collision_layer import CollisionLayer
+from src.spatial_hash import collision_grid
+from tests.test_projectile_system import FakeAnchor, FakeProjectile
+
+class TestProjectileBatch(unittest.TestCase):
+    """
+    Unit test class for drawing projectiles as one batched point-sprite mesh.
+    """
+
+    def setUp(self) -> None:
+        collision_grid.clear()
+        self.system = ProjectileSystem(capacity=2, batched=True)
+        self.anchor = FakeAnchor()
+
+    def tearDown(self) -> None:
+        destroy(self.system)
+        collision_grid.clear()
+
+    def spawn(self, x: float, size: float, color) -> FakeProjectile:
+        projectile = FakeProjectile(self.system)
+        self.system.spawn(projectile, Vec3(x, 0, 0), Vec3(0, 0, 1), 4, 10, CollisionLayer.PLAYER_BULLET,
+                          ttl=5.0, max_range=100, anchor=self.anchor, size=size, color=color)
+        return projectile
+
+    def drawn(self) -> np.ndarray:
+        return np.frombuffer(memoryview(self.system.batch.vertex_data.getArray(0)).tobytes(), dtype=VERTEX_DTYPE)
+
+    def test_live_projectiles_are_one_mesh(self) -> None:
+        """
+        Tests that every live projectile is a vertex of the one mesh, drawn between steps with its
+        own size and color, and that the entities themselves are left where they were.
+        """
+        projectiles = [self.spawn(x, 0.1 * (x + 1), (1, 0, x / 2, 1)) for x in range(3)]
+        self.system.fixed_update(0.5)
+        self.system.interpolate(0.5)
+
+        vertices = self.drawn()
+        self.assertEqual(self.system.batch.mesh.node().getNumGeoms(), 1)
+        self.assertEqual(len(vertices), 3)
+        np.testing.assert_allclose(vertices['position'], [(0, 0, 1), (1, 0, 1), (2, 0, 1)])
+        np.testing.assert_allclose(vertices['size'], [0.05, 0.1, 0.15], rtol=1e-6)
+        np.testing.assert_array_equal(vertices['color'][:, 2], [0, 128, 255])
+        for projectile in projectiles:
+            self.assertEqual(projectile.position, Vec3(0, 0, 0))
+
+    def test_removed_projectiles_leave_the_mesh(self) -> None:
+        """
+        Tests that the mesh shrinks as projectiles are removed and is empty when none are left.
+        """
+        projectiles = [self.spawn(x, 0.1, (1, 0, 0, 1)) for x in range(3)]
+        projectiles[0].despawn()
+        self.system.interpolate(0.0)
+        np.testing.assert_allclose(sorted(self.drawn()['position'][:, 0]), [1, 2])
+
+        for projectile in projectiles[1:]:
+            projectile.despawn()
+        self.system.interpolate(0.0)
+        self.assertEqual(len(self.drawn()), 0)
+
+if __name__ == '__main__':
+    unittest.main()
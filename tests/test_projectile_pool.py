@@ -0,0 +1,107 @@
+import unittest
+
+from src.enemy import EnemyBullet
+from src.projectile_pool import ProjectilePool
+from src.spatial_hash import collision_grid
+from src.enums.overflow_policy import OverflowPolicy
+
+class FakeProjectile:
+    """
+    Minimal stand-in for a Bullet that records how the pool drives it.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = True
+        self.released = 0
+        self.position = None
+
+    def reset(self, position=None) -> None:
+        self.position = position
+
+    def on_release(self) -> None:
+        self.released += 1
+
+class TestProjectilePool(unittest.TestCase):
+    """
+    Unit test class for the ProjectilePool used by Bullet and EnemyBullet.
+    """
+
+    def test_prewarm_allocates_disabled_projectiles(self) -> None:
+        """
+        Tests that prewarming fills the free list with disabled, released projectiles.
+        """
+        pool = ProjectilePool(FakeProjectile, capacity=3)
+        pool.prewarm()
+
+        self.assertEqual(len(pool.free), 3)
+        self.assertTrue(all(not p.enabled and p.released == 1 for p in pool.free))
+
+    def test_acquire_and_release_reuse_projectiles(self) -> None:
+        """
+        Tests that a released projectile is handed out again and counted as a hit.
+        """
+        pool = ProjectilePool(FakeProjectile, capacity=1)
+        pool.prewarm()
+
+        first = pool.acquire(position=1)
+        pool.release(first)
+        pool.release(first)  # Double release is ignored
+        second = pool.acquire(position=2)
+
+        self.assertIs(first, second)
+        self.assertTrue(second.enabled)
+        self.assertEqual(second.position, 2)
+        self.assertEqual(pool.stats()['hits'], 2)
+        self.assertEqual(pool.stats()['free'], 0)
+
+    def test_overflow_policies(self) -> None:
+        """
+        Tests the GROW, DROP and RECYCLE_OLDEST overflow policies when the pool is exhausted.
+        """
+        grow = ProjectilePool(FakeProjectile, capacity=1, overflow=OverflowPolicy.GROW)
+        grow.acquire()
+        self.assertIsNotNone(grow.acquire())
+        self.assertEqual(grow.stats()['allocated'], 2)
+
+        drop = ProjectilePool(FakeProjectile, capacity=1, overflow=OverflowPolicy.DROP)
+        drop.acquire()
+        self.assertIsNone(drop.acquire())
+        self.assertEqual(drop.stats()['dropped'], 1)
+
+        recycle = ProjectilePool(FakeProjectile, capacity=2, overflow=OverflowPolicy.RECYCLE_OLDEST)
+        oldest = recycle.acquire()
+        recycle.acquire()
+        self.assertIs(recycle.acquire(), oldest)
+        self.assertEqual(recycle.stats()['recycled'], 1)
+
+    def test_high_water_mark(self) -> None:
+        """
+        Tests that the high-water mark tracks the most projectiles live at once.
+        """
+        pool = ProjectilePool(FakeProjectile, capacity=4)
+        live = [pool.acquire() for _ in range(3)]
+        for projectile in live:
+            pool.release(projectile)
+        pool.acquire()
+
+        self.assertEqual(pool.stats()['high_water'], 3)
+        self.assertEqual(pool.stats()['misses'], 3)
+
+    def test_enemy_bullet_without_a_player_stays_out_of_play(self) -> None:
+        """
+        Tests that an enemy bullet fired with no player to fly at is never put in the broadphase
+        grid, and goes straight back to its pool.
+        """
+        pool = ProjectilePool(EnemyBullet, capacity=1)
+        pool.prewarm()
+
+        bullet = pool.acquire(player=None)
+        self.assertNotIn(bullet, collision_grid)
+        self.assertEqual(pool.stats()['free'], 1)
+
+        loose = EnemyBullet(player=None)
+        self.addCleanup(loose.on_destroy)
+        self.assertNotIn(loose, collision_grid)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+
+from ursina import Vec3
+
+from src.projectile_system import ProjectileSystem
+from src.enums.collision_layer import CollisionLayer
+from src.spatial_hash import collision_grid
+
+class FakeAnchor:
+    """
+    Stand-in for the camera or player that projectiles measure their range against.
+    """
+
+    def __init__(self, position=Vec3(0, 0, 0)) -> None:
+        self.world_position = position
+        self.enabled = True
+
+class FakeProjectile:
+    """
+    Stand-in for a Bullet that only records the position written back by the system.
+    """
+
+    def __init__(self, system: ProjectileSystem) -> None:
+        self.system = system
+        self.slot = None
+        self.position = Vec3(0, 0, 0)
+        self.despawned = False
+
+    def setPos(self, x, y, z) -> None:
+        self.position = Vec3(x, y, z)
+
+    def despawn(self) -> None:
+        self.despawned = True
+        self.system.remove(self)
+
+class TestProjectileSystem(unittest.TestCase):
+    """
+    Unit test class for the batched ProjectileSystem.
+    """
+
+    def setUp(self) -> None:
+        """
+        Creates a small system so that growing the buffers is exercised.
+        """
+        collision_grid.clear()
+        self.system = ProjectileSystem(capacity=2)
+        self.anchor = FakeAnchor()
+        self.dt = 0.5
+
+    def tearDown(self) -> None:
+        collision_grid.clear()
+
+    def spawn(self, direction=Vec3(0, 0, 1), speed=10, ttl=5.0, max_range=100) -> FakeProjectile:
+        projectile = FakeProjectile(self.system)
+        self.system.spawn(projectile, Vec3(0, 0, 0), direction, speed, 10, CollisionLayer.PLAYER_BULLET,
+                          ttl=ttl, max_range=max_range, anchor=self.anchor)
+        return projectile
+
+    def test_update_advances_all_projectiles(self) -> None:
+        """
+        Tests that one step moves every projectile by direction * speed * dt and writes it back.
+        """
+        projectiles = [self.spawn(direction=Vec3(1, 0, 0), speed=s) for s in (2, 4, 6)]
+
+        self.system.fixed_update(self.dt)
+        self.system.interpolate(1.0)
+
+        self.assertEqual(self.system.capacity, 4)
+        for projectile, speed in zip(projectiles, (2, 4, 6)):
+            self.assertAlmostEqual(projectile.position.x, speed * 0.5)
+
+    def test_interpolate_draws_between_steps(self) -> None:
+        """
+        Tests that drawing part way through a step places projectiles between their last two positions.
+        """
+        projectile = self.spawn(direction=Vec3(1, 0, 0), speed=4)
+
+        self.system.fixed_update(self.dt)
+        self.system.interpolate(0.25)
+
+        self.assertAlmostEqual(projectile.position.x, 0.5)
+
+    def test_update_culls_by_range_and_ttl(self) -> None:
+        """
+        Tests that projectiles out of range or past their time-to-live despawn and free their slot.
+        """
+        out_of_range = self.spawn(speed=100, max_range=10)
+        expired = self.spawn(ttl=0.25)
+        alive = self.spawn()
+
+        self.system.fixed_update(self.dt)
+
+        self.assertTrue(out_of_range.despawned)
+        self.assertTrue(expired.despawned)
+        self.assertFalse(alive.despawned)
+        self.assertEqual(self.system.count, 1)
+        self.assertEqual(alive.slot, 0)
+
+    def test_disabled_anchor_culls_its_projectiles(self) -> None:
+        """
+        Tests that projectiles anchored to a disabled entity (a dead player) despawn.
+        """
+        projectile = self.spawn()
+        self.anchor.enabled = False
+
+        self.system.fixed_update(self.dt)
+
+        self.assertTrue(projectile.despawned)
+
+if __name__ == '__main__':
+    unittest.main()
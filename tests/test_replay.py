@@ -0,0 +1,147 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.enums.spawn_pattern import SpawnPattern
+from src.replay import FRAME_DTYPE, HEADER, REPLAY_MAGIC, ReplayError, pack_replay, unpack_replay
+from src.rng import RandomStreams
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Ursina allows one app per process, so the run is recorded in one child process and replayed
+# in another. The summary is taken the same way in both
+SUMMARY = """
+from src.replay import run_result
+from src.simulation_loop import SimulationLoop
+loop = SimulationLoop.instance()
+enemies = [loop.simulated_position(enemy) for enemy in manager.enemies]
+print(json.dumps(dict(run_result(manager), frames=frames, steps=loop.steps - first_step,
+                      enemies=np.float32(enemies).tobytes().hex())))
+"""
+RECORD = """
+import json, sys
+import numpy as np
+sys.path.insert(0, {root!r})
+from src.headless import HeadlessGame, InputScript
+from src.replay import InputRecorder
+from src.simulation_loop import SimulationLoop
+from src.enums.spawn_pattern import SpawnPattern
+game = HeadlessGame(seed=11)
+game.state_machine.max_health = 10 ** 6  # Outlive the recording, so enemies are left to compare
+manager = game.game_manager
+manager.spawn_pattern = SpawnPattern.SCATTER
+manager.recorder = InputRecorder({path!r})
+game.run(7)  # The recording starts partway through a session
+first_step = SimulationLoop.instance().steps
+game.start()
+script = InputScript().hold(0, 'left mouse', 900).hold(20, 'w', 60).hold(150, 'd', 40).hold(300, 'space', 5)
+for frame in range(0, 900, 45):
+    script.look(frame, 0.02, 0.002 * (frame % 5 - 2))
+frames = game.run(900, script)['frames']
+manager.recorder.stop()
+""" + SUMMARY
+REPLAY = """
+import json, sys
+import numpy as np
+sys.path.insert(0, {root!r})
+from src.main import run_replay
+from src.headless import HeadlessGame
+from src.simulation_loop import SimulationLoop
+first_step = SimulationLoop.instance().steps
+summary = run_replay({path!r})
+manager, frames = HeadlessGame._world[1], summary['frames']
+print(json.dumps(summary['mismatches']))
+""" + SUMMARY
+
+def sample_recording() -> dict:
+    frames = np.zeros(4, dtype=FRAME_DTYPE)
+    frames['dt'] = (1 / 60, 1 / 59, 1 / 61, 1 / 60)
+    frames['clock'] = np.cumsum(frames['dt']) + 10
+    frames['mouse'] = [(0.01, 0), (0, -0.02), (0, 0), (0.5, 0.5)]
+    frames['keys'] = (0, 1, 33, 63)
+    frames['spawns'] = (3, 2, 0, 0)
+    return {
+        'seed': 2 ** 62 + 5,
+        'time': 12.5,
+        'accumulator': 0.004,
+        'clock': 10.0,
+        'pattern': SpawnPattern.RING,
+        'max_health': 250,
+        'frames': frames,
+        'result': {'wave': 3, 'health': 40, 'kills': 7, 'position': (1.5, 1.0, -2.25)},
+    }
+
+class TestReplay(unittest.TestCase):
+    """
+    Unit test class for the random streams, the input recording format and replaying a run.
+    """
+
+    def test_streams_are_seeded_and_independent(self) -> None:
+        """
+        Tests that a seed gives the same numbers every time, and that drawing from one stream
+        does not change what another one gives.
+        """
+        streams = RandomStreams(5)
+        first = [streams.stream('enemy').random() for _ in range(3)]
+        streams.seed(5)
+        streams.stream('spawn').random()
+        self.assertEqual([streams.stream('enemy').random() for _ in range(3)], first)
+        self.assertNotEqual(RandomStreams(6).stream('enemy').random(), first[0])
+        self.assertIsInstance(RandomStreams().current_seed, int)
+
+    def test_round_trip(self) -> None:
+        """
+        Tests that a recording unpacks to what was packed, and that repeated frames compress well.
+        """
+        recording = sample_recording()
+        restored = unpack_replay(pack_replay(recording))
+
+        for key in ('seed', 'time', 'accumulator', 'clock', 'pattern', 'max_health', 'result'):
+            self.assertEqual(restored[key], recording[key], key)
+        self.assertEqual(restored['frames'].tobytes(), recording['frames'].tobytes())
+
+        recording['frames'] = np.repeat(recording['frames'][:1], 3600)
+        self.assertLess(len(pack_replay(recording)), 3600 * FRAME_DTYPE.itemsize / 20)
+
+    def test_bad_data_is_rejected(self) -> None:
+        """
+        Tests that data of another format or version, cut short or damaged raises a ReplayError.
+        """
+        data = pack_replay(sample_recording())
+        damaged = bytearray(data)
+        damaged[-6] ^= 0xFF
+        other_version = HEADER.pack(REPLAY_MAGIC, 99) + data[HEADER.size:]
+
+        for bad in (b'SNAP' + data[4:], other_version, data[:-10], bytes(damaged), data[:4]):
+            with self.assertRaises(ReplayError):
+                unpack_replay(bad)
+
+    def test_replay_repeats_the_run(self) -> None:
+        """
+        Tests that a run recorded in one process and replayed in another ends the same: same
+        frames and simulation steps, wave, health, kills, player and every enemy's position.
+        """
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'run.replay')
+            summaries = []
+            for child in (RECORD, REPLAY):
+                result = subprocess.run(
+                    [sys.executable, '-c', child.format(root=ROOT_DIR, path=path)],
+                    cwd=ROOT_DIR, capture_output=True, text=True, timeout=300,
+                )
+                self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+                summaries.append(result.stdout.strip().splitlines())
+
+        recorded, replayed = json.loads(summaries[0][-1]), json.loads(summaries[1][-1])
+        self.assertEqual(json.loads(summaries[1][-2]), [])  # The replay found no mismatch itself
+        self.assertEqual(recorded, replayed)
+        self.assertGreater(recorded['kills'], 0)
+        self.assertTrue(recorded['enemies'])
+
+if __name__ == '__main__':
+    unittest.main()
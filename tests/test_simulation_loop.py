@@ -0,0 +1,102 @@
+import unittest
+
+from ursina import Entity, Vec3, destroy
+
+from src.simulation_loop import ManualClock, SimulationLoop
+
+class Mover(Entity):
+    """
+    Entity that moves along x at a constant speed in fixed steps and records each dt.
+    """
+
+    def __init__(self, speed: float = 10, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.speed = speed
+        self.steps = []
+
+    def fixed_update(self, dt: float) -> None:
+        self.steps.append(dt)
+        self.x += self.speed * dt
+
+class TestSimulationLoop(unittest.TestCase):
+    """
+    Unit test class for the fixed-timestep SimulationLoop, driven by a manual clock.
+    """
+
+    def setUp(self) -> None:
+        self.clock = ManualClock()
+        self.loop = SimulationLoop(rate=10, clock=self.clock, eternal=False)
+        self.mover = Mover()
+        self.loop.register(self.mover)
+        self.loop.track(self.mover)
+        self.loop.update()  # The first frame only starts the clock
+
+    def tearDown(self) -> None:
+        destroy(self.mover)
+        destroy(self.loop)
+
+    def test_steps_are_fixed_whatever_the_frame_time(self) -> None:
+        """
+        Tests that elapsed time is consumed in whole fixed steps and the remainder carried over.
+        """
+        for frame_time in (0.25, 0.03, 0.07, 0.15):
+            self.clock.advance(frame_time)
+            self.loop.update()
+
+        self.assertEqual(self.mover.steps, [0.1] * 5)
+        self.assertAlmostEqual(self.loop.time, 0.5)
+        self.assertAlmostEqual(self.loop.alpha, 0.0, places=5)
+
+    def test_only_registered_entities_are_stepped(self) -> None:
+        """
+        Tests that an entity is stepped only while registered, however many others are in the scene.
+        """
+        bystander = Mover()
+        self.addCleanup(destroy, bystander)
+        self.clock.advance(0.1)
+        self.loop.update()
+        self.loop.unregister(self.mover)
+        self.clock.advance(0.1)
+        self.loop.update()
+
+        self.assertEqual(self.mover.steps, [0.1])
+        self.assertEqual(bystander.steps, [])
+
+    def test_long_frames_are_capped(self) -> None:
+        """
+        Tests that a long stall runs at most MAX_STEPS_PER_FRAME steps instead of catching up.
+        """
+        self.clock.advance(60)
+        self.loop.update()
+
+        self.assertEqual(len(self.mover.steps), 8)
+
+    def test_tracked_entities_are_drawn_between_steps(self) -> None:
+        """
+        Tests that a tracked entity is drawn at alpha between its last two simulated positions and
+        that the simulation resumes from the simulated position, not the drawn one.
+        """
+        self.clock.advance(0.125)
+        self.loop.update()
+        self.assertAlmostEqual(self.mover.x, 0.25, places=4)  # A quarter of the way through the first step
+
+        self.clock.advance(0.1)
+        self.loop.update()
+        self.assertAlmostEqual(self.mover.x, 1.25, places=4)
+        self.assertEqual(len(self.mover.steps), 2)
+
+    def test_moving_an_entity_outside_the_simulation_is_not_interpolated(self) -> None:
+        """
+        Tests that a tracked entity moved between frames is interpolated from its new position.
+        """
+        self.clock.advance(0.1)
+        self.loop.update()
+        self.mover.position = Vec3(50, 0, 0)
+
+        self.clock.advance(0.15)
+        self.loop.update()
+
+        self.assertAlmostEqual(self.mover.x, 50.5, places=4)
+
+if __name__ == '__main__':
+    unittest.main()
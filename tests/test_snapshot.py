@@ -0,0 +1,144 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.snapshot import (
+    CHECKSUM, ENEMY_DTYPE, GAME, HEADER, SNAPSHOT_MAGIC, SnapshotError, SnapshotWriter, load_snapshot,
+    pack_snapshot, unpack_snapshot,
+)
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Ursina allows one app per process, so the game is saved and restored in a child process
+ROUND_TRIP = """
+import json, sys
+sys.path.insert(0, {root!r})
+from src.headless import HeadlessGame, InputScript
+from src.snapshot import load_snapshot, snapshot_writer
+game = HeadlessGame(seed=0)
+game.start()
+manager = game.game_manager
+manager.autosave = {path!r}
+game.run(400, InputScript().hold(0, 'left mouse', 400).hold(0, 'w', 20).look(30, 0.05, 0.02))
+snapshot_writer.close()
+saved = load_snapshot({path!r})
+manager.restore(saved)
+restored = manager.snapshot()
+print(json.dumps({{
+    'wave': [int(saved['wave']), manager.current_wave],
+    'kills': [int(saved['kills']), game.state_machine.kills],
+    'player': [list(saved['player']['position']), list(restored['player']['position'])],
+    'look': [list(saved['player']['look']), list(restored['player']['look'])],
+    'enemies': [saved['enemies'].tobytes().hex(), restored['enemies'].tobytes().hex()],
+    'spawns': [len(saved['spawns']), manager.spawn_queue.depth],
+}}))
+"""
+
+def sample_snapshot() -> dict:
+    enemies = np.zeros(3, dtype=ENEMY_DTYPE)
+    enemies['position'] = [(1, 2, 3), (-4, 5, 6), (7, 2, -8)]
+    enemies['velocity'] = [(0.5, 0, -0.5), (0, 0, 0), (1, 0, 1)]
+    enemies['health'] = (100, 60, 20)
+    enemies['max_health'] = 100
+    enemies['size'] = (3, 7, 12)
+    enemies['speed'] = (4, 8, 12)
+    enemies['hover_height'] = (2, 3, 5)
+    enemies['friction'] = (0.1, 0.2, 0.3)
+    return {
+        'wave': 12,
+        'health': 70,
+        'max_health': 100,
+        'kills': 66,
+        'player': {
+            'position': (1.5, 1.0, -3.25),
+            'rotation': (0.0, 0.0, 0.0),
+            'look': (-10.0, 45.0),
+            'velocity': (2.0, 0.0, -1.0),
+            'grounded': True,
+        },
+        'enemies': enemies,
+        'spawns': np.array([(0, 0, 20), (5, 0, 20)], dtype=np.float32),
+    }
+
+class TestSnapshot(unittest.TestCase):
+    """
+    Unit test class for the binary snapshot format and the background snapshot writer.
+    """
+
+    def test_round_trip(self) -> None:
+        """
+        Tests that a snapshot unpacks to what was packed, and that its size is the fixed
+        header and game record plus one record per enemy and queued spawn.
+        """
+        snapshot = sample_snapshot()
+        data = pack_snapshot(snapshot)
+        restored = unpack_snapshot(data)
+
+        self.assertEqual(len(data), HEADER.size + GAME.size + CHECKSUM.size + 3 * ENEMY_DTYPE.itemsize + 2 * 12)
+        for key in ('wave', 'health', 'max_health', 'kills'):
+            self.assertEqual(restored[key], snapshot[key])
+        self.assertEqual(restored['player'], snapshot['player'])
+        self.assertEqual(restored['enemies'].tobytes(), snapshot['enemies'].tobytes())
+        np.testing.assert_array_equal(restored['spawns'], snapshot['spawns'])
+
+    def test_bad_data_is_rejected(self) -> None:
+        """
+        Tests that data of another format or version, cut short or damaged raises a SnapshotError.
+        """
+        data = pack_snapshot(sample_snapshot())
+        damaged = bytearray(data)
+        damaged[40] ^= 0xFF
+        other_version = HEADER.pack(SNAPSHOT_MAGIC, 99) + data[HEADER.size:]
+
+        for bad in (b'PNG' + data[3:], other_version, data[:-10], bytes(damaged), data[:8]):
+            with self.assertRaises(SnapshotError):
+                unpack_snapshot(bad)
+
+    def test_writer_replaces_the_file_whole(self) -> None:
+        """
+        Tests that the writer leaves only the newest of several saves to the same file, with no
+        temporary file behind.
+        """
+        writer = SnapshotWriter()
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'saves', 'test.snap')
+            snapshot = sample_snapshot()
+            for wave in (1, 2, 3):
+                snapshot['wave'] = wave
+                size = writer.save(snapshot, path)
+            writer.close()
+
+            self.assertEqual(os.path.getsize(path), size)
+            self.assertEqual(load_snapshot(path)['wave'], 3)
+            self.assertEqual(os.listdir(os.path.dirname(path)), ['test.snap'])
+            self.assertIn(writer.saved, (1, 2, 3))
+
+    def test_game_is_restored(self) -> None:
+        """
+        Tests that a headless game autosaved when its waves finished spawning is restored with
+        the same wave, kills, player and enemies.
+        """
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'autosave.snap')
+            result = subprocess.run(
+                [sys.executable, '-c', ROUND_TRIP.format(root=ROOT_DIR, path=path)],
+                cwd=ROOT_DIR, capture_output=True, text=True, timeout=300,
+            )
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+        summary = json.loads(result.stdout.strip().splitlines()[-1])
+
+        for key in ('wave', 'kills', 'enemies', 'spawns'):
+            self.assertEqual(summary[key][0], summary[key][1], key)
+        saved, restored = (summary['player'][i] + summary['look'][i] for i in (0, 1))
+        for before, after in zip(saved, restored):
+            self.assertAlmostEqual(before, after, places=4)
+        self.assertGreater(summary['wave'][0], 1)
+        self.assertTrue(summary['enemies'][0])
+
+if __name__ == '__main__':
+    unittest.main()
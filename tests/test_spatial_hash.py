@@ -0,0 +1,65 @@
+import unittest
+
+from ursina import Vec3
+
+from src.spatial_hash import SpatialHash
+from src.enums.collision_layer import CollisionLayer
+
+class TestSpatialHash(unittest.TestCase):
+    """
+    Unit test class for the SpatialHash broadphase grid.
+    """
+
+    def setUp(self) -> None:
+        """
+        Creates an empty grid with 4-unit cells before each test.
+        """
+        self.grid = SpatialHash(cell_size=4.0)
+
+    def test_query_finds_nearby_objects_on_masked_layers(self) -> None:
+        """
+        Tests that a query returns objects in nearby cells on the requested layers only.
+        """
+        self.grid.insert('bullet', Vec3(1, 0, 1), CollisionLayer.PLAYER_BULLET)
+        self.grid.insert('enemy_bullet', Vec3(1, 0, 1), CollisionLayer.ENEMY_BULLET)
+        self.grid.insert('far_bullet', Vec3(40, 0, 40), CollisionLayer.PLAYER_BULLET)
+
+        result = self.grid.query(Vec3(0, 0, 0), 2, CollisionLayer.PLAYER_BULLET)
+
+        self.assertEqual(result, ['bullet'])
+
+    def test_update_moves_object_between_cells(self) -> None:
+        """
+        Tests that updating an object's position re-buckets it and leaves no empty cells behind.
+        """
+        self.grid.insert('enemy', Vec3(0, 0, 0), CollisionLayer.ENEMY)
+        self.grid.update('enemy', Vec3(20, 0, 0))
+
+        self.assertEqual(self.grid.query(Vec3(0, 0, 0), 1, CollisionLayer.ENEMY), [])
+        self.assertEqual(self.grid.query(Vec3(20, 0, 0), 1, CollisionLayer.ENEMY), ['enemy'])
+        self.assertEqual(len(self.grid.cells[CollisionLayer.ENEMY]), 1)
+
+    def test_large_query_matches_cell_probe(self) -> None:
+        """
+        Tests that a query much larger than the occupied area still returns every object in range.
+        """
+        for i in range(5):
+            self.grid.insert(i, Vec3(i * 10, 0, 0), CollisionLayer.ENEMY)
+
+        result = self.grid.query(Vec3(0, 0, 0), 25, CollisionLayer.ENEMY)
+
+        self.assertEqual(sorted(result), [0, 1, 2])
+
+    def test_remove(self) -> None:
+        """
+        Tests that removed objects are no longer returned and that removing twice is harmless.
+        """
+        self.grid.insert('bullet', Vec3(0, 0, 0), CollisionLayer.PLAYER_BULLET)
+        self.grid.remove('bullet')
+        self.grid.remove('bullet')
+
+        self.assertNotIn('bullet', self.grid)
+        self.assertEqual(self.grid.query(Vec3(0, 0, 0), 1, CollisionLayer.PLAYER_BULLET), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import time as wall_time
+import unittest
+
+from ursina import Vec3, destroy, time
+
+from src.enums.spawn_pattern import SpawnPattern
+from src.spawn_queue import SCATTER_RADIUS, SpawnQueue, spawn_positions
+
+class TestSpawnQueue(unittest.TestCase):
+    """
+    Unit test class for the amortized spawn queue and its spawn patterns.
+    """
+
+    def setUp(self) -> None:
+        self.built = []
+        self.dt = time.dt
+        time.dt = 1 / 60
+
+    def tearDown(self) -> None:
+        time.dt = self.dt
+
+    def make_queue(self, cost_ms: float = 0.0, **kwargs) -> SpawnQueue:
+        def spawn(position):
+            if cost_ms:
+                end = wall_time.perf_counter() + cost_ms / 1000
+                while wall_time.perf_counter() < end:
+                    pass
+            self.built.append(position)
+        queue = SpawnQueue(spawn, **kwargs)
+        self.addCleanup(destroy, queue)
+        return queue
+
+    def test_budget_spreads_spawns_over_frames(self) -> None:
+        """
+        Tests that each frame builds spawns in order until its budget is spent, and that the
+        latency of the last spawn counts the frames it waited.
+        """
+        queue = self.make_queue(cost_ms=1.0, budget_ms=2.5)
+        for i in range(10):
+            queue.push(Vec3(i, 0, 0))
+
+        queue.update()
+        self.assertGreaterEqual(len(self.built), 1)
+        self.assertLessEqual(len(self.built), 4)
+        self.assertEqual(queue.depth, 10 - len(self.built))
+
+        frames = 1
+        while queue.depth:
+            queue.update()
+            frames += 1
+        self.assertEqual([position.x for position in self.built], list(range(10)))
+        self.assertGreater(frames, 2)
+        self.assertEqual(queue.stats()['latency_max_frames'], frames)
+
+    def test_every_frame_builds_at_least_one(self) -> None:
+        """
+        Tests that a spawn is built every frame even when one spawn costs more than the budget.
+        """
+        queue = self.make_queue(cost_ms=1.0, budget_ms=0.0)
+        for _ in range(3):
+            queue.push(Vec3(0, 0, 0))
+
+        for built in (1, 2, 3):
+            queue.update()
+            self.assertEqual(len(self.built), built)
+
+    def test_rate_caps_spawns_per_second(self) -> None:
+        """
+        Tests that a rate of 30 a second builds one spawn every other frame at 60 frames a second.
+        """
+        queue = self.make_queue(rate=30)
+        for _ in range(5):
+            queue.push(Vec3(0, 0, 0))
+
+        counts = []
+        for _ in range(6):
+            queue.update()
+            counts.append(len(self.built))
+        self.assertEqual(counts, [0, 1, 1, 2, 2, 3])
+
+    def test_quota_overrides_the_budget(self) -> None:
+        """
+        Tests that a replayed quota builds exactly that many spawns in the next update only, however
+        the budget would have gone, and that each update reports how many it built.
+        """
+        queue = self.make_queue(cost_ms=1.0, budget_ms=0.0)
+        for _ in range(5):
+            queue.push(Vec3(0, 0, 0))
+
+        built = []
+        for quota in (3, None, 0):
+            queue.quota = quota
+            queue.update()
+            built.append(queue.built)
+        self.assertEqual(built, [3, 1, 0])
+        self.assertEqual(queue.depth, 1)
+
+    def test_flush_and_clear(self) -> None:
+        """
+        Tests that flush() builds every queued spawn at once and clear() drops them.
+        """
+        queue = self.make_queue(rate=1)
+        for _ in range(4):
+            queue.push(Vec3(0, 0, 0))
+        queue.flush()
+        self.assertEqual((len(self.built), queue.depth), (4, 0))
+
+        queue.push(Vec3(0, 0, 0))
+        queue.clear()
+        queue.update()
+        self.assertEqual((len(self.built), queue.depth), (4, 0))
+
+    def test_patterns(self) -> None:
+        """
+        Tests that a line is laid out ahead of the centre, a ring keeps its neighbours apart and
+        scattered spawns land between the two scatter radii.
+        """
+        line = spawn_positions(SpawnPattern.LINE, 3)
+        self.assertEqual(line, [Vec3(0, 2, 10), Vec3(5, 2, 10), Vec3(10, 2, 10)])
+
+        ring = spawn_positions(SpawnPattern.RING, 100, center=Vec3(10, 0, 0))
+        self.assertEqual(len(ring), 100)
+        self.assertGreaterEqual((ring[1] - ring[0]).length(), 4.9)
+        self.assertAlmostEqual((ring[0] - Vec3(10, 2, 0)).length(), (ring[50] - Vec3(10, 2, 0)).length(), places=4)
+
+        for position in spawn_positions(SpawnPattern.SCATTER, 50):
+            distance = Vec3(position.x, 0, position.z).length()
+            self.assertGreaterEqual(distance, SCATTER_RADIUS[0] - 1e-4)
+            self.assertLessEqual(distance, SCATTER_RADIUS[1] + 1e-4)
+
+if __name__ == '__main__':
+    unittest.main()
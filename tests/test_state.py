@@ -0,0 +1,87 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+from src.state import StateMachine
+from src.enums.game_state import GameState
+from src.enums.state_event import StateEvent
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# The UI needs an app, and Ursina allows one app per process, so it runs in a child process
+UI_CHANGES = """
+import json, sys
+sys.path.insert(0, {root!r})
+from ursina import destroy
+from src.headless import HeadlessGame
+from src.enums.game_state import GameState
+from src.enums.state_event import StateEvent
+game = HeadlessGame(seed=0)
+game.start()
+ui, state = game.game_manager.ui_manager, game.state_machine
+state.add_kill()
+state.take_damage(25)
+playing = [ui.kill_count_text.text, round(ui.health_bar.scale_x, 4), ui.kill_count_text.visible]
+state.game_state = GameState.GAME_OVER
+game_over = [ui.game_over_screen.enabled, ui.kill_count_text.visible, ui.kills_text.text]
+destroy(ui)
+print(json.dumps([playing, game_over, ui.on_kills in state.subscribers[StateEvent.KILLS]]))
+"""
+
+class TestStateEvents(unittest.TestCase):
+    """
+    Unit test class for StateMachine change notifications and the UI that follows them.
+    """
+
+    def setUp(self) -> None:
+        self.state_machine = StateMachine()
+        self.state_machine.reset_game()
+        self.changes = []
+
+    def record(self, value) -> None:
+        self.changes.append(value)
+
+    def test_subscribers_are_notified_of_changes_only(self) -> None:
+        """
+        Tests that a callback gets each new value once and nothing when a value is set again.
+        """
+        self.state_machine.subscribe(StateEvent.KILLS, self.record)
+        self.state_machine.add_kill()
+        self.state_machine.kills = 1
+        self.state_machine.add_kill()
+        self.state_machine.unsubscribe(StateEvent.KILLS, self.record)
+        self.state_machine.add_kill()
+
+        self.assertEqual(self.changes, [1, 2])
+
+    def test_damage_notifies_health_and_game_state(self) -> None:
+        """
+        Tests that fatal damage reports the health change and the switch to GAME_OVER.
+        """
+        self.state_machine.subscribe(StateEvent.HEALTH, self.record)
+        self.state_machine.subscribe(StateEvent.GAME_STATE, self.record)
+        self.state_machine.take_damage(self.state_machine.max_health)
+        self.state_machine.unsubscribe(StateEvent.HEALTH, self.record)
+        self.state_machine.unsubscribe(StateEvent.GAME_STATE, self.record)
+
+        self.assertEqual(self.changes, [0, GameState.GAME_OVER])
+
+    def test_ui_follows_state_changes(self) -> None:
+        """
+        Tests that the HUD and screens change with the state, without the UI polling it.
+        """
+        result = subprocess.run(
+            [sys.executable, '-c', UI_CHANGES.format(root=ROOT_DIR)],
+            cwd=ROOT_DIR, capture_output=True, text=True, timeout=300,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+        playing, game_over, subscribed = json.loads(result.stdout.strip().splitlines()[-1])
+
+        self.assertEqual(playing, ['Kills: 1', 0.3, True])
+        self.assertEqual(game_over, [True, False, 'Kills: 1'])
+        self.assertFalse(subscribed)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import random
+import unittest
+
+import numpy as np
+
+from src.static_world import AABBTree, Heightfield, StaticWorld, overlaps
+
+CHUNK = 64
+
+def footprint(coords: tuple) -> tuple:
+    low_x, low_z = (coords[0] - 0.5) * CHUNK, (coords[1] - 0.5) * CHUNK
+    return low_x, low_z, low_x + CHUNK, low_z + CHUNK
+
+class TestStaticWorld(unittest.TestCase):
+    """
+    Unit test class for the static collision world: its AABB tree, heightfield and sweeps.
+    """
+
+    def setUp(self) -> None:
+        self.world = StaticWorld(chunk_size=CHUNK)
+        self.wall = (5, 0, -10, 6, 4, 10)  # A wall across the x axis
+        self.platform = (-10, 0, -10, -4, 1.2, -4)
+        self.world.add_chunk((0, 0), np.array([self.wall, self.platform]), footprint((0, 0)))
+
+    def test_tree_matches_brute_force(self) -> None:
+        """
+        Tests that an AABB tree query finds exactly the boxes a linear scan finds.
+        """
+        rng = random.Random(0)
+        boxes = []
+        for _ in range(200):
+            x, y, z = rng.uniform(-50, 50), rng.uniform(0, 5), rng.uniform(-50, 50)
+            boxes.append((x, y, z, x + rng.uniform(0.5, 8), y + rng.uniform(0.5, 4), z + rng.uniform(0.5, 8)))
+        tree = AABBTree(np.array(boxes))
+
+        for _ in range(50):
+            x, z = rng.uniform(-50, 50), rng.uniform(-50, 50)
+            low, high = (x, 0, z), (x + rng.uniform(1, 20), 3, z + rng.uniform(1, 20))
+            expected = sorted(box for box in tree.boxes if overlaps(box, low, high))
+            self.assertEqual(sorted(tree.query(low, high)), expected)
+
+    def test_heightfield_ignores_surfaces_out_of_reach(self) -> None:
+        """
+        Tests that the highest surface under a footprint is reported only while it is within reach.
+        """
+        heightfield = Heightfield(0, 0, 10, 10)
+        heightfield.raise_box((2, 0, 2, 4, 1.5, 4))
+
+        self.assertEqual(heightfield.max_height(3, 3, 3.5, 3.5, ceiling=2), 1.5)
+        self.assertEqual(heightfield.max_height(1, 1, 3, 3, ceiling=0.5), 0.0)
+        self.assertIsNone(heightfield.max_height(3, 3, 3.5, 3.5, ceiling=0.5))
+        self.assertIsNone(heightfield.max_height(20, 20, 21, 21, ceiling=2))
+
+    def test_ground_is_the_surface_underfoot(self) -> None:
+        """
+        Tests that a box stands on the ground, on a platform it is on top of, and on nothing off the level.
+        """
+        self.assertEqual(self.world.ground_height((0, 0, 0), (1, 2, 1), step=0.3), 0.0)
+        self.assertAlmostEqual(self.world.ground_height((-8, 1.2, -8), (-7, 3.2, -7), step=0.3), 1.2, places=5)
+        self.assertEqual(self.world.ground_height((-4.5, 0, -8), (-3.5, 2, -7), step=0.3), 0.0)  # Beside it
+        self.assertIsNone(self.world.ground_height((100, 0, 0), (101, 2, 1), step=0.3))
+
+    def test_sweep_stops_at_walls_and_slides_along_them(self) -> None:
+        """
+        Tests that a box moving into a wall stops just short of it and keeps moving along it.
+        """
+        (dx, dz), (blocked_x, blocked_z) = self.world.sweep((3, 0, 0), (4, 2, 1), (3, 2), step=0.3)
+
+        self.assertTrue(blocked_x)
+        self.assertFalse(blocked_z)
+        self.assertLess(4 + dx, 5)
+        self.assertGreater(4 + dx, 4.99)
+        self.assertEqual(dz, 2)
+
+    def test_sweep_passes_over_what_it_stands_on(self) -> None:
+        """
+        Tests that a box on top of a platform, or stepping over a low ledge, is not blocked by it.
+        """
+        _, blocked = self.world.sweep((-8, 1.2, -8), (-7, 3.2, -7), (2, 2), step=0.3)
+        self.assertEqual(blocked, (False, False))
+
+        self.world.add_chunk((1, 0), np.array([(40, 0, -2, 42, 0.2, 2)]), footprint((1, 0)))
+        _, blocked = self.world.sweep((38, 0, 0), (39, 2, 1), (4, 0), step=0.3)
+        self.assertEqual(blocked, (False, False))
+
+    def test_removed_chunks_stop_colliding(self) -> None:
+        """
+        Tests that a chunk's walls and ground are gone once it is removed.
+        """
+        self.world.remove_chunk((0, 0))
+
+        _, blocked = self.world.sweep((3, 0, 0), (4, 2, 1), (3, 0))
+        self.assertFalse(blocked[0])
+        self.assertIsNone(self.world.ground_height((0, 0, 0), (1, 2, 1)))
+
+if __name__ == '__main__':
+    unittest.main()
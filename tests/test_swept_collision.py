@@ -0,0 +1,55 @@
+import unittest
+
+import numpy as np
+
+from src.swept_collision import segment_aabb_times, segment_sphere_times
+
+class TestSweptCollision(unittest.TestCase):
+    """
+    Unit test class for the swept segment-vs-sphere and segment-vs-box hit tests.
+    """
+
+    def test_segment_sphere_catches_tunnelling(self) -> None:
+        """
+        Tests that a segment passing straight through a sphere hits even though both ends are outside it.
+        """
+        starts = np.array([[0, 0, -5], [3, 0, -5], [0, 0, -0.5], [0, 0, 2]])
+        ends = np.array([[0, 0, 5], [3, 0, 5], [0, 0, 0.5], [0, 0, 3]])
+
+        times = segment_sphere_times(starts, ends, (0, 0, 0), 1.0)
+
+        self.assertAlmostEqual(times[0], 0.4)  # Enters at z = -1
+        self.assertTrue(np.isinf(times[1]))  # Passes beside the sphere
+        self.assertEqual(times[2], 0.0)  # Starts inside
+        self.assertTrue(np.isinf(times[3]))  # Ends before reaching it
+
+    def test_segment_sphere_per_segment_targets(self) -> None:
+        """
+        Tests that centres and radii can be given per segment.
+        """
+        starts = np.array([[0, 0, 0], [0, 0, 0]])
+        ends = np.array([[10, 0, 0], [10, 0, 0]])
+        centers = np.array([[5, 0, 0], [5, 5, 0]])
+        radii = np.array([1.0, 1.0])
+
+        times = segment_sphere_times(starts, ends, centers, radii)
+
+        self.assertAlmostEqual(times[0], 0.4)
+        self.assertTrue(np.isinf(times[1]))
+
+    def test_segment_aabb(self) -> None:
+        """
+        Tests the slab test for crossing, axis-parallel, starting-inside and missing segments.
+        """
+        starts = np.array([[-5, 0, 0], [0, 5, 0], [0, 0, 0], [-5, 3, 0]])
+        ends = np.array([[5, 0, 0], [0, -5, 0], [0.1, 0, 0], [5, 3, 0]])
+
+        times = segment_aabb_times(starts, ends, (-0.5, -1, -0.5), (0.5, 1, 0.5))
+
+        self.assertAlmostEqual(times[0], 0.45)
+        self.assertAlmostEqual(times[1], 0.4)
+        self.assertEqual(times[2], 0.0)
+        self.assertTrue(np.isinf(times[3]))
+
+if __name__ == '__main__':
+    unittest.main()